@@ -0,0 +1,469 @@
+"""
+Асинхронный клиент API Кинопоиска на aiohttp для работы бота на AsyncTeleBot.
+Повторяет функции поиска из kinopoisk_api и использует те же кэши ответов.
+"""
+
+import asyncio
+import json
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Set, Tuple
+
+import aiohttp
+
+from config_data.config import (
+    API_KINOPOISK_TOKEN,
+    API_POOL_SIZE,
+    API_CONNECT_TIMEOUT,
+    API_READ_TIMEOUT,
+    API_MAX_RETRIES,
+    API_RETRY_BASE_DELAY,
+    API_RETRY_MAX_DELAY,
+    RESULTS_PAGE_SIZE,
+)
+from utils.logger_config import logger
+from api.cache import ResponseCache
+from api.resilience import CLOSED, RETRY_STATUSES, backoff_delay
+from api.single_flight import AsyncSingleFlight
+from api.kinopoisk_api import (
+    API_BASE_URL,
+    response_cache,
+    disk_cache,
+    rate_limiter,
+    api_quota,
+    circuit_breaker,
+    LOW_BUDGET_MAX,
+    HIGH_BUDGET_MIN,
+    BUDGET_MAX_PAGES,
+    budget_params,
+    name_params,
+    genre_params,
+    rating_params,
+    filter_by_budget,
+    is_quota_exhausted,
+    search_catalog,
+    catalog_page,
+    remember_films,
+    results_page,
+    SOURCE_API,
+)
+from database import catalog, fallback, run_db
+
+# Объединение одинаковых запросов внутри цикла событий
+request_group = AsyncSingleFlight()
+
+_session: Optional[aiohttp.ClientSession] = None
+
+# Ссылки на фоновые задачи загрузки, чтобы их не удалил сборщик мусора
+_prefetch_tasks: Set[asyncio.Task] = set()
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """
+    Возвращает общую HTTP-сессию с пулом keep-alive соединений.
+
+    Returns:
+        aiohttp.ClientSession: Сессия aiohttp.
+    """
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=API_POOL_SIZE, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(
+                sock_connect=API_CONNECT_TIMEOUT, sock_read=API_READ_TIMEOUT
+            ),
+            headers={"X-API-KEY": API_KINOPOISK_TOKEN},
+        )
+    return _session
+
+
+async def close_session() -> None:
+    """Закрывает HTTP-сессию. Вызывать при остановке бота."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+def _query_items(params: Optional[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    """
+    Преобразует параметры запроса в список пар для aiohttp.
+    Списки разворачиваются в повторяющиеся параметры, как это делает requests.
+
+    Args:
+        params (dict, optional): Параметры запроса.
+
+    Returns:
+        List[Tuple[str, str]]: Пары имя-значение.
+    """
+    items = []
+    for name, value in (params or {}).items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        items += [(name, str(v)) for v in values]
+    return items
+
+
+async def fetch_json(
+    endpoint: str, path: str, params: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Выполняет GET-запрос к API Кинопоиска с использованием кэша ответов.
+    Сначала проверяется кэш в памяти, затем дисковый кэш и только потом сеть.
+    Если API недоступен, возвращается устаревший ответ из дискового кэша.
+
+    Args:
+        endpoint (str): Имя эндпоинта, определяющее время жизни записи в кэше.
+        path (str): Путь запроса относительно API_BASE_URL.
+        params (dict, optional): Параметры запроса.
+
+    Returns:
+        Optional[Dict[str, Any]]: Данные ответа или None при ошибке API.
+    """
+    cache_params = {"path": path, **(params or {})}
+    data = response_cache.get(endpoint, cache_params)
+    if data is not None:
+        logger.info(f"Ответ API для '{endpoint}' взят из кэша: {params}")
+        return data
+
+    data, ttl = await asyncio.to_thread(disk_cache.get_with_ttl, endpoint, cache_params)
+    if data is not None:
+        logger.info(f"Ответ API для '{endpoint}' взят из дискового кэша: {params}")
+        response_cache.set(endpoint, cache_params, data, ttl=ttl)
+        return data
+
+    key = ResponseCache.make_key(endpoint, cache_params)
+    data = await request_group.do(
+        key, lambda: _request_api(endpoint, path, params, cache_params)
+    )
+    if data is None:
+        data = await asyncio.to_thread(disk_cache.get_stale, endpoint, cache_params)
+        if data is not None:
+            logger.warning(f"API недоступен, для '{endpoint}' взят устаревший ответ")
+    return data
+
+
+async def _request_api(
+    endpoint: str,
+    path: str,
+    params: Optional[Dict[str, Any]],
+    cache_params: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    """
+    Выполняет HTTP-запрос к API и сохраняет успешный ответ в оба уровня кэша.
+
+    Args:
+        endpoint (str): Имя эндпоинта.
+        path (str): Путь запроса относительно API_BASE_URL.
+        params (dict, optional): Параметры запроса.
+        cache_params (dict): Параметры, по которым строится ключ кэша.
+
+    Returns:
+        Optional[Dict[str, Any]]: Данные ответа или None при ошибке API.
+    """
+    if not circuit_breaker.allow():
+        logger.warning(f"Запрос к API '{endpoint}' пропущен: цепь разомкнута")
+        return None
+
+    session = await get_session()
+    for attempt in range(API_MAX_RETRIES + 1):
+        if not await asyncio.to_thread(api_quota.try_consume):
+            logger.warning(
+                f"Запрос к API '{endpoint}' отклонён: суточная квота исчерпана"
+            )
+            return None
+        await rate_limiter.acquire_async()
+        retry_after = None
+        try:
+            async with session.get(
+                API_BASE_URL + path, params=_query_items(params)
+            ) as response:
+                text = await response.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # Любая ошибка клиента (соединение, обрыв ответа) повторяется
+            # и учитывается выключателем, как сетевая ошибка синхронного клиента
+            logger.error(f"Сетевая ошибка при запросе '{endpoint}': {e!r}")
+        else:
+            logger.info(
+                f"Запрос к API '{endpoint}' с параметрами {params}, "
+                f"статус: {response.status}"
+            )
+            if response.status == 200:
+                try:
+                    data = json.loads(text)
+                except ValueError as e:
+                    # Повреждённое тело ответа считается сбоем API, а не успехом
+                    logger.error(f"Некорректный JSON в ответе '{endpoint}': {e}")
+                else:
+                    circuit_breaker.record_success()
+                    break
+            else:
+                logger.error(
+                    f"Ошибка API при запросе '{endpoint}': {response.status} - {text}"
+                )
+                if response.status not in RETRY_STATUSES:
+                    # API ответил, значит он доступен: ошибка в самом запросе
+                    circuit_breaker.record_success()
+                    return None
+                retry_after = response.headers.get("Retry-After")
+
+        circuit_breaker.record_failure()
+        if attempt == API_MAX_RETRIES or not circuit_breaker.allow():
+            return None
+        delay = backoff_delay(
+            attempt, API_RETRY_BASE_DELAY, API_RETRY_MAX_DELAY, retry_after
+        )
+        logger.warning(f"Повтор запроса '{endpoint}' через {delay:.2f} с")
+        await asyncio.sleep(delay)
+
+    response_cache.set(endpoint, cache_params, data)
+    await asyncio.to_thread(disk_cache.set, endpoint, cache_params, data)
+    await run_db(remember_films, data)
+    return data
+
+
+async def search_films_by_name(name: str) -> List[Dict[str, Any]]:
+    """
+    Поиск фильмов по названию.
+
+    Args:
+        name (str): Название фильма для поиска.
+
+    Returns:
+        List[Dict[str, Any]]: Список найденных фильмов.
+    """
+    films = await run_db(catalog.search_by_title, name)
+    if films:
+        logger.info(f"Фильмы по названию '{name}' найдены в локальном индексе")
+        return films
+    data = await fetch_json("name", "/v1.4/movie/search", name_params(name))
+    if data is None:
+        return await run_db(fallback.find_films_by_name, name)
+    return data.get("docs", [])
+
+
+async def search_films_by_genre(genre: str) -> List[Dict[str, Any]]:
+    """
+    Поиск фильмов по жанру.
+
+    Args:
+        genre (str): Название жанра.
+
+    Returns:
+        List[Dict[str, Any]]: Список фильмов с указанным жанром.
+    """
+    return (await get_genre_page(genre, 1, 10))["docs"]
+
+
+async def get_genre_page(
+    genre: str,
+    page: int = 1,
+    limit: int = RESULTS_PAGE_SIZE,
+    source: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Возвращает страницу результатов поиска фильмов по жанру.
+
+    Args:
+        genre (str): Название жанра.
+        page (int): Номер страницы, начиная с 1.
+        limit (int): Количество фильмов на странице.
+        source (str, optional): Источник первой страницы поиска; None для
+            первой страницы.
+
+    Returns:
+        Dict[str, Any]: Фильмы страницы ("docs"), её номер ("page"),
+        признак наличия следующей страницы ("has_next") и источник ("source").
+    """
+    result = await run_db(
+        catalog_page, catalog.search_by_genre, genre, page, limit, source
+    )
+    if result is not None:
+        return result
+    data = await fetch_json("genre", "/v1.4/movie", genre_params(genre, page, limit))
+    if data is None:
+        films = []
+        if page == 1:
+            films = await run_db(fallback.find_films_by_genre, genre, limit)
+        return results_page(films, page, False, SOURCE_API)
+    has_next = page < data.get("pages", 0)
+    return results_page(data.get("docs", []), page, has_next, SOURCE_API)
+
+
+async def search_films_by_rating(
+    min_rating: float, limit: int = 10
+) -> List[Dict[str, Any]]:
+    """
+    Поиск фильмов с рейтингом IMDB не ниже заданного.
+
+    Args:
+        min_rating (float): Минимальный рейтинг.
+        limit (int): Максимальное число фильмов для возврата (по умолчанию 10).
+
+    Returns:
+        List[Dict[str, Any]]: Список фильмов с рейтингом >= min_rating.
+    """
+    return (await get_rating_page(min_rating, 1, limit))["docs"]
+
+
+async def get_rating_page(
+    min_rating: float,
+    page: int = 1,
+    limit: int = RESULTS_PAGE_SIZE,
+    source: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Возвращает страницу результатов поиска фильмов с рейтингом IMDB
+    не ниже заданного.
+
+    Args:
+        min_rating (float): Минимальный рейтинг.
+        page (int): Номер страницы, начиная с 1.
+        limit (int): Количество фильмов на странице.
+        source (str, optional): Источник первой страницы поиска; None для
+            первой страницы.
+
+    Returns:
+        Dict[str, Any]: Фильмы страницы ("docs"), её номер ("page"),
+        признак наличия следующей страницы ("has_next") и источник ("source").
+    """
+    result = await run_db(
+        catalog_page, catalog.search_by_rating, min_rating, page, limit, source
+    )
+    if result is not None:
+        return result
+    data = await fetch_json(
+        "rating", "/v1.4/movie", rating_params(min_rating, page, limit)
+    )
+    if data is None:
+        films = []
+        if page == 1:
+            films = await run_db(fallback.find_films_by_rating, min_rating, limit)
+        return results_page(films, page, False, SOURCE_API)
+    has_next = page < data.get("pages", 0)
+    return results_page(data.get("docs", []), page, has_next, SOURCE_API)
+
+
+def prefetch(fn: Callable[..., Coroutine[Any, Any, Any]], *args: Any) -> None:
+    """
+    Запускает запрос фоновой задачей, чтобы заранее поместить ответ в кэш.
+    Не выполняется, если API недоступен или суточная квота исчерпана.
+
+    Args:
+        fn (Callable): Асинхронная функция запроса к API.
+        *args: Аргументы функции.
+    """
+    if circuit_breaker.state != CLOSED or is_quota_exhausted():
+        return
+
+    async def run() -> None:
+        try:
+            await fn(*args)
+        except Exception as e:
+            logger.error(f"Ошибка фоновой загрузки {fn.__name__}{args}: {e}")
+
+    task = asyncio.create_task(run())
+    _prefetch_tasks.add(task)
+    task.add_done_callback(_prefetch_tasks.discard)
+
+
+async def search_films_by_budget(
+    min_budget: Optional[int] = None,
+    max_budget: Optional[int] = None,
+    limit: int = 10,
+    sort_by: str = "budget",
+    descending: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Поиск фильмов с бюджетом в заданных пределах.
+    Фильтрация и сортировка выполняются на стороне API, страницы
+    запрашиваются, пока не наберётся limit фильмов.
+
+    Args:
+        min_budget (int, optional): Минимальный бюджет.
+        max_budget (int, optional): Максимальный бюджет.
+        limit (int): Максимальное количество фильмов для возврата (по умолчанию 10).
+        sort_by (str): Поле сортировки: "budget", "rating" или "year".
+        descending (bool): Сортировать по убыванию.
+
+    Returns:
+        List[Dict[str, Any]]: Фильмы, упорядоченные по выбранному полю и ID.
+    """
+    films = await run_db(
+        search_catalog,
+        catalog.search_by_budget,
+        min_budget,
+        max_budget,
+        limit,
+        sort_by,
+        descending,
+    )
+    if films:
+        return films
+
+    params = budget_params(min_budget, max_budget, limit, sort_by, descending)
+    films = []
+    for page in range(1, BUDGET_MAX_PAGES + 1):
+        data = await fetch_json("budget", "/v1.4/movie", {**params, "page": page})
+        if data is None:
+            break
+        films += filter_by_budget(data.get("docs", []), min_budget, max_budget)
+        if len(films) >= limit or page >= data.get("pages", 0):
+            break
+    return films[:limit]
+
+
+async def search_films_by_low_budget(
+    limit: int = 10,
+    max_budget: int = LOW_BUDGET_MAX,
+    sort_by: str = "budget",
+    descending: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Поиск фильмов с низким бюджетом (по умолчанию не более 5 млн).
+
+    Args:
+        limit (int): Максимальное количество фильмов для возврата (по умолчанию 10).
+        max_budget (int): Максимальный бюджет.
+        sort_by (str): Поле сортировки: "budget", "rating" или "year".
+        descending (bool): Сортировать по убыванию.
+
+    Returns:
+        List[Dict[str, Any]]: Список фильмов с низким бюджетом.
+    """
+    return await search_films_by_budget(None, max_budget, limit, sort_by, descending)
+
+
+async def search_films_by_high_budget(
+    limit: int = 10,
+    min_budget: int = HIGH_BUDGET_MIN,
+    sort_by: str = "budget",
+    descending: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Поиск фильмов с высоким бюджетом (по умолчанию не менее 10 млн).
+
+    Args:
+        limit (int): Максимальное количество фильмов для возврата (по умолчанию 10).
+        min_budget (int): Минимальный бюджет.
+        sort_by (str): Поле сортировки: "budget", "rating" или "year".
+        descending (bool): Сортировать по убыванию.
+
+    Returns:
+        List[Dict[str, Any]]: Список фильмов с высоким бюджетом.
+    """
+    return await search_films_by_budget(min_budget, None, limit, sort_by, descending)
+
+
+async def get_film_data_by_id(movie_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Получение подробных данных о фильме по его ID.
+
+    Args:
+        movie_id (str): Идентификатор фильма.
+
+    Returns:
+        Optional[Dict[str, Any]]: Данные фильма или None при ошибке.
+    """
+    data = await fetch_json("movie", f"/v1.4/movie/{movie_id}")
+    if data is None:
+        logger.error(f"Ошибка при получении данных фильма с ID {movie_id}")
+        data = await run_db(fallback.find_film_by_id, movie_id)
+    return data
@@ -0,0 +1,199 @@
+"""
+Кэш ответов API Кинопоиска в памяти процесса.
+LRU-кэш с ограничением по количеству записей и объёму данных,
+временем жизни записей для каждого типа запроса и счётчиками статистики.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class ResponseCache:
+    """
+    Потокобезопасный LRU-кэш ответов API с TTL для каждого эндпоинта.
+
+    Значения хранятся без копирования, поэтому вызывающий код
+    не должен изменять полученные из кэша объекты.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2000,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl: float = 900,
+        endpoint_ttls: Optional[Dict[str, float]] = None,
+    ) -> None:
+        """
+        Args:
+            max_entries (int): Максимальное количество записей.
+            max_bytes (int): Максимальный суммарный объём записей в байтах.
+            default_ttl (float): Время жизни записи по умолчанию, в секундах.
+            endpoint_ttls (dict, optional): Время жизни записей по эндпоинтам.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.endpoint_ttls = dict(endpoint_ttls or {})
+        # key -> (endpoint, expires_at, size, value)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Формирует нормализованный ключ запроса.
+
+        Args:
+            endpoint (str): Имя эндпоинта.
+            params (dict, optional): Параметры запроса.
+
+        Returns:
+            str: Ключ кэша, не зависящий от порядка параметров.
+        """
+        return (
+            endpoint
+            + "?"
+            + json.dumps(params or {}, sort_keys=True, ensure_ascii=False, default=str)
+        )
+
+    def ttl_for(self, endpoint: str) -> float:
+        """Возвращает время жизни записей для эндпоинта."""
+        return self.endpoint_ttls.get(endpoint, self.default_ttl)
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Возвращает значение из кэша.
+
+        Args:
+            endpoint (str): Имя эндпоинта.
+            params (dict, optional): Параметры запроса.
+
+        Returns:
+            Any: Сохранённое значение или None, если записи нет или она устарела.
+        """
+        key = self.make_key(endpoint, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[1] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[3]
+
+    def ttl_remaining(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> float:
+        """
+        Возвращает оставшееся время жизни записи без обновления статистики.
+
+        Returns:
+            float: Секунды до истечения записи, 0 если записи нет.
+        """
+        key = self.make_key(endpoint, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return 0.0
+            return max(0.0, entry[1] - time.monotonic())
+
+    def set(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        value: Any,
+        ttl: Optional[float] = None,
+    ) -> None:
+        """
+        Сохраняет значение в кэш, вытесняя давно не использованные записи.
+
+        Args:
+            endpoint (str): Имя эндпоинта.
+            params (dict, optional): Параметры запроса.
+            value (Any): JSON-совместимое значение.
+            ttl (float, optional): Время жизни записи, по умолчанию TTL эндпоинта.
+        """
+        key = self.make_key(endpoint, params)
+        size = len(key) + len(
+            json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")
+        )
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + (
+            ttl if ttl is not None else self.ttl_for(endpoint)
+        )
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (endpoint, expires_at, size, value)
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(
+        self, endpoint: Optional[str] = None, params: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Удаляет записи из кэша.
+
+        Без аргументов очищает весь кэш, с одним endpoint удаляет все записи
+        эндпоинта, с endpoint и params удаляет одну запись.
+
+        Returns:
+            int: Количество удалённых записей.
+        """
+        with self._lock:
+            if endpoint is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                self._bytes = 0
+                return removed
+            if params is not None:
+                key = self.make_key(endpoint, params)
+                if key in self._entries:
+                    self._remove(key)
+                    return 1
+                return 0
+            keys = [k for k, entry in self._entries.items() if entry[0] == endpoint]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Возвращает статистику работы кэша.
+
+        Returns:
+            Dict[str, int]: Счётчики попаданий, промахов, вытеснений и размер кэша.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def _remove(self, key: str) -> None:
+        """Удаляет запись по ключу. Вызывается под блокировкой."""
+        entry = self._entries.pop(key)
+        self._bytes -= entry[2]
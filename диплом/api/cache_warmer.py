@@ -0,0 +1,232 @@
+"""
+Фоновый прогрев кэша ответов API Кинопоиска.
+Периодически выбирает из истории поиска самые частые запросы каждой команды
+и заранее обновляет их ответы в кэше, пока записи ещё не истекли.
+На прогрев тратится не больше заданной доли суточной квоты API.
+"""
+
+import datetime
+import threading
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from peewee import fn, DatabaseError
+
+from api.kinopoisk_api import (
+    response_cache,
+    disk_cache,
+    api_quota,
+    circuit_breaker,
+    name_params,
+    genre_params,
+    rating_params,
+    refresh_json,
+)
+from api.resilience import CLOSED
+from config_data.config import (
+    API_DAILY_QUOTA,
+    CATALOG_MAX_AGE,
+    RESULTS_PAGE_SIZE,
+    WARMER_INTERVAL,
+    WARMER_TOP_N,
+    WARMER_HISTORY_DAYS,
+    WARMER_QUOTA_SHARE,
+)
+from database import catalog, connection, SearchHistory
+from utils.logger_config import logger
+
+# Запрос к API: имя эндпоинта, путь и параметры
+Target = Tuple[str, str, Dict]
+
+
+def _name_target(query: str) -> Optional[Target]:
+    """Запрос поиска по названию, если фильм не находится в локальном индексе."""
+    name = query.strip()
+    if not name or catalog.search_by_title(name):
+        return None
+    return "name", "/v1.4/movie/search", name_params(name)
+
+
+def _genre_target(query: str) -> Optional[Target]:
+    """Запрос первой страницы фильмов жанра."""
+    genre = query.lower()
+    if not genre.strip() or catalog.is_fresh(CATALOG_MAX_AGE):
+        return None
+    return "genre", "/v1.4/movie", genre_params(genre, 1, RESULTS_PAGE_SIZE)
+
+
+def _rating_target(query: str) -> Optional[Target]:
+    """Запрос первой страницы фильмов с рейтингом не ниже заданного."""
+    try:
+        min_rating = float(query.strip().replace(",", "."))
+    except ValueError:
+        return None
+    if catalog.is_fresh(CATALOG_MAX_AGE):
+        return None
+    return "rating", "/v1.4/movie", rating_params(min_rating, 1, RESULTS_PAGE_SIZE)
+
+
+# Команды из истории поиска и преобразование их запросов в запросы к API
+WARM_TARGETS: Dict[str, Callable[[str], Optional[Target]]] = {
+    "/movie_search": _name_target,
+    "/movie_by_genre": _genre_target,
+    "/movie_by_rating": _rating_target,
+}
+
+
+def popular_queries(
+    command: str, limit: int, since: datetime.datetime
+) -> List[Tuple[str, int]]:
+    """
+    Возвращает самые частые запросы команды из истории поиска.
+
+    Args:
+        command (str): Команда, например "/movie_by_genre".
+        limit (int): Максимальное число запросов.
+        since (datetime): Учитывать запросы не раньше этого момента.
+
+    Returns:
+        List[Tuple[str, int]]: Запросы и число их повторов, от частых к редким.
+    """
+    uses = fn.COUNT(SearchHistory.id)
+    rows = (
+        SearchHistory.select(SearchHistory.query, uses.alias("uses"))
+        .where(
+            (SearchHistory.command == command)
+            & (SearchHistory.timestamp >= since)
+            & ~SearchHistory.query.startswith("/")
+        )
+        .group_by(SearchHistory.query)
+        .order_by(uses.desc())
+        .limit(limit * 5)
+    )
+    # Запросы, отличающиеся только регистром и пробелами, считаются одним,
+    # а прогревается самый частый из вариантов написания
+    counter = Counter()
+    spelling = {}
+    for row in rows:
+        key = " ".join(row.query.lower().split())
+        counter[key] += row.uses
+        spelling.setdefault(key, row.query.strip())
+    return [(spelling[key], uses) for key, uses in counter.most_common(limit)]
+
+
+class CacheWarmer:
+    """
+    Фоновый поток, обновляющий в кэше ответы на популярные запросы.
+    """
+
+    def __init__(
+        self,
+        interval: float = WARMER_INTERVAL,
+        top_n: int = WARMER_TOP_N,
+        history_days: int = WARMER_HISTORY_DAYS,
+        quota_share: float = WARMER_QUOTA_SHARE,
+    ) -> None:
+        """
+        Args:
+            interval (float): Период прогрева, в секундах.
+            top_n (int): Сколько самых частых запросов каждой команды прогревать.
+            history_days (int): За сколько последних дней учитывать историю.
+            quota_share (float): Доля суточной квоты API, доступная прогреву.
+        """
+        self.interval = interval
+        self.top_n = top_n
+        self.history_days = history_days
+        self.daily_budget = int(API_DAILY_QUOTA * quota_share)
+        self._day: Optional[str] = None
+        self._used = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Запускает фоновый поток прогрева, если он ещё не запущен."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="cache-warmer", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Прогрев кэша запущен: каждые {self.interval} с, "
+            f"до {self.daily_budget} запросов к API в сутки"
+        )
+
+    def stop(self) -> None:
+        """Останавливает фоновый поток прогрева."""
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                with connection():
+                    self.warm_once()
+            except DatabaseError as e:
+                logger.error(f"Ошибка чтения истории поиска для прогрева кэша: {e}")
+            except Exception as e:
+                logger.error(f"Ошибка прогрева кэша: {e}", exc_info=True)
+            self._stop.wait(self.interval)
+
+    def budget_left(self) -> int:
+        """
+        Возвращает число запросов к API, которые прогрев ещё может сделать сегодня.
+
+        Returns:
+            int: Остаток суточного лимита прогрева.
+        """
+        day = api_quota.status()["day"]
+        if day != self._day:
+            self._day = day
+            self._used = 0
+        return max(0, self.daily_budget - self._used)
+
+    def warm_once(self) -> int:
+        """
+        Выполняет один проход прогрева: обновляет ответы на популярные запросы,
+        записи которых отсутствуют в кэше или истекут до следующего прохода.
+
+        Returns:
+            int: Количество ответов, загруженных из API.
+        """
+        since = datetime.datetime.now() - datetime.timedelta(days=self.history_days)
+        refreshed = 0
+        for command, make_target in WARM_TARGETS.items():
+            for query, _ in popular_queries(command, self.top_n, since):
+                target = make_target(query)
+                if target is None or not self._needs_refresh(*target):
+                    continue
+                if (
+                    self.budget_left() <= 0
+                    or circuit_breaker.state != CLOSED
+                    or api_quota.status()["exhausted"]
+                ):
+                    logger.info(
+                        f"Прогрев кэша приостановлен, обновлено ответов: {refreshed}"
+                    )
+                    return refreshed
+                used = api_quota.status()["used"]
+                if refresh_json(*target) is not None:
+                    refreshed += 1
+                self._used += max(0, api_quota.status()["used"] - used)
+        if refreshed:
+            logger.info(f"Прогрев кэша: обновлено ответов {refreshed}")
+        return refreshed
+
+    def _needs_refresh(self, endpoint: str, path: str, params: Dict) -> bool:
+        """
+        Проверяет, истечёт ли ответ в кэше до следующего прохода прогрева.
+        Ответ, ещё действующий в дисковом кэше, переносится в память без
+        запроса к API.
+        """
+        cache_params = {"path": path, **params}
+        if response_cache.ttl_remaining(endpoint, cache_params) > self.interval:
+            return False
+        data, ttl = disk_cache.get_with_ttl(endpoint, cache_params)
+        if data is not None and ttl > self.interval:
+            response_cache.set(endpoint, cache_params, data, ttl=ttl)
+            return False
+        return True
+
+
+cache_warmer = CacheWarmer()
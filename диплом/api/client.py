@@ -0,0 +1,126 @@
+"""
+HTTP-клиент API Кинопоиска.
+Пул keep-alive соединений, таймауты подключения и чтения,
+отдельная сессия requests для каждого рабочего потока telebot.
+"""
+
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.logger_config import logger
+
+
+def log_request_response(response: requests.Response, *args, **kwargs) -> None:
+    """
+    Логирует данные HTTP-запроса и соответствующего ответа.
+
+    Args:
+        response (requests.Response): Объект ответа от requests.
+        *args: Дополнительные позиционные аргументы
+        **kwargs: Дополнительные именованные аргументы
+
+    """
+    request = response.request
+    log_data = {
+        "request_method": request.method,
+        "request_url": request.url,
+        "request_headers": dict(request.headers),
+        "request_body": (
+            request.body.decode("utf-8")
+            if request.body and isinstance(request.body, bytes)
+            else request.body
+        ),
+        "response_status": response.status_code,
+        "response_headers": dict(response.headers),
+        "response_text": response.text,
+    }
+    logger.info("API HTTP call", extra={"props": log_data})
+
+
+class KinopoiskClient:
+    """
+    Клиент API Кинопоиска с пулом соединений и таймаутами.
+
+    requests.Session не гарантирует потокобезопасность, поэтому каждый поток
+    получает собственную сессию со своим пулом keep-alive соединений.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token: str,
+        pool_size: int = 20,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 10,
+    ) -> None:
+        """
+        Args:
+            base_url (str): Базовый URL API.
+            token (str): Ключ API Кинопоиска.
+            pool_size (int): Максимальное число соединений в пуле сессии.
+            connect_timeout (float): Таймаут подключения, в секундах.
+            read_timeout (float): Таймаут чтения ответа, в секундах.
+        """
+        self.base_url = base_url
+        self.token = token
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """Сессия requests текущего потока, создаётся при первом обращении."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._create_session()
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def _create_session(self) -> requests.Session:
+        """
+        Создаёт сессию с пулом соединений, заголовками и логированием.
+
+        Returns:
+            requests.Session: Настроенная сессия.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=self.pool_size, max_retries=0
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"X-API-KEY": self.token, "Connection": "keep-alive"})
+        session.hooks["response"].append(log_request_response)
+        return session
+
+    def get(
+        self, path: str, params: Optional[Dict[str, Any]] = None
+    ) -> requests.Response:
+        """
+        Выполняет GET-запрос к API.
+
+        Args:
+            path (str): Путь запроса относительно базового URL.
+            params (dict, optional): Параметры запроса.
+
+        Returns:
+            requests.Response: Ответ API.
+        """
+        return self.session.get(
+            self.base_url + path, params=params, timeout=self.timeout
+        )
+
+    def close(self) -> None:
+        """Закрывает сессии всех потоков. Вызывать при остановке бота."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+        self._local = threading.local()
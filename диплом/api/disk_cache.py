@@ -0,0 +1,272 @@
+"""
+Постоянный кэш ответов API Кинопоиска в отдельном файле SQLite.
+Переживает перезапуски бота, хранит сжатые JSON-ответы,
+ограничен по объёму с LRU-вытеснением и истечением записей по TTL.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+from api.cache import ResponseCache
+from utils.logger_config import logger
+
+# Обновлять время последнего обращения не чаще этого интервала (секунды),
+# чтобы чтение из кэша не превращалось в запись на каждый запрос
+TOUCH_INTERVAL = 60
+
+
+class DiskCache:
+    """
+    Второй уровень кэша ответов API на базе SQLite.
+
+    Ключ записи совпадает с ключом ResponseCache: эндпоинт плюс
+    нормализованные параметры запроса.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        default_ttl: float = 900,
+        endpoint_ttls: Optional[Dict[str, float]] = None,
+    ) -> None:
+        """
+        Args:
+            path (str): Путь к файлу базы данных кэша.
+            max_bytes (int): Максимальный суммарный объём сжатых записей.
+            default_ttl (float): Время жизни записи по умолчанию, в секундах.
+            endpoint_ttls (dict, optional): Время жизни записей по эндпоинтам.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.endpoint_ttls = dict(endpoint_ttls or {})
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS api_cache ("
+            "key TEXT PRIMARY KEY, "
+            "endpoint TEXT NOT NULL, "
+            "payload BLOB NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "expires_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS api_cache_accessed_at "
+            "ON api_cache (accessed_at)"
+        )
+        self._bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM api_cache"
+        ).fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def ttl_for(self, endpoint: str) -> float:
+        """Возвращает время жизни записей для эндпоинта."""
+        return self.endpoint_ttls.get(endpoint, self.default_ttl)
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Возвращает значение из кэша.
+
+        Returns:
+            Any: Сохранённое значение или None, если записи нет или она устарела.
+        """
+        return self.get_with_ttl(endpoint, params)[0]
+
+    def get_with_ttl(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Any, float]:
+        """
+        Возвращает значение из кэша вместе с оставшимся временем жизни.
+
+        Args:
+            endpoint (str): Имя эндпоинта.
+            params (dict, optional): Параметры запроса.
+
+        Returns:
+            Tuple[Any, float]: Значение (или None) и секунды до истечения записи.
+        """
+        key = ResponseCache.make_key(endpoint, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, size, expires_at, accessed_at "
+                "FROM api_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None, 0.0
+            payload, size, expires_at, accessed_at = row
+            if expires_at <= now:
+                # Устаревшая запись остаётся в кэше до вытеснения, чтобы её
+                # можно было отдать через get_stale, пока API недоступен
+                self.misses += 1
+                return None, 0.0
+            if now - accessed_at > TOUCH_INTERVAL:
+                self._conn.execute(
+                    "UPDATE api_cache SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+            self.hits += 1
+        value = self._decode(key, payload)
+        if value is None:
+            self.invalidate(endpoint, params)
+            return None, 0.0
+        return value, expires_at - now
+
+    def get_stale(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Возвращает значение из кэша, даже если срок его жизни истёк.
+        Используется как запасной ответ, когда API недоступен.
+
+        Args:
+            endpoint (str): Имя эндпоинта.
+            params (dict, optional): Параметры запроса.
+
+        Returns:
+            Any: Сохранённое значение или None, если записи нет.
+        """
+        key = ResponseCache.make_key(endpoint, params)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM api_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return self._decode(key, row[0])
+
+    @staticmethod
+    def _decode(key: str, payload: bytes) -> Any:
+        """Распаковывает сохранённое значение. Возвращает None для повреждённой записи."""
+        try:
+            return json.loads(zlib.decompress(payload))
+        except (zlib.error, ValueError) as e:
+            logger.error(f"Повреждённая запись дискового кэша '{key}': {e}")
+            return None
+
+    def set(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        value: Any,
+        ttl: Optional[float] = None,
+    ) -> None:
+        """
+        Сохраняет значение в кэш и вытесняет давно не использованные записи
+        при превышении лимита объёма.
+
+        Args:
+            endpoint (str): Имя эндпоинта.
+            params (dict, optional): Параметры запроса.
+            value (Any): JSON-совместимое значение.
+            ttl (float, optional): Время жизни записи, по умолчанию TTL эндпоинта.
+        """
+        key = ResponseCache.make_key(endpoint, params)
+        payload = zlib.compress(
+            json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")
+        )
+        size = len(key) + len(payload)
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        expires_at = now + (ttl if ttl is not None else self.ttl_for(endpoint))
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM api_cache WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO api_cache "
+                "(key, endpoint, payload, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, payload, size, expires_at, now),
+            )
+            self._bytes += size - (old[0] if old else 0)
+            if self._bytes > self.max_bytes:
+                self._evict(now)
+
+    def invalidate(
+        self, endpoint: Optional[str] = None, params: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Удаляет записи из кэша.
+
+        Без аргументов очищает весь кэш, с одним endpoint удаляет все записи
+        эндпоинта, с endpoint и params удаляет одну запись.
+
+        Returns:
+            int: Количество удалённых записей.
+        """
+        if endpoint is None:
+            where, args = "", ()
+        elif params is None:
+            where, args = " WHERE endpoint = ?", (endpoint,)
+        else:
+            where, args = " WHERE key = ?", (ResponseCache.make_key(endpoint, params),)
+        with self._lock:
+            removed_bytes = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM api_cache" + where, args
+            ).fetchone()[0]
+            removed = self._conn.execute("DELETE FROM api_cache" + where, args).rowcount
+            self._bytes -= removed_bytes
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Возвращает статистику работы кэша.
+
+        Returns:
+            Dict[str, int]: Счётчики попаданий, промахов, вытеснений и размер кэша.
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM api_cache").fetchone()[0]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": entries,
+                "bytes": self._bytes,
+            }
+
+    def _evict(self, now: float) -> None:
+        """
+        Удаляет устаревшие записи, затем давно не использованные,
+        пока объём не опустится до 90% лимита. Вызывается под блокировкой.
+        """
+        self._conn.execute("BEGIN")
+        try:
+            expired = self._conn.execute(
+                "DELETE FROM api_cache WHERE expires_at <= ? RETURNING size", (now,)
+            ).fetchall()
+            self._bytes -= sum(row[0] for row in expired)
+            self.expirations += len(expired)
+            target = self.max_bytes * 0.9
+            while self._bytes > target:
+                rows = self._conn.execute(
+                    "SELECT key, size FROM api_cache ORDER BY accessed_at LIMIT 100"
+                ).fetchall()
+                if not rows:
+                    self._bytes = 0
+                    break
+                for key, size in rows:
+                    if self._bytes <= target:
+                        break
+                    self._conn.execute("DELETE FROM api_cache WHERE key = ?", (key,))
+                    self._bytes -= size
+                    self.evictions += 1
+            self._conn.execute("COMMIT")
+        except sqlite3.Error:
+            self._conn.execute("ROLLBACK")
+            raise
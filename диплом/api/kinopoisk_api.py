@@ -4,68 +4,416 @@
 и логирование всех запросов.
 """
 
-from typing import List, Dict, Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Any, Optional
+
 import requests
-from config_data.config import API_KINOPOISK_TOKEN
+from peewee import DatabaseError
+
+from config_data.config import (
+    API_KINOPOISK_TOKEN,
+    CACHE_MAX_ENTRIES,
+    CACHE_MAX_BYTES,
+    CACHE_DEFAULT_TTL,
+    CACHE_TTLS,
+    API_CACHE_DB_PATH,
+    API_CACHE_MAX_BYTES,
+    API_POOL_SIZE,
+    API_CONNECT_TIMEOUT,
+    API_READ_TIMEOUT,
+    API_RATE_PER_SECOND,
+    API_RATE_BURST,
+    API_DAILY_QUOTA,
+    API_QUOTA_WARN_RATIO,
+    API_QUOTA_STATE_PATH,
+    API_MAX_RETRIES,
+    API_RETRY_BASE_DELAY,
+    API_RETRY_MAX_DELAY,
+    CIRCUIT_FAILURE_RATIO,
+    CIRCUIT_MIN_CALLS,
+    CIRCUIT_WINDOW,
+    CIRCUIT_RESET_TIMEOUT,
+    CATALOG_MAX_AGE,
+    RESULTS_PAGE_SIZE,
+    PREFETCH_WORKERS,
+)
 from utils.logger_config import logger
+from api.cache import ResponseCache
+from api.client import KinopoiskClient
+from api.disk_cache import DiskCache
+from api.rate_limit import TokenBucket, DailyQuota
+from api.resilience import CircuitBreaker, CLOSED, RETRY_STATUSES, backoff_delay
+from api.single_flight import SingleFlight
+from database import catalog, connection, fallback
+
+API_BASE_URL = "https://api.kinopoisk.dev"
+
+# Единый HTTP-клиент для всех запросов к API
+client = KinopoiskClient(
+    API_BASE_URL,
+    API_KINOPOISK_TOKEN,
+    pool_size=API_POOL_SIZE,
+    connect_timeout=API_CONNECT_TIMEOUT,
+    read_timeout=API_READ_TIMEOUT,
+)
+
+# Ограничение частоты запросов и учёт суточной квоты ключа API
+rate_limiter = TokenBucket(API_RATE_PER_SECOND, API_RATE_BURST)
+api_quota = DailyQuota(API_QUOTA_STATE_PATH, API_DAILY_QUOTA, API_QUOTA_WARN_RATIO)
+
+# Границы бюджета по умолчанию для фильмов с низким и высоким бюджетом
+LOW_BUDGET_MAX = 5_000_000
+HIGH_BUDGET_MIN = 10_000_000
+
+# Верхняя граница диапазона бюджета, когда максимум не задан
+BUDGET_UPPER_BOUND = 10**12
+
+# Поля сортировки результатов поиска по бюджету
+BUDGET_SORT_FIELDS = {"budget": "budget.value", "rating": "rating.kp", "year": "year"}
+
+# Максимум страниц API на один поиск по бюджету
+BUDGET_MAX_PAGES = 5
+
+# Источники страниц результатов: все страницы одного поиска берутся из того же
+# источника, что и первая, потому что порядок фильмов в них может не совпадать
+SOURCE_CATALOG = "catalog"
+SOURCE_API = "api"
+
+# Выключатель, прекращающий запросы к API, пока доля ошибок слишком высока
+circuit_breaker = CircuitBreaker(
+    failure_ratio=CIRCUIT_FAILURE_RATIO,
+    min_calls=CIRCUIT_MIN_CALLS,
+    window=CIRCUIT_WINDOW,
+    reset_timeout=CIRCUIT_RESET_TIMEOUT,
+)
+
+# Потоки для фоновой загрузки следующих страниц результатов
+prefetch_pool = ThreadPoolExecutor(
+    max_workers=PREFETCH_WORKERS, thread_name_prefix="prefetch"
+)
+
+# Кэш ответов API, общий для всех функций поиска
+response_cache = ResponseCache(
+    max_entries=CACHE_MAX_ENTRIES,
+    max_bytes=CACHE_MAX_BYTES,
+    default_ttl=CACHE_DEFAULT_TTL,
+    endpoint_ttls=CACHE_TTLS,
+)
+
+# Объединение одинаковых запросов, выполняющихся одновременно
+request_group = SingleFlight()
+
+# Второй уровень кэша на диске, переживающий перезапуски бота
+disk_cache = DiskCache(
+    API_CACHE_DB_PATH,
+    max_bytes=API_CACHE_MAX_BYTES,
+    default_ttl=CACHE_DEFAULT_TTL,
+    endpoint_ttls=CACHE_TTLS,
+)
+
+
+def fetch_json(
+    endpoint: str, path: str, params: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Выполняет GET-запрос к API Кинопоиска с использованием кэша ответов.
+    Сначала проверяется кэш в памяти, затем дисковый кэш и только потом сеть.
+    Если API недоступен, возвращается устаревший ответ из дискового кэша.
+
+    Args:
+        endpoint (str): Имя эндпоинта, определяющее время жизни записи в кэше.
+        path (str): Путь запроса относительно API_BASE_URL.
+        params (dict, optional): Параметры запроса.
+
+    Returns:
+        Optional[Dict[str, Any]]: Данные ответа или None при ошибке API.
+    """
+    cache_params = {"path": path, **(params or {})}
+    data = response_cache.get(endpoint, cache_params)
+    if data is not None:
+        logger.info(f"Ответ API для '{endpoint}' взят из кэша: {params}")
+        return data
+
+    data, ttl = disk_cache.get_with_ttl(endpoint, cache_params)
+    if data is not None:
+        logger.info(f"Ответ API для '{endpoint}' взят из дискового кэша: {params}")
+        response_cache.set(endpoint, cache_params, data, ttl=ttl)
+        return data
+
+    key = ResponseCache.make_key(endpoint, cache_params)
+    data = request_group.do(
+        key, lambda: _request_api(endpoint, path, params, cache_params)
+    )
+    if data is None:
+        data = disk_cache.get_stale(endpoint, cache_params)
+        if data is not None:
+            logger.warning(f"API недоступен, для '{endpoint}' взят устаревший ответ")
+    return data
+
+
+def fetch_uncached(
+    endpoint: str, path: str, params: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Выполняет GET-запрос к API Кинопоиска в обход кэша ответов.
+    Используется для больших выборок, которые не нужно хранить в кэше,
+    например при синхронизации локального каталога.
+
+    Args:
+        endpoint (str): Имя эндпоинта для логирования.
+        path (str): Путь запроса относительно API_BASE_URL.
+        params (dict, optional): Параметры запроса.
+
+    Returns:
+        Optional[Dict[str, Any]]: Данные ответа или None при ошибке API.
+    """
+    return _request_api(endpoint, path, params, None)
+
+
+def refresh_json(
+    endpoint: str, path: str, params: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Запрашивает ответ API заново и обновляет его в кэше, даже если в кэше
+    есть ещё не истёкшая запись. Используется для прогрева кэша.
+
+    Args:
+        endpoint (str): Имя эндпоинта, определяющее время жизни записи в кэше.
+        path (str): Путь запроса относительно API_BASE_URL.
+        params (dict, optional): Параметры запроса.
+
+    Returns:
+        Optional[Dict[str, Any]]: Данные ответа или None при ошибке API.
+    """
+    cache_params = {"path": path, **(params or {})}
+    key = ResponseCache.make_key(endpoint, cache_params)
+    return request_group.do(
+        key, lambda: _request_api(endpoint, path, params, cache_params)
+    )
+
+
+def _request_api(
+    endpoint: str,
+    path: str,
+    params: Optional[Dict[str, Any]],
+    cache_params: Optional[Dict[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    """
+    Выполняет HTTP-запрос к API и сохраняет успешный ответ в оба уровня кэша.
+
+    Args:
+        endpoint (str): Имя эндпоинта.
+        path (str): Путь запроса относительно API_BASE_URL.
+        params (dict, optional): Параметры запроса.
+        cache_params (dict, optional): Параметры, по которым строится ключ кэша.
+            Если не указаны, ответ в кэш не сохраняется.
+
+    Returns:
+        Optional[Dict[str, Any]]: Данные ответа или None при ошибке API.
+    """
+    if not circuit_breaker.allow():
+        logger.warning(f"Запрос к API '{endpoint}' пропущен: цепь разомкнута")
+        return None
+
+    for attempt in range(API_MAX_RETRIES + 1):
+        if not api_quota.try_consume():
+            logger.warning(
+                f"Запрос к API '{endpoint}' отклонён: суточная квота исчерпана"
+            )
+            return None
+        rate_limiter.acquire()
+        retry_after = None
+        try:
+            response = client.get(path, params)
+        except requests.RequestException as e:
+            # Любая ошибка requests (соединение, таймаут, обрыв ответа)
+            # повторяется и учитывается выключателем
+            logger.error(f"Сетевая ошибка при запросе '{endpoint}': {e!r}")
+        else:
+            logger.info(
+                f"Запрос к API '{endpoint}' с параметрами {params}, "
+                f"статус: {response.status_code}"
+            )
+            if response.status_code == 200:
+                try:
+                    data = response.json()
+                except ValueError as e:
+                    # Повреждённое тело ответа считается сбоем API, а не успехом
+                    logger.error(f"Некорректный JSON в ответе '{endpoint}': {e}")
+                else:
+                    circuit_breaker.record_success()
+                    break
+            else:
+                logger.error(
+                    f"Ошибка API при запросе '{endpoint}': "
+                    f"{response.status_code} - {response.text}"
+                )
+                if response.status_code not in RETRY_STATUSES:
+                    # API ответил, значит он доступен: ошибка в самом запросе
+                    circuit_breaker.record_success()
+                    return None
+                retry_after = response.headers.get("Retry-After")
+
+        circuit_breaker.record_failure()
+        if attempt == API_MAX_RETRIES or not circuit_breaker.allow():
+            return None
+        delay = backoff_delay(
+            attempt, API_RETRY_BASE_DELAY, API_RETRY_MAX_DELAY, retry_after
+        )
+        logger.warning(f"Повтор запроса '{endpoint}' через {delay:.2f} с")
+        time.sleep(delay)
 
+    if cache_params is not None:
+        response_cache.set(endpoint, cache_params, data)
+        disk_cache.set(endpoint, cache_params, data)
+        remember_films(data)
+    return data
 
-def log_request_response(response: requests.Response, *args, **kwargs) -> None:
+
+def remember_films(data: Dict[str, Any]) -> None:
     """
-    Логирует данные HTTP-запроса и соответствующего ответа.
+    Сохраняет фильмы из ответа API в локальный каталог и индекс названий,
+    чтобы следующие поиски по названию не требовали запроса к API.
 
     Args:
-        response (requests.Response): Объект ответа от requests.
-        *args: Дополнительные позиционные аргументы
-        **kwargs: Дополнительные именованные аргументы
+        data (Dict[str, Any]): Ответ API: страница со списком docs или один фильм.
+    """
+    films = data.get("docs", []) if "docs" in data else [data]
+    try:
+        catalog.upsert_movies(films)
+    except DatabaseError as e:
+        logger.error(f"Не удалось сохранить фильмы из ответа API: {e}")
+
 
+def invalidate_cache(endpoint: Optional[str] = None) -> int:
     """
-    request = response.request
-    log_data = {
-        "request_method": request.method,
-        "request_url": request.url,
-        "request_headers": dict(request.headers),
-        "request_body": (
-            request.body.decode("utf-8")
-            if request.body and isinstance(request.body, bytes)
-            else request.body
-        ),
-        "response_status": response.status_code,
-        "response_headers": dict(response.headers),
-        "response_text": response.text,
+    Сбрасывает кэш ответов API в памяти и на диске.
+
+    Args:
+        endpoint (str, optional): Имя эндпоинта. Если не указано, кэш очищается полностью.
+
+    Returns:
+        int: Количество удалённых записей.
+    """
+    removed = response_cache.invalidate(endpoint)
+    removed += disk_cache.invalidate(endpoint)
+    return removed
+
+
+def get_cache_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Возвращает статистику кэша ответов API.
+
+    Returns:
+        Dict[str, Dict[str, int]]: Счётчики попаданий, промахов и вытеснений
+        для кэша в памяти ("memory") и дискового кэша ("disk"), а также
+        количество объединённых одновременных запросов ("single_flight")
+        и состояние выключателя запросов ("circuit").
+    """
+    return {
+        "memory": response_cache.stats(),
+        "disk": disk_cache.stats(),
+        "single_flight": request_group.stats(),
+        "circuit": circuit_breaker.stats(),
     }
-    logger.info("API HTTP call", extra={"props": log_data})
 
 
-# Создаем сессию requests с хуками для логирования
-session = requests.Session()
-session.hooks["response"].append(log_request_response)
+def get_quota_status() -> Dict[str, Any]:
+    """
+    Возвращает состояние суточной квоты запросов к API.
+
+    Returns:
+        Dict[str, Any]: Использовано, лимит, остаток и признак исчерпания.
+    """
+    return api_quota.status()
+
+
+def is_quota_exhausted() -> bool:
+    """
+    Проверяет, исчерпана ли суточная квота запросов к API.
+
+    Returns:
+        bool: True, если новые запросы к API не выполняются до следующих суток.
+    """
+    return api_quota.status()["exhausted"]
+
+
+def search_catalog(
+    search: Callable[..., List[Dict[str, Any]]], *args: Any
+) -> List[Dict[str, Any]]:
+    """
+    Выполняет поиск по локальному каталогу фильмов, если он достаточно свежий.
+
+    Args:
+        search (Callable): Функция поиска из database.catalog.
+        *args: Аргументы функции поиска.
+
+    Returns:
+        List[Dict[str, Any]]: Найденные фильмы или пустой список, если каталог
+        устарел или в нём ничего не нашлось.
+    """
+    if not catalog.is_fresh(CATALOG_MAX_AGE):
+        return []
+    films = search(*args)
+    if films:
+        logger.info(f"Ответ для '{search.__name__}' взят из каталога: {args}")
+    return films
+
+
+def catalog_page(
+    search: Callable[..., List[Dict[str, Any]]],
+    query: Any,
+    page: int,
+    limit: int,
+    source: Optional[str],
+) -> Optional[Dict[str, Any]]:
+    """
+    Возвращает страницу результатов из локального каталога, если поиск
+    начат в каталоге или первая страница нашлась в нём.
+
+    Args:
+        search (Callable): Функция поиска из database.catalog.
+        query: Параметр поиска: жанр или минимальный рейтинг.
+        page (int): Номер страницы, начиная с 1.
+        limit (int): Количество фильмов на странице.
+        source (str, optional): Источник первой страницы; None для первой страницы.
+
+    Returns:
+        Optional[Dict[str, Any]]: Страница результатов или None, если её нужно
+        запросить у API.
+    """
+    if source == SOURCE_API:
+        return None
+    args = (query, limit + 1, (page - 1) * limit)
+    if source == SOURCE_CATALOG:
+        # Закончившийся каталог означает, что следующей страницы нет
+        films = search(*args)
+    else:
+        films = search_catalog(search, *args)
+        if not films:
+            return None
+    return results_page(films[:limit], page, len(films) > limit, SOURCE_CATALOG)
 
 
 def search_films_by_name(name: str) -> List[Dict[str, Any]]:
     """
     Поиск фильмов по названию с помощью API Кинопоиска.
+    Сначала проверяется локальный индекс названий уже встречавшихся фильмов
+    (с учётом опечаток и транслитерации), к API запрос идёт только при промахе.
     Args:
         name (str): Название фильма для поиска.
     Returns:
         List[Dict[str, Any]]: Список найденных фильмов (каждый фильм - словарь с данными).
     """
-    headers = {"X-API-KEY": API_KINOPOISK_TOKEN}
-    params = {"query": name, "limit": 10}
-    response = session.get(
-        "https://api.kinopoisk.dev/v1.4/movie/search", headers=headers, params=params
-    )
-    logger.info(
-        f"Запрос поиска фильмов по названию '{name}', статус: {response.status_code}"
-    )
-    if response.status_code == 200:
-        data = response.json()
-        return data.get("docs", [])
-    else:
-        logger.error(
-            f"Ошибка API при поиске по названию: {response.status_code} - {response.text}"
-        )
-        return []
+    films = catalog.search_by_title(name)
+    if films:
+        logger.info(f"Фильмы по названию '{name}' найдены в локальном индексе")
+        return films
+    data = fetch_json("name", "/v1.4/movie/search", name_params(name))
+    if data is None:
+        return fallback.find_films_by_name(name)
+    return data.get("docs", [])
 
 
 def search_films_by_genre(genre: str) -> List[Dict[str, Any]]:
@@ -78,44 +426,39 @@ def search_films_by_genre(genre: str) -> List[Dict[str, Any]]:
     Returns:
         List[Dict[str, Any]]: Список фильмов с указанным жанром.
     """
-    headers = {"X-API-KEY": API_KINOPOISK_TOKEN}
-    params = {"genres.name": genre, "limit": 10}
-    response = session.get(
-        "https://api.kinopoisk.dev/v1.4/movie", headers=headers, params=params
-    )
-    logger.info(
-        f"Запрос поиска фильмов по жанру '{genre}', статус: {response.status_code}"
-    )
-    if response.status_code == 200:
-        data = response.json()
-        return data.get("docs", [])
-    else:
-        logger.error(
-            f"Ошибка API при поиске по жанру: {response.status_code} - {response.text}"
-        )
-        return []
+    return get_genre_page(genre, 1, 10)["docs"]
 
 
-def log_request_response(response: requests.Response, *args, **kwargs) -> None:
-    request = response.request
-    log_data = {
-        "request_method": request.method,
-        "request_url": request.url,
-        "request_headers": dict(request.headers),
-        "request_body": (
-            request.body.decode("utf-8")
-            if request.body and isinstance(request.body, bytes)
-            else request.body
-        ),
-        "response_status": response.status_code,
-        "response_headers": dict(response.headers),
-        "response_text": response.text,
-    }
-    logger.info("API HTTP call", extra={"props": log_data})
+def get_genre_page(
+    genre: str,
+    page: int = 1,
+    limit: int = RESULTS_PAGE_SIZE,
+    source: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Возвращает страницу результатов поиска фильмов по жанру.
+    Фильмы упорядочены по числу оценок и ID, чтобы страницы не пересекались.
 
+    Args:
+        genre (str): Название жанра.
+        page (int): Номер страницы, начиная с 1.
+        limit (int): Количество фильмов на странице.
+        source (str, optional): Источник первой страницы поиска (SOURCE_CATALOG
+            или SOURCE_API); None для первой страницы.
 
-session = requests.Session()
-session.hooks["response"].append(log_request_response)
+    Returns:
+        Dict[str, Any]: Фильмы страницы ("docs"), её номер ("page"),
+        признак наличия следующей страницы ("has_next") и источник ("source").
+    """
+    result = catalog_page(catalog.search_by_genre, genre, page, limit, source)
+    if result is not None:
+        return result
+    data = fetch_json("genre", "/v1.4/movie", genre_params(genre, page, limit))
+    if data is None:
+        films = fallback.find_films_by_genre(genre, limit) if page == 1 else []
+        return results_page(films, page, False, SOURCE_API)
+    has_next = page < data.get("pages", 0)
+    return results_page(data.get("docs", []), page, has_next, SOURCE_API)
 
 
 def search_films_by_rating(min_rating: float, limit: int = 10) -> List[Dict[str, Any]]:
@@ -127,77 +470,275 @@ def search_films_by_rating(min_rating: float, limit: int = 10) -> List[Dict[str,
     Returns:
         List[Dict[str, Any]]: Список фильмов с рейтингом >= min_rating.
     """
-    headers = {"X-API-KEY": API_KINOPOISK_TOKEN}
-    params = {"rating.imdb": f"{min_rating}-10", "limit": limit}
-    response = session.get(
-        "https://api.kinopoisk.dev/v1.4/movie", headers=headers, params=params
-    )
-    logger.info(
-        f"Запрос поиска фильмов с рейтингом от {min_rating}, статус: {response.status_code}"
-    )
-    if response.status_code == 200:
-        data = response.json()
-        return data.get("docs", [])
-    else:
-        logger.error(
-            f"Ошибка API при поиске по рейтингу: {response.status_code} - {response.text}"
-        )
-        return []
+    return get_rating_page(min_rating, 1, limit)["docs"]
+
+
+def get_rating_page(
+    min_rating: float,
+    page: int = 1,
+    limit: int = RESULTS_PAGE_SIZE,
+    source: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Возвращает страницу результатов поиска фильмов с рейтингом IMDB не ниже
+    заданного. Фильмы упорядочены по убыванию рейтинга и по ID.
+
+    Args:
+        min_rating (float): Минимальный рейтинг.
+        page (int): Номер страницы, начиная с 1.
+        limit (int): Количество фильмов на странице.
+        source (str, optional): Источник первой страницы поиска (SOURCE_CATALOG
+            или SOURCE_API); None для первой страницы.
+
+    Returns:
+        Dict[str, Any]: Фильмы страницы ("docs"), её номер ("page"),
+        признак наличия следующей страницы ("has_next") и источник ("source").
+    """
+    result = catalog_page(catalog.search_by_rating, min_rating, page, limit, source)
+    if result is not None:
+        return result
+    data = fetch_json("rating", "/v1.4/movie", rating_params(min_rating, page, limit))
+    if data is None:
+        films = fallback.find_films_by_rating(min_rating, limit) if page == 1 else []
+        return results_page(films, page, False, SOURCE_API)
+    has_next = page < data.get("pages", 0)
+    return results_page(data.get("docs", []), page, has_next, SOURCE_API)
 
 
-def search_films_by_low_budget(limit: int = 10) -> List[Dict[str, Any]]:
+def results_page(
+    films: List[Dict[str, Any]], page: int, has_next: bool, source: str
+) -> Dict[str, Any]:
     """
-    Поиск фильмов с низким бюджетом (не более 5 млн или без бюджета).
+    Собирает страницу результатов поиска.
 
     Args:
+        films (List[Dict[str, Any]]): Фильмы страницы.
+        page (int): Номер страницы.
+        has_next (bool): Есть ли следующая страница.
+        source (str): Источник страницы: SOURCE_CATALOG или SOURCE_API.
+
+    Returns:
+        Dict[str, Any]: Страница с ключами "docs", "page", "has_next" и "source".
+    """
+    return {"docs": films, "page": page, "has_next": has_next, "source": source}
+
+
+def prefetch(fn: Callable[..., Any], *args: Any) -> None:
+    """
+    Выполняет запрос в фоновом потоке, чтобы заранее поместить ответ в кэш,
+    например следующую страницу результатов, пока пользователь читает текущую.
+    Не выполняется, если API недоступен или суточная квота исчерпана.
+
+    Args:
+        fn (Callable): Функция запроса к API.
+        *args: Аргументы функции.
+    """
+    if circuit_breaker.state != CLOSED or is_quota_exhausted():
+        return
+
+    def run() -> None:
+        try:
+            with connection():
+                fn(*args)
+        except Exception as e:
+            logger.error(f"Ошибка фоновой загрузки {fn.__name__}{args}: {e}")
+
+    prefetch_pool.submit(run)
+
+
+def search_films_by_budget(
+    min_budget: Optional[int] = None,
+    max_budget: Optional[int] = None,
+    limit: int = 10,
+    sort_by: str = "budget",
+    descending: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Поиск фильмов с бюджетом в заданных пределах.
+    Фильтрация и сортировка выполняются на стороне API, страницы
+    запрашиваются, пока не наберётся limit фильмов.
+
+    Args:
+        min_budget (int, optional): Минимальный бюджет.
+        max_budget (int, optional): Максимальный бюджет.
         limit (int): Максимальное количество фильмов для возврата (по умолчанию 10).
+        sort_by (str): Поле сортировки: "budget", "rating" или "year".
+        descending (bool): Сортировать по убыванию.
 
     Returns:
-         List[Dict[str, Any]]: Отфильтрованный список фильмов с низким бюджетом.
+        List[Dict[str, Any]]: Фильмы, упорядоченные по выбранному полю и ID.
     """
-    headers = {"X-API-KEY": API_KINOPOISK_TOKEN}
-    params = {"limit": limit * 5}  # Запрашиваем больше для локальной фильтрации
-    response = requests.get(
-        "https://api.kinopoisk.dev/v1.4/movie", headers=headers, params=params
+    films = search_catalog(
+        catalog.search_by_budget, min_budget, max_budget, limit, sort_by, descending
     )
-    if response.status_code == 200:
-        films = response.json().get("docs", [])
-        filtered_films = []
-        for film in films:
-            budget = film.get("budget", {}).get("value")
-            if budget is None or budget <= 5_000_000:
-                filtered_films.append(film)
-            if len(filtered_films) == limit:
-                break
-        return filtered_films
-    else:
-        return []
+    if films:
+        return films
+
+    params = budget_params(min_budget, max_budget, limit, sort_by, descending)
+    films = []
+    for page in range(1, BUDGET_MAX_PAGES + 1):
+        data = fetch_json("budget", "/v1.4/movie", {**params, "page": page})
+        if data is None:
+            break
+        films += filter_by_budget(data.get("docs", []), min_budget, max_budget)
+        if len(films) >= limit or page >= data.get("pages", 0):
+            break
+    return films[:limit]
 
 
-def search_films_by_high_budget(limit: int = 10) -> List[Dict[str, Any]]:
+def search_films_by_low_budget(
+    limit: int = 10,
+    max_budget: int = LOW_BUDGET_MAX,
+    sort_by: str = "budget",
+    descending: bool = False,
+) -> List[Dict[str, Any]]:
     """
-    Поиск фильмов с высоким бюджетом (не менее 10 млн).
+    Поиск фильмов с низким бюджетом (по умолчанию не более 5 млн).
 
     Args:
         limit (int): Максимальное количество фильмов для возврата (по умолчанию 10).
+        max_budget (int): Максимальный бюджет.
+        sort_by (str): Поле сортировки: "budget", "rating" или "year".
+        descending (bool): Сортировать по убыванию.
 
     Returns:
-        List[Dict[str, Any]]: Отфильтрованный список фильмов с высоким бюджетом.
+         List[Dict[str, Any]]: Список фильмов с низким бюджетом.
     """
-    headers = {"X-API-KEY": API_KINOPOISK_TOKEN}
-    params = {"limit": limit * 5}
-    response = requests.get(
-        "https://api.kinopoisk.dev/v1.4/movie", headers=headers, params=params
-    )
-    if response.status_code == 200:
-        films = response.json().get("docs", [])
-        filtered_films = []
-        for film in films:
-            budget = film.get("budget", {}).get("value")
-            if budget is not None and budget >= 10_000_000:
-                filtered_films.append(film)
-            if len(filtered_films) == limit:
-                break
-        return filtered_films
-    else:
-        return []
+    return search_films_by_budget(None, max_budget, limit, sort_by, descending)
+
+
+def search_films_by_high_budget(
+    limit: int = 10,
+    min_budget: int = HIGH_BUDGET_MIN,
+    sort_by: str = "budget",
+    descending: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Поиск фильмов с высоким бюджетом (по умолчанию не менее 10 млн).
+
+    Args:
+        limit (int): Максимальное количество фильмов для возврата (по умолчанию 10).
+        min_budget (int): Минимальный бюджет.
+        sort_by (str): Поле сортировки: "budget", "rating" или "year".
+        descending (bool): Сортировать по убыванию.
+
+    Returns:
+        List[Dict[str, Any]]: Список фильмов с высоким бюджетом.
+    """
+    return search_films_by_budget(min_budget, None, limit, sort_by, descending)
+
+
+def name_params(name: str) -> Dict[str, Any]:
+    """
+    Формирует параметры запроса поиска фильмов по названию.
+
+    Args:
+        name (str): Название фильма.
+
+    Returns:
+        Dict[str, Any]: Параметры запроса.
+    """
+    return {"query": name, "limit": 10}
+
+
+def genre_params(genre: str, page: int, limit: int) -> Dict[str, Any]:
+    """
+    Формирует параметры запроса страницы фильмов заданного жанра,
+    упорядоченных по числу оценок и ID.
+
+    Args:
+        genre (str): Название жанра.
+        page (int): Номер страницы.
+        limit (int): Размер страницы.
+
+    Returns:
+        Dict[str, Any]: Параметры запроса.
+    """
+    return {
+        "genres.name": genre,
+        "limit": limit,
+        "page": page,
+        "sortField": ["votes.kp", "id"],
+        "sortType": [-1, 1],
+    }
+
+
+def rating_params(min_rating: float, page: int, limit: int) -> Dict[str, Any]:
+    """
+    Формирует параметры запроса страницы фильмов с рейтингом IMDB не ниже
+    заданного, упорядоченных по убыванию рейтинга и по ID.
+
+    Args:
+        min_rating (float): Минимальный рейтинг.
+        page (int): Номер страницы.
+        limit (int): Размер страницы.
+
+    Returns:
+        Dict[str, Any]: Параметры запроса.
+    """
+    return {
+        "rating.imdb": f"{min_rating}-10",
+        "limit": limit,
+        "page": page,
+        "sortField": ["rating.imdb", "id"],
+        "sortType": [-1, 1],
+    }
+
+
+def budget_params(
+    min_budget: Optional[int],
+    max_budget: Optional[int],
+    limit: int,
+    sort_by: str,
+    descending: bool,
+) -> Dict[str, Any]:
+    """
+    Формирует параметры запроса фильмов с бюджетом в заданных пределах.
+    Вторым полем сортировки всегда идёт ID, чтобы порядок фильмов с одинаковым
+    значением не менялся между страницами и запросами.
+
+    Args:
+        min_budget (int, optional): Минимальный бюджет.
+        max_budget (int, optional): Максимальный бюджет.
+        limit (int): Размер страницы.
+        sort_by (str): Поле сортировки: "budget", "rating" или "year".
+        descending (bool): Сортировать по убыванию.
+
+    Returns:
+        Dict[str, Any]: Параметры запроса без номера страницы.
+    """
+    return {
+        "budget.value": f"{min_budget or 0}-{max_budget or BUDGET_UPPER_BOUND}",
+        "limit": limit,
+        "sortField": [BUDGET_SORT_FIELDS[sort_by], "id"],
+        "sortType": [-1 if descending else 1, 1],
+    }
+
+
+def filter_by_budget(
+    films: List[Dict[str, Any]],
+    min_budget: Optional[int],
+    max_budget: Optional[int],
+) -> List[Dict[str, Any]]:
+    """
+    Отбрасывает фильмы без бюджета или с бюджетом вне заданных пределов.
+
+    Args:
+        films (List[Dict[str, Any]]): Фильмы из ответа API.
+        min_budget (int, optional): Минимальный бюджет.
+        max_budget (int, optional): Максимальный бюджет.
+
+    Returns:
+        List[Dict[str, Any]]: Отфильтрованный список фильмов.
+    """
+    filtered_films = []
+    for film in films:
+        budget = (film.get("budget") or {}).get("value")
+        if budget is None:
+            continue
+        if min_budget is not None and budget < min_budget:
+            continue
+        if max_budget is not None and budget > max_budget:
+            continue
+        filtered_films.append(film)
+    return filtered_films
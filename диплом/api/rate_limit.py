@@ -0,0 +1,159 @@
+"""
+Ограничение частоты запросов к API Кинопоиска на стороне клиента.
+Token bucket сглаживает всплески запросов до допустимой частоты,
+DailyQuota ведёт учёт суточного лимита ключа API с сохранением на диск.
+"""
+
+import asyncio
+import datetime
+import json
+import os
+import threading
+import time
+from typing import Any, Dict
+
+from utils.logger_config import logger
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты по алгоритму token bucket.
+
+    Запросы сверх доступных токенов не отклоняются, а ставятся в очередь:
+    каждый получает время ожидания, после которого для него появится токен.
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        """
+        Args:
+            rate (float): Скорость пополнения, токенов в секунду.
+            capacity (int): Максимальное число токенов (размер всплеска).
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Резервирует токен.
+
+        Returns:
+            float: Сколько секунд нужно подождать перед запросом.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Блокирует поток, пока запрос не уложится в допустимую частоту."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Асинхронный вариант acquire, не блокирующий цикл событий."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class DailyQuota:
+    """
+    Учёт суточного лимита запросов к API с сохранением в JSON-файл,
+    чтобы счётчик не обнулялся при перезапуске бота.
+    """
+
+    def __init__(self, path: str, limit: int, warn_ratio: float = 0.8) -> None:
+        """
+        Args:
+            path (str): Путь к файлу состояния.
+            limit (int): Суточный лимит запросов.
+            warn_ratio (float): Доля лимита, после которой в лог пишется предупреждение.
+        """
+        self.path = path
+        self.limit = limit
+        self.warn_ratio = warn_ratio
+        self._lock = threading.Lock()
+        self._day = datetime.date.today().isoformat()
+        self._used = 0
+        self._load()
+
+    def _load(self) -> None:
+        """Загружает счётчик за текущие сутки из файла."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.error(f"Не удалось прочитать состояние квоты API: {e}")
+            return
+        if state.get("day") == self._day:
+            self._used = int(state.get("used", 0))
+
+    def _save(self) -> None:
+        """Атомарно сохраняет счётчик в файл. Вызывается под блокировкой."""
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"day": self._day, "used": self._used}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Не удалось сохранить состояние квоты API: {e}")
+
+    def _rollover(self) -> None:
+        """Обнуляет счётчик при смене суток. Вызывается под блокировкой."""
+        today = datetime.date.today().isoformat()
+        if today != self._day:
+            self._day = today
+            self._used = 0
+
+    def try_consume(self) -> bool:
+        """
+        Учитывает один запрос, если суточный лимит ещё не исчерпан.
+
+        Returns:
+            bool: True, если запрос разрешён.
+        """
+        with self._lock:
+            self._rollover()
+            if self._used >= self.limit:
+                return False
+            self._used += 1
+            self._save()
+            used = self._used
+        if used == self.limit:
+            logger.warning(
+                f"Суточный лимит запросов к API исчерпан: {used}/{self.limit}"
+            )
+        elif used == int(self.limit * self.warn_ratio):
+            logger.warning(
+                f"Использовано {used} из {self.limit} суточных запросов к API"
+            )
+        return True
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Возвращает состояние суточной квоты.
+
+        Returns:
+            Dict[str, Any]: Дата, использовано, лимит, остаток и признак исчерпания.
+        """
+        with self._lock:
+            self._rollover()
+            return {
+                "day": self._day,
+                "used": self._used,
+                "limit": self.limit,
+                "remaining": max(0, self.limit - self._used),
+                "exhausted": self._used >= self.limit,
+            }
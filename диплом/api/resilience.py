@@ -0,0 +1,175 @@
+"""
+Устойчивость к сбоям API Кинопоиска: повторы с экспоненциальной задержкой
+и случайным разбросом (full jitter) и автоматический выключатель (circuit breaker),
+который перестаёт обращаться к API, пока доля ошибок слишком высока.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from utils.logger_config import logger
+
+# Коды ответа, при которых запрос имеет смысл повторить
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def backoff_delay(
+    attempt: int,
+    base_delay: float,
+    max_delay: float,
+    retry_after: Optional[str] = None,
+) -> float:
+    """
+    Вычисляет задержку перед повтором запроса.
+
+    Задержка выбирается случайно от 0 до base_delay * 2 ** attempt, но не больше
+    max_delay, чтобы повторы разных пользователей не приходили к API одновременно.
+    Если API прислал заголовок Retry-After, задержка не меньше указанной в нём.
+
+    Args:
+        attempt (int): Номер неудачной попытки, начиная с 0.
+        base_delay (float): Базовая задержка, в секундах.
+        max_delay (float): Максимальная задержка, в секундах.
+        retry_after (str, optional): Значение заголовка Retry-After.
+
+    Returns:
+        float: Задержка в секундах.
+    """
+    delay = random.uniform(0, min(max_delay, base_delay * 2**attempt))
+    if retry_after:
+        try:
+            delay = max(delay, min(max_delay, float(retry_after)))
+        except ValueError:
+            pass
+    return delay
+
+
+class CircuitBreaker:
+    """
+    Автоматический выключатель запросов к API.
+
+    В закрытом состоянии запросы проходят, а их результаты учитываются в
+    скользящем окне. Когда доля ошибок в окне достигает порога, выключатель
+    размыкается и запросы сразу отклоняются. Через reset_timeout пропускается
+    один пробный запрос: успех замыкает цепь, ошибка снова её размыкает.
+    """
+
+    def __init__(
+        self,
+        failure_ratio: float = 0.5,
+        min_calls: int = 5,
+        window: float = 60,
+        reset_timeout: float = 30,
+    ) -> None:
+        """
+        Args:
+            failure_ratio (float): Доля ошибок, при которой цепь размыкается.
+            min_calls (int): Минимальное число запросов в окне для оценки доли ошибок.
+            window (float): Длительность скользящего окна, в секундах.
+            reset_timeout (float): Время до пробного запроса, в секундах.
+        """
+        self.failure_ratio = failure_ratio
+        self.min_calls = min_calls
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        self._results: Deque[Tuple[float, bool]] = deque()
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Текущее состояние выключателя: closed, open или half_open."""
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """
+        Проверяет, можно ли выполнить запрос к API.
+
+        Returns:
+            bool: True, если запрос разрешён.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            now = time.monotonic()
+            if self._state == OPEN and now - self._opened_at >= self.reset_timeout:
+                self._state = HALF_OPEN
+                self._probe_started = None
+                logger.info("Пробный запрос к API после размыкания цепи")
+            # Пробный запрос, не сообщивший результат за reset_timeout,
+            # считается потерянным, и разрешается следующий
+            if self._state == HALF_OPEN and (
+                self._probe_started is None
+                or now - self._probe_started >= self.reset_timeout
+            ):
+                self._probe_started = now
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        """Учитывает успешный ответ API."""
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info("API снова отвечает, цепь замкнута")
+                self._state = CLOSED
+                self._results.clear()
+            self._record(True)
+
+    def record_failure(self) -> None:
+        """Учитывает ошибку API и при необходимости размыкает цепь."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._open()
+                return
+            self._record(False)
+            failures = sum(1 for _, ok in self._results if not ok)
+            if (
+                self._state == CLOSED
+                and len(self._results) >= self.min_calls
+                and failures / len(self._results) >= self.failure_ratio
+            ):
+                self._open()
+
+    def _record(self, ok: bool) -> None:
+        """Добавляет результат в окно и отбрасывает устаревшие. Вызывается под блокировкой."""
+        now = time.monotonic()
+        self._results.append((now, ok))
+        while self._results and now - self._results[0][0] > self.window:
+            self._results.popleft()
+
+    def _open(self) -> None:
+        """Размыкает цепь. Вызывается под блокировкой."""
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._probe_started = None
+        logger.warning(
+            f"API Кинопоиска недоступен, цепь разомкнута на {self.reset_timeout} с"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Возвращает состояние выключателя.
+
+        Returns:
+            Dict[str, Any]: Состояние, число запросов и ошибок в окне,
+            число отклонённых запросов.
+        """
+        with self._lock:
+            return {
+                "state": self._state,
+                "calls": len(self._results),
+                "failures": sum(1 for _, ok in self._results if not ok),
+                "rejected": self.rejected,
+            }
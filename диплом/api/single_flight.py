@@ -0,0 +1,149 @@
+"""
+Объединение одинаковых одновременных запросов (single-flight).
+Пока выполняется запрос с некоторым ключом, остальные потоки с тем же ключом
+не создают новый запрос, а дожидаются и получают его результат.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict
+
+
+class _Call:
+    """Выполняющийся запрос и его результат."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Группа запросов, в которой для каждого ключа одновременно
+    выполняется не больше одного вызова.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.executions = 0
+        self.collapsed = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Выполняет fn или присоединяется к уже выполняющемуся вызову с тем же ключом.
+
+        Args:
+            key (str): Ключ запроса.
+            fn (Callable[[], Any]): Функция, выполняющая запрос.
+
+        Returns:
+            Any: Результат fn. Исключение fn пробрасывается всем ожидающим.
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self.collapsed += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Возвращает статистику объединения запросов.
+
+        Returns:
+            Dict[str, int]: Всего вызовов, реально выполненных и объединённых.
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executions": self.executions,
+                "collapsed": self.collapsed,
+                "in_flight": len(self._calls),
+            }
+
+
+class AsyncSingleFlight:
+    """
+    Асинхронный вариант SingleFlight для одного цикла событий asyncio.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, asyncio.Future] = {}
+        self.calls = 0
+        self.executions = 0
+        self.collapsed = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Выполняет корутину fn или дожидается уже выполняющейся с тем же ключом.
+
+        Args:
+            key (str): Ключ запроса.
+            fn (Callable[[], Awaitable[Any]]): Функция, создающая корутину запроса.
+
+        Returns:
+            Any: Результат fn. Исключение fn пробрасывается всем ожидающим.
+        """
+        self.calls += 1
+        future = self._calls.get(key)
+        if future is not None:
+            self.collapsed += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.executions += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Помечаем исключение полученным, если ожидающих не было
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Возвращает статистику объединения запросов.
+
+        Returns:
+            Dict[str, int]: Всего вызовов, реально выполненных и объединённых.
+        """
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "collapsed": self.collapsed,
+            "in_flight": len(self._calls),
+        }
@@ -0,0 +1,225 @@
+"""
+Замер скорости запросов истории поиска за день на большой таблице.
+Сравнивает прежний запрос с фильтром DATE(timestamp) = день при индексе
+только по user_id и текущий запрос history_query с полуинтервалом
+[начало дня, начало следующего дня) и индексом (user, timestamp), а также
+листание всей истории пользователя через OFFSET и по ключу (timestamp, id).
+Данные создаются во временном файле SQLite, рабочая база бота не затрагивается.
+
+Запуск: python bench_history.py [--rows N] [--users N] [--days N] [--queries N]
+"""
+
+import argparse
+import datetime
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Callable, List, Tuple
+
+from peewee import SqliteDatabase, fn
+
+from database import User, Movie, SearchHistory
+from handlers.custom_handlers.history import history_page, history_key
+from handlers.custom_handlers.history import history_query
+from utils.callbacks import OLDER
+
+# Размер пакета строк при заполнении таблицы
+INSERT_BATCH = 50000
+COMMANDS = ["/movie_search", "/movie_by_genre", "/movie_by_rating", "/history"]
+
+
+def fill_history(bench_db: SqliteDatabase, rows: int, users: int, days: int) -> None:
+    """
+    Заполняет таблицы пользователей и истории случайными записями.
+
+    Args:
+        bench_db (SqliteDatabase): Временная база.
+        rows (int): Количество записей истории.
+        users (int): Количество пользователей.
+        days (int): За сколько последних дней распределены записи.
+    """
+    rnd = random.Random(42)
+    start = datetime.datetime.now() - datetime.timedelta(days=days)
+    span = days * 86400
+    with bench_db.atomic():
+        User.insert_many(
+            [{"user_id": str(i), "username": f"user{i}"} for i in range(1, users + 1)]
+        ).execute()
+    sql = (
+        "INSERT INTO searchhistory (user_id, query, command, timestamp) "
+        "VALUES (?, ?, ?, ?)"
+    )
+    done = 0
+    while done < rows:
+        batch = []
+        for _ in range(min(INSERT_BATCH, rows - done)):
+            moment = start + datetime.timedelta(seconds=rnd.random() * span)
+            batch.append(
+                (
+                    rnd.randint(1, users),
+                    f"запрос {rnd.randint(1, 5000)}",
+                    rnd.choice(COMMANDS),
+                    moment.strftime("%Y-%m-%d %H:%M:%S.%f"),
+                )
+            )
+        with bench_db.atomic():
+            bench_db.cursor().executemany(sql, batch)
+        done += len(batch)
+
+
+def date_query(user: User, target_date: datetime.date):
+    """Прежний запрос истории за день с функцией DATE над столбцом."""
+    return (
+        SearchHistory.select()
+        .where(
+            (SearchHistory.user == user)
+            & (fn.DATE(SearchHistory.timestamp) == target_date)
+        )
+        .order_by(SearchHistory.timestamp.desc())
+    )
+
+
+def measure(
+    build: Callable, samples: List[Tuple[User, datetime.date]]
+) -> Tuple[float, int]:
+    """
+    Выполняет запрос для каждой пары (пользователь, день), как обработчик
+    /history: проверка наличия записей и вывод первых десяти.
+
+    Returns:
+        Tuple[float, int]: Медиана времени запроса в миллисекундах
+            и общее число полученных записей.
+    """
+    timings = []
+    found = 0
+    for user, target_date in samples:
+        started = time.perf_counter()
+        query = build(user, target_date)
+        if query.exists():
+            found += len(list(query.limit(10)))
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), found
+
+
+def measure_paging(user: User, size: int = 5) -> Tuple[float, float, int]:
+    """
+    Листает всю историю пользователя страницами по size записей двумя
+    способами: OFFSET и ключ (timestamp, id) последней записи страницы.
+
+    Returns:
+        Tuple[float, float, int]: Время выборки последней страницы через OFFSET
+            и по ключу в миллисекундах и число страниц.
+    """
+    offset_ms = keyset_ms = 0.0
+    pages = 0
+    key = None
+    has_older = True
+    while has_older:
+        started = time.perf_counter()
+        list(history_query(user).offset(pages * size).limit(size))
+        offset_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        entries, _, has_older = history_page(
+            user, direction=OLDER if key else None, key=key, size=size
+        )
+        keyset_ms = (time.perf_counter() - started) * 1000
+        key = history_key(entries[-1]) if entries else None
+        pages += 1
+    return offset_ms, keyset_ms, pages
+
+
+def query_plan(bench_db: SqliteDatabase, query) -> str:
+    """Возвращает план выполнения запроса SQLite одной строкой."""
+    sql, params = query.sql()
+    rows = bench_db.execute_sql(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return "; ".join(row[-1] for row in rows)
+
+
+def run_benchmark(rows: int, users: int, days: int, queries: int) -> None:
+    """
+    Создаёт временную базу, заполняет историю и сравнивает два запроса.
+
+    Args:
+        rows (int): Количество записей истории.
+        users (int): Количество пользователей.
+        days (int): За сколько последних дней распределены записи.
+        queries (int): Количество замеряемых запросов каждого вида.
+    """
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    bench_db = SqliteDatabase(
+        path, pragmas={"journal_mode": "wal", "synchronous": "off"}
+    )
+    try:
+        with bench_db.bind_ctx([User, Movie, SearchHistory]):
+            bench_db.create_tables([User, Movie])
+            # Таблица без индексов из Meta: сначала замеряется прежняя схема
+            SearchHistory._schema.create_table()
+            bench_db.execute_sql(
+                "CREATE INDEX searchhistory_user_id ON searchhistory (user_id)"
+            )
+            started = time.perf_counter()
+            fill_history(bench_db, rows, users, days)
+            print(
+                f"Записей истории: {rows}, пользователей: {users}, "
+                f"заполнение {time.perf_counter() - started:.1f} с"
+            )
+
+            rnd = random.Random(7)
+            today = datetime.date.today()
+            samples = [
+                (
+                    User.get_by_id(rnd.randint(1, users)),
+                    today - datetime.timedelta(days=rnd.randint(0, days)),
+                )
+                for _ in range(queries)
+            ]
+
+            old_ms, old_found = measure(date_query, samples)
+            print(
+                f"DATE(timestamp), индекс user_id: {old_ms:.3f} мс, записей {old_found}"
+            )
+            print(f"  план: {query_plan(bench_db, date_query(*samples[0]))}")
+
+            bench_db.execute_sql("DROP INDEX searchhistory_user_id")
+            SearchHistory._schema.create_indexes()
+            bench_db.execute_sql("ANALYZE")
+            new_ms, new_found = measure(history_query, samples)
+            print(
+                f"Полуинтервал, индекс (user, timestamp): {new_ms:.3f} мс, "
+                f"записей {new_found}"
+            )
+            print(f"  план: {query_plan(bench_db, history_query(*samples[0]))}")
+            if new_ms > 0:
+                print(f"Ускорение: в {old_ms / new_ms:.1f} раза")
+
+            heaviest = (
+                SearchHistory.select(SearchHistory.user)
+                .group_by(SearchHistory.user)
+                .order_by(fn.COUNT(SearchHistory.id).desc())
+                .limit(1)
+                .scalar()
+            )
+            offset_ms, keyset_ms, pages = measure_paging(User.get_by_id(heaviest))
+            print(
+                f"Последняя из {pages} страниц истории: OFFSET {offset_ms:.3f} мс, "
+                f"ключ (timestamp, id) {keyset_ms:.3f} мс"
+            )
+    finally:
+        bench_db.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    run_benchmark(args.rows, args.users, args.days, args.queries)
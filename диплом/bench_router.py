@@ -0,0 +1,203 @@
+"""
+Замер стоимости выбора обработчика текстового сообщения.
+Сравнивает прежний список обработчиков telebot (команды, повторные /start
+и /stop, лямбды reply-кнопок и фильтры состояний проверяются по очереди)
+с маршрутизатором utils.router, выбирающим обработчик по словарю.
+Замеряется полная обработка сообщения ботом (вместе с постоянными расходами
+telebot) и отдельно только выбор обработчика.
+Обработчики ничего не делают, сеть и база данных не используются.
+
+Запуск: python bench_router.py [--repeat N]
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, List, Tuple
+
+from telebot import TeleBot, custom_filters
+from telebot.storage import StateMemoryStorage
+from telebot.types import Message
+
+from states import MovieSearchStates
+from utils.router import MessageRouter
+
+COMMANDS = [
+    "movie_by_genre",
+    "movie_search",
+    "movie_by_rating",
+    "low_budget_movie",
+    "high_budget_movie",
+    "history",
+    "add_favorite",
+    "favorites",
+    "remove_favorite",
+]
+
+# Состояния ввода в порядке регистрации обработчиков
+STATES = [
+    MovieSearchStates.waiting_for_genre,
+    MovieSearchStates.waiting_for_name,
+    MovieSearchStates.waiting_for_rating,
+    MovieSearchStates.waiting_for_history_date,
+]
+
+# Сообщения замера: текст и состояние пользователя
+SAMPLES: List[Tuple[str, object]] = [
+    ("/start", None),
+    ("/remove_favorite 301", None),
+    ("Помощь", None),
+    ("комедия", MovieSearchStates.waiting_for_genre),
+    ("17.10.2026", MovieSearchStates.waiting_for_history_date),
+    ("привет", None),
+]
+
+
+def noop(message: Message) -> None:
+    """Обработчик, который ничего не делает."""
+
+
+def make_bot() -> TeleBot:
+    """Создаёт бота без сетевых обращений с фильтром состояний."""
+    bot = TeleBot(
+        "0:bench",
+        threaded=False,
+        state_storage=StateMemoryStorage(),
+        use_class_middlewares=True,
+    )
+    bot.add_custom_filter(custom_filters.StateFilter(bot))
+    return bot
+
+
+def legacy_bot() -> TeleBot:
+    """Бот с обработчиками в прежнем порядке регистрации."""
+    bot = make_bot()
+    for commands in (
+        ["start"],
+        ["help"],
+        ["stop", "Стоп"],
+        ["start", "Старт"],
+        ["start"],
+        ["stop"],
+        ["help"],
+    ):
+        bot.register_message_handler(noop, commands=commands)
+    for text in ("Старт", "Стоп", "Помощь"):
+        bot.register_message_handler(noop, func=lambda m, text=text: m.text == text)
+    states = iter(STATES)
+    for command in COMMANDS:
+        bot.register_message_handler(noop, commands=[command])
+        if command in ("movie_by_genre", "movie_search", "movie_by_rating", "history"):
+            bot.register_message_handler(noop, state=next(states))
+    return bot
+
+
+def routed_bot() -> Tuple[TeleBot, MessageRouter]:
+    """Бот с теми же обработчиками в маршрутизаторе."""
+    bot = make_bot()
+    router = MessageRouter()
+    router.command("start", "Старт")(noop)
+    router.text("Старт")(noop)
+    router.command("help")(noop)
+    router.text("Помощь")(noop)
+    router.command("stop", "Стоп")(noop)
+    router.text("Стоп")(noop)
+    for command in COMMANDS:
+        router.command(command)(noop)
+    for state in STATES:
+        router.state(state)(noop)
+    router.setup(bot)
+    return bot, router
+
+
+def make_message(text: str, user_id: int) -> Message:
+    """Создаёт текстовое сообщение пользователя в личном чате."""
+    return Message.de_json(
+        {
+            "message_id": 1,
+            "from": {"id": user_id, "is_bot": False, "first_name": "bench"},
+            "chat": {"id": user_id, "type": "private"},
+            "date": 0,
+            "text": text,
+        }
+    )
+
+
+def legacy_select(bot: TeleBot, message: Message):
+    """Выбирает обработчик, как telebot: первый, чьи фильтры пропускают сообщение."""
+    for handler in bot.message_handlers:
+        if bot._test_message_handler(handler, message):
+            return handler
+    return None
+
+
+def routed_select(bot: TeleBot, router: MessageRouter, message: Message):
+    """Выбирает обработчик маршрутизатором."""
+    routes = router.lookup(message)
+    state = None
+    if router.needs_state(routes):
+        state = bot.get_state(message.from_user.id, message.chat.id)
+    return router.select(routes, state)
+
+
+def median_us(func: Callable[[], object], repeat: int) -> float:
+    """Возвращает медиану времени вызова функции в микросекундах."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(timings)
+
+
+def measure(bot: TeleBot, select: Callable, text: str, state, repeat: int):
+    """
+    Обрабатывает одно сообщение repeat раз и отдельно выбирает для него
+    обработчик repeat раз.
+
+    Returns:
+        Tuple[float, float]: Медианы времени обработки сообщения
+            и выбора обработчика в микросекундах.
+    """
+    user_id = 1000
+    if state is not None:
+        bot.set_state(user_id, state, user_id)
+    message = make_message(text, user_id)
+    process_us = median_us(lambda: bot.process_new_messages([message]), repeat)
+    select_us = median_us(lambda: select(message), repeat)
+    bot.delete_state(user_id, user_id)
+    return process_us, select_us
+
+
+def run_benchmark(repeat: int) -> None:
+    """
+    Сравнивает время обработки каждого сообщения замера двумя ботами.
+
+    Args:
+        repeat (int): Сколько раз обрабатывать каждое сообщение.
+    """
+    legacy = legacy_bot()
+    routed, router = routed_bot()
+    print(
+        f"Обработчиков сообщений: список {len(legacy.message_handlers)}, "
+        f"маршрутизатор {len(routed.message_handlers)}"
+    )
+    print("Время в мкс: обработка сообщения ботом / только выбор обработчика")
+    print(f"{'Сообщение':<26}{'список':>16}{'маршрутизатор':>16}")
+    for text, state in SAMPLES:
+        label = text if state is None else f"{text} [{state.name.split(':')[-1]}]"
+        old = measure(legacy, lambda m: legacy_select(legacy, m), text, state, repeat)
+        new = measure(
+            routed, lambda m: routed_select(routed, router, m), text, state, repeat
+        )
+        print(
+            f"{label[:25]:<26}{old[0]:>9.1f} / {old[1]:<4.1f}"
+            f"{new[0]:>9.1f} / {new[1]:<4.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5000)
+    args = parser.parse_args()
+    run_benchmark(args.repeat)
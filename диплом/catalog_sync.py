@@ -0,0 +1,109 @@
+"""
+Скрипт синхронизации локального каталога фильмов с API Кинопоиска.
+Первый запуск постранично загружает весь каталог /v1.4/movie, следующие
+загружают только фильмы, обновлённые с начала предыдущей синхронизации.
+Прерванная синхронизация (например, из-за исчерпания суточной квоты API)
+продолжается с той же страницы при следующем запуске.
+
+Запуск: python catalog_sync.py [--full] [--max-pages N]
+"""
+
+import argparse
+import datetime
+from typing import Optional
+
+from api.kinopoisk_api import fetch_uncached
+from config_data.config import CATALOG_PAGE_SIZE
+from database import catalog, initialize_db
+from utils.logger_config import logger
+
+# Поля фильма, которые нужны для поиска и вывода результатов
+SELECT_FIELDS = [
+    "id",
+    "name",
+    "alternativeName",
+    "enName",
+    "names",
+    "description",
+    "year",
+    "rating",
+    "votes",
+    "genres",
+    "ratingAgeLimits",
+    "poster",
+    "budget",
+    "updatedAt",
+]
+
+
+def sync_catalog(full: bool = False, max_pages: Optional[int] = None) -> int:
+    """
+    Загружает страницы каталога фильмов и сохраняет их в локальную базу.
+
+    Args:
+        full (bool): Загрузить весь каталог заново, а не только обновления.
+        max_pages (int, optional): Максимальное число страниц за один запуск.
+
+    Returns:
+        int: Количество сохранённых фильмов.
+    """
+    state = catalog.get_sync_state()
+    if full or state.page is None:
+        # Новый проход: полный при первом запуске, иначе с момента начала прошлого
+        state.since = None if full else state.completed_at
+        state.run_started_at = datetime.datetime.now()
+        state.page = 1
+        state.save()
+
+    loaded = 0
+    pages_done = 0
+    while max_pages is None or pages_done < max_pages:
+        # Сортировка по дате обновления: фильм, изменённый во время прохода,
+        # уйдёт в конец выборки и в любом случае попадёт в следующий проход
+        params = {
+            "page": state.page,
+            "limit": CATALOG_PAGE_SIZE,
+            "sortField": "updatedAt",
+            "sortType": 1,
+            "selectFields": SELECT_FIELDS,
+        }
+        if state.since is not None:
+            params["updatedAt"] = (
+                f"{state.since:%d.%m.%Y}-{state.run_started_at:%d.%m.%Y}"
+            )
+        data = fetch_uncached("catalog", "/v1.4/movie", params)
+        if data is None:
+            logger.warning(
+                f"Синхронизация каталога остановлена на странице {state.page}, "
+                f"продолжится при следующем запуске"
+            )
+            break
+
+        loaded += catalog.upsert_movies(data.get("docs", []))
+        pages_done += 1
+        if state.page >= data.get("pages", 0):
+            state.completed_at = state.run_started_at
+            state.page = None
+            state.save()
+            logger.info(f"Синхронизация каталога завершена, загружено {loaded}")
+            break
+        state.page += 1
+        state.save()
+    return loaded
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Синхронизация локального каталога фильмов с API Кинопоиска"
+    )
+    parser.add_argument(
+        "--full", action="store_true", help="загрузить весь каталог заново"
+    )
+    parser.add_argument(
+        "--max-pages", type=int, default=None, help="максимум страниц за запуск"
+    )
+    args = parser.parse_args()
+
+    initialize_db()
+    count = sync_catalog(full=args.full, max_pages=args.max_pages)
+    print(f"Синхронизация каталога: сохранено фильмов {count}.")
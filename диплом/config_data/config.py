@@ -26,3 +26,106 @@ DEFAULT_COMMANDS = [
     ("high_budget_movie", "Фильмы с высоким бюджетом"),
     ("history", "История запросов"),
 ]
+
+# Кэш ответов API Кинопоиска в памяти процесса
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 2000))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", 64 * 1024 * 1024))
+CACHE_DEFAULT_TTL = int(os.getenv("CACHE_DEFAULT_TTL", 900))
+
+# Время жизни записей кэша (в секундах) для каждого типа запроса
+CACHE_TTLS = {
+    "name": 6 * 60 * 60,
+    "genre": 60 * 60,
+    "rating": 60 * 60,
+    "budget": 12 * 60 * 60,
+    "movie": 24 * 60 * 60,
+}
+
+# Постоянный кэш ответов API в отдельном файле SQLite (не Movies_bot.db)
+API_CACHE_DB_PATH = os.getenv("API_CACHE_DB_PATH", "kinopoisk_cache.db")
+API_CACHE_MAX_BYTES = int(os.getenv("API_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Параметры HTTP-клиента API Кинопоиска
+API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", 20))
+API_CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", 3.05))
+API_READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", 10))
+
+# Ограничение частоты запросов и суточная квота ключа API Кинопоиска
+API_RATE_PER_SECOND = float(os.getenv("API_RATE_PER_SECOND", 5))
+API_RATE_BURST = int(os.getenv("API_RATE_BURST", 5))
+API_DAILY_QUOTA = int(os.getenv("API_DAILY_QUOTA", 200))
+API_QUOTA_WARN_RATIO = float(os.getenv("API_QUOTA_WARN_RATIO", 0.8))
+API_QUOTA_STATE_PATH = os.getenv("API_QUOTA_STATE_PATH", "kinopoisk_quota.json")
+
+# Повторы запросов к API и автоматический выключатель при сбоях
+API_MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", 2))
+API_RETRY_BASE_DELAY = float(os.getenv("API_RETRY_BASE_DELAY", 0.5))
+API_RETRY_MAX_DELAY = float(os.getenv("API_RETRY_MAX_DELAY", 5))
+CIRCUIT_FAILURE_RATIO = float(os.getenv("CIRCUIT_FAILURE_RATIO", 0.5))
+CIRCUIT_MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", 5))
+CIRCUIT_WINDOW = float(os.getenv("CIRCUIT_WINDOW", 60))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", 30))
+
+# Локальная копия каталога фильмов: допустимый возраст (секунды) и размер страницы
+CATALOG_MAX_AGE = int(os.getenv("CATALOG_MAX_AGE", 2 * 24 * 60 * 60))
+CATALOG_PAGE_SIZE = int(os.getenv("CATALOG_PAGE_SIZE", 250))
+
+# Постраничный вывод результатов поиска
+RESULTS_PAGE_SIZE = int(os.getenv("RESULTS_PAGE_SIZE", 5))
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", 2))
+CURSOR_TTL = int(os.getenv("CURSOR_TTL", 60 * 60))
+CURSOR_MAX_ENTRIES = int(os.getenv("CURSOR_MAX_ENTRIES", 10000))
+
+# Сколько записей истории показывать на одной странице /history
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", 5))
+
+# Фоновый прогрев кэша популярными запросами из истории поиска
+WARMER_ENABLED = os.getenv("WARMER_ENABLED", "1") == "1"
+WARMER_INTERVAL = int(os.getenv("WARMER_INTERVAL", 10 * 60))
+WARMER_TOP_N = int(os.getenv("WARMER_TOP_N", 10))
+WARMER_HISTORY_DAYS = int(os.getenv("WARMER_HISTORY_DAYS", 7))
+WARMER_QUOTA_SHARE = float(os.getenv("WARMER_QUOTA_SHARE", 0.2))
+
+# Сколько пользователей хранить в кэше ID избранных фильмов
+FAVORITES_CACHE_USERS = int(os.getenv("FAVORITES_CACHE_USERS", 10000))
+
+# Сколько пользователей Telegram хранить в кэше соответствия ID записям User
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 10000))
+
+# Отложенная запись истории запросов: размер пакета, задержка и окно повторов (секунды)
+HISTORY_BATCH_SIZE = int(os.getenv("HISTORY_BATCH_SIZE", 100))
+HISTORY_FLUSH_INTERVAL = float(os.getenv("HISTORY_FLUSH_INTERVAL", 2))
+HISTORY_DEDUP_WINDOW = float(os.getenv("HISTORY_DEDUP_WINDOW", 5))
+# Сколько раз подряд повторять запись пакета истории при ошибке базы,
+# прежде чем отбросить его, и наибольшая пауза между попытками (секунды)
+HISTORY_MAX_ATTEMPTS = int(os.getenv("HISTORY_MAX_ATTEMPTS", 5))
+HISTORY_RETRY_MAX_DELAY = float(os.getenv("HISTORY_RETRY_MAX_DELAY", 60))
+
+# База данных бота: файл SQLite, пул соединений и параметры PRAGMA
+DB_PATH = os.getenv("DB_PATH", "Movies_bot.db")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 32))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))
+DB_STALE_TIMEOUT = int(os.getenv("DB_STALE_TIMEOUT", 300))
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", 5000))
+DB_SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL")
+DB_CACHE_SIZE_KB = int(os.getenv("DB_CACHE_SIZE_KB", 16 * 1024))
+DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", 64 * 1024 * 1024))
+# Размер, до которого усекается WAL-файл после контрольной точки
+DB_JOURNAL_SIZE_LIMIT = int(os.getenv("DB_JOURNAL_SIZE_LIMIT", 64 * 1024 * 1024))
+
+# Срок хранения истории запросов: дни и число записей на пользователя (0 - без ограничения)
+HISTORY_RETENTION_DAYS = int(os.getenv("HISTORY_RETENTION_DAYS", 180))
+HISTORY_MAX_PER_USER = int(os.getenv("HISTORY_MAX_PER_USER", 1000))
+# Фоновая очистка: период (секунды), строк на одну транзакцию удаления, пауза между
+# транзакциями (секунды) и сколько свободных страниц возвращать за проход
+RETENTION_ENABLED = os.getenv("RETENTION_ENABLED", "1") == "1"
+RETENTION_INTERVAL = int(os.getenv("RETENTION_INTERVAL", 60 * 60))
+RETENTION_CHUNK = int(os.getenv("RETENTION_CHUNK", 500))
+RETENTION_PAUSE = float(os.getenv("RETENTION_PAUSE", 0.05))
+RETENTION_VACUUM_PAGES = int(os.getenv("RETENTION_VACUUM_PAGES", 2000))
+
+# Состояния диалогов: сколько хранить неизменённое состояние (секунды), сколько
+# состояний держать в кэше памяти и как часто удалять устаревшие из базы (секунды)
+STATE_TTL = int(os.getenv("STATE_TTL", 24 * 60 * 60))
+STATE_CACHE_SIZE = int(os.getenv("STATE_CACHE_SIZE", 10000))
+STATE_PURGE_INTERVAL = int(os.getenv("STATE_PURGE_INTERVAL", 10 * 60))
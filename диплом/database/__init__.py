@@ -1,20 +1,108 @@
 """
 Инициализация базы данных с использованием peewee ORM.
-Определены модели пользователя, истории поиска и избранного.
+Определены модели пользователя, фильмов, истории поиска, избранного,
+локальной копии каталога фильмов Кинопоиска и состояний диалогов.
 """
 
 from peewee import (
-    SqliteDatabase,
     Model,
     CharField,
+    CompositeKey,
     TextField,
     DateTimeField,
     ForeignKeyField,
+    IntegerField,
+    FloatField,
 )
+from playhouse.pool import PooledSqliteDatabase
+import asyncio
 import datetime
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from config_data.config import (
+    DB_PATH,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STALE_TIMEOUT,
+    DB_BUSY_TIMEOUT_MS,
+    DB_SYNCHRONOUS,
+    DB_CACHE_SIZE_KB,
+    DB_MMAP_SIZE,
+    DB_JOURNAL_SIZE_LIMIT,
+)
+
+# Инициализация базы данных SQLite для проекта.
+# Соединения берутся из пула: каждый поток получает своё соединение при первом
+# запросе и возвращает его в пул вызовом db.close(). В режиме WAL чтение
+# не блокируется записью истории, а при занятой базе запись ждёт busy_timeout.
+db = PooledSqliteDatabase(
+    DB_PATH,
+    max_connections=DB_POOL_SIZE,
+    timeout=DB_POOL_TIMEOUT,
+    stale_timeout=DB_STALE_TIMEOUT,
+    # Соединение из пула может достаться другому потоку
+    check_same_thread=False,
+    pragmas={
+        # Действует для новой базы; существующую переводит db_admin.py vacuum --full
+        "auto_vacuum": "incremental",
+        "journal_mode": "wal",
+        "synchronous": DB_SYNCHRONOUS,
+        "cache_size": -DB_CACHE_SIZE_KB,
+        "mmap_size": DB_MMAP_SIZE,
+        "busy_timeout": DB_BUSY_TIMEOUT_MS,
+        "journal_size_limit": DB_JOURNAL_SIZE_LIMIT,
+    },
+)
+
+
+@contextmanager
+def connection() -> Iterator[None]:
+    """
+    Открывает соединение текущего потока из пула и возвращает его в пул
+    при выходе. Если соединение уже открыто, оставляет его открытым:
+    в отличие от db.connection_context(), вложенный вызов безопасен.
+    """
+    opened = db.is_closed()
+    if opened:
+        db.connect()
+    try:
+        yield
+    finally:
+        if opened and not db.is_closed():
+            db.close()
+
+
+def call_with_connection(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Вызывает функцию внутри connection().
+
+    Args:
+        func (Callable): Функция, обращающаяся к базе.
+        *args: Позиционные аргументы функции.
+        **kwargs: Именованные аргументы функции.
 
-# Инициализация базы данных SQLite для проекта
-db = SqliteDatabase("Movies_bot.db")
+    Returns:
+        Any: Результат функции.
+    """
+    with connection():
+        return func(*args, **kwargs)
+
+
+async def run_db(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Выполняет обращение к базе в пуле потоков asyncio. Соединение берётся
+    из пула на время вызова, поэтому потоки исполнителя не удерживают его.
+
+    Args:
+        func (Callable): Функция, обращающаяся к базе.
+        *args: Позиционные аргументы функции.
+        **kwargs: Именованные аргументы функции.
+
+    Returns:
+        Any: Результат функции.
+    """
+    return await asyncio.to_thread(call_with_connection, func, *args, **kwargs)
 
 
 class BaseModel(Model):
@@ -32,41 +120,107 @@ class User(BaseModel):
     first_name = CharField(null=True)
 
 
+class Movie(BaseModel):
+    """
+    Фильм из истории поиска или избранного. Данные фильма хранятся один раз,
+    записи истории и избранного ссылаются на него.
+    """
+
+    # ID на Кинопоиске; пустой у фильмов, сохранённых без ID
+    kp_id = CharField(null=True, unique=True)
+    title = CharField(null=True)
+    description = TextField(null=True)
+    rating = CharField(null=True)
+    year = CharField(null=True)
+    genre = CharField(null=True)
+    age_limit = CharField(null=True)
+    poster_url = CharField(null=True)
+
+    class Meta:
+        # Фильм без ID находится по названию и году (см. database.movies)
+        indexes = ((("title", "year"), False),)
+
+
 class SearchHistory(BaseModel):
     """Модель записи истории запросов пользователя"""
 
-    user = ForeignKeyField(User, backref="searches", on_delete="CASCADE")
+    # Отдельный индекс по user не нужен: его покрывает индекс (user, timestamp)
+    user = ForeignKeyField(User, backref="searches", on_delete="CASCADE", index=False)
     query = CharField()
     command = CharField(null=True)
     timestamp = DateTimeField(default=datetime.datetime.now)
-    movie_title = CharField(null=True)
-    movie_description = TextField(null=True)
-    movie_rating = CharField(null=True)
-    movie_year = CharField(null=True)
-    movie_genre = CharField(null=True)
-    movie_age_limit = CharField(null=True)
-    movie_poster_url = CharField(null=True)
+    movie = ForeignKeyField(Movie, null=True, backref="searches", on_delete="SET NULL")
+
+    class Meta:
+        indexes = (
+            # История пользователя, в том числе за день, от новых записей к старым
+            (("user", "timestamp"), False),
+            # Популярные запросы команды за период для прогрева кэша
+            (("command", "timestamp"), False),
+        )
 
 
 class FavoriteMovie(BaseModel):
     """Модель избранного фильма пользователя"""
 
-    user = ForeignKeyField(User, backref="favorites", on_delete="CASCADE")
-    movie_id = CharField()
-    title = CharField()
-    description = TextField(null=True)
-    rating = CharField(null=True)
-    movie_year = CharField(null=True)
-    movie_genre = CharField(null=True)
-    movie_age_limit = CharField(null=True)
-    movie_poster_url = CharField(null=True)
+    # Отдельный индекс по user не нужен: его покрывает индекс (user, movie)
+    user = ForeignKeyField(User, backref="favorites", on_delete="CASCADE", index=False)
+    movie = ForeignKeyField(Movie, backref="favorites", on_delete="CASCADE")
+
+    class Meta:
+        indexes = ((("user", "movie"), True),)
+
+
+class CatalogMovie(BaseModel):
+    """Фильм из локальной копии каталога Кинопоиска"""
+
+    kp_id = IntegerField(unique=True)
+    name = CharField(null=True)
+    search_title = TextField(default="")
+    genres = TextField(default="")
+    year = IntegerField(null=True)
+    rating_imdb = FloatField(null=True, index=True)
+    rating_kp = FloatField(null=True)
+    votes = IntegerField(null=True, index=True)
+    budget = IntegerField(null=True, index=True)
+    updated_at = CharField(null=True)
+    data = TextField()
+
+
+class CatalogSyncState(BaseModel):
+    """Состояние синхронизации локального каталога с API Кинопоиска"""
+
+    name = CharField(unique=True)
+    page = IntegerField(null=True)
+    since = DateTimeField(null=True)
+    run_started_at = DateTimeField(null=True)
+    completed_at = DateTimeField(null=True)
+
+
+class ConversationState(BaseModel):
+    """Состояние диалога пользователя в чате для машины состояний telebot"""
+
+    chat_id = IntegerField()
+    user_id = IntegerField()
+    state = CharField(null=True)
+    # Данные состояния в JSON
+    data = TextField(default="{}")
+    # Время последнего изменения: по нему удаляются заброшенные диалоги
+    updated_at = DateTimeField(default=datetime.datetime.now, index=True)
+
+    class Meta:
+        primary_key = CompositeKey("chat_id", "user_id")
 
 
 def initialize_db():
     """
-    Инициализирует подключение к базе данных и создает таблицы.
-    Вызывать при старте приложения.
+    Инициализирует подключение к базе данных, создаёт таблицы новой базы
+    или применяет недостающие миграции схемы. Вызывать при старте приложения.
     """
     db.connect()
-    db.create_tables([User, SearchHistory, FavoriteMovie], safe=True)
+    from database import migrations, title_index
+
+    migrations.migrate()
+
+    title_index.create_index()
     db.close()
@@ -0,0 +1,281 @@
+"""
+Локальная копия каталога фильмов Кинопоиска.
+Сохранение страниц ответа API и поиск по сохранённым фильмам в формате ответов API.
+"""
+
+import datetime
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+from peewee import EXCLUDED, fn
+
+from database import db, title_index, CatalogMovie, CatalogSyncState
+
+# Имя записи состояния синхронизации каталога фильмов
+SYNC_NAME = "movies"
+
+# Поля сортировки результатов поиска по бюджету
+SORT_FIELDS = {
+    "budget": CatalogMovie.budget,
+    "rating": CatalogMovie.rating_kp,
+    "year": CatalogMovie.year,
+}
+
+# Пакет строк для одного INSERT, чтобы не превысить лимит переменных SQLite
+UPSERT_BATCH = 100
+
+# Колонки, вычисляемые из данных фильма: обновляются при каждом сохранении
+DERIVED_FIELDS = [
+    CatalogMovie.name,
+    CatalogMovie.search_title,
+    CatalogMovie.genres,
+    CatalogMovie.data,
+]
+# Колонки, которых может не быть в неполном ответе (например, /v1.4/movie/search):
+# пустое значение не затирает сохранённое
+NULLABLE_FIELDS = [
+    CatalogMovie.year,
+    CatalogMovie.rating_imdb,
+    CatalogMovie.rating_kp,
+    CatalogMovie.votes,
+    CatalogMovie.budget,
+    CatalogMovie.updated_at,
+]
+
+
+def _search_title(film: Dict[str, Any]) -> str:
+    """Собирает все названия фильма в одну нормализованную строку для поиска."""
+    titles = [film.get("name"), film.get("alternativeName"), film.get("enName")]
+    titles += [n.get("name") for n in film.get("names") or [] if isinstance(n, dict)]
+    normalized = dict.fromkeys(title_index.normalize(t) for t in titles if t)
+    return "\n".join(t for t in normalized if t)
+
+
+def _genres(film: Dict[str, Any]) -> str:
+    """Возвращает жанры фильма строкой вида ',драма,криминал,' для поиска по жанру."""
+    names = [g.get("name", "").lower() for g in film.get("genres") or []]
+    names = [n for n in names if n]
+    return f",{','.join(names)}," if names else ""
+
+
+def _merge(saved: Dict[str, Any], film: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Дополняет сохранённые данные фильма новыми. Поля, которых нет в новом
+    ответе или которые в нём пусты, остаются сохранёнными; вложенные объекты
+    (rating, budget и т.д.) объединяются так же.
+
+    Args:
+        saved (Dict[str, Any]): Сохранённый фильм из каталога.
+        film (Dict[str, Any]): Фильм из нового ответа API.
+
+    Returns:
+        Dict[str, Any]: Объединённые данные фильма.
+    """
+    merged = dict(saved)
+    for key, value in film.items():
+        if value is None or value == "" or value == [] or value == {}:
+            continue
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            value = _merge(merged[key], value)
+        merged[key] = value
+    return merged
+
+
+def _saved_films(kp_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """Возвращает сохранённые в каталоге фильмы по ID."""
+    saved = {}
+    for i in range(0, len(kp_ids), UPSERT_BATCH):
+        query = CatalogMovie.select(CatalogMovie.kp_id, CatalogMovie.data).where(
+            CatalogMovie.kp_id.in_(kp_ids[i : i + UPSERT_BATCH])
+        )
+        saved.update({row.kp_id: json.loads(row.data) for row in query})
+    return saved
+
+
+def _to_row(film: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Преобразует фильм из ответа API в строку таблицы каталога.
+
+    Args:
+        film (Dict[str, Any]): Фильм из ответа API.
+
+    Returns:
+        Dict[str, Any]: Значения полей CatalogMovie.
+    """
+    rating = film.get("rating") or {}
+    votes = film.get("votes") or {}
+    budget = film.get("budget") or {}
+    year = film.get("year")
+    return {
+        "kp_id": film["id"],
+        "name": film.get("name") or film.get("alternativeName"),
+        "search_title": _search_title(film),
+        "genres": _genres(film),
+        "year": year if isinstance(year, int) else None,
+        "rating_imdb": rating.get("imdb") or None,
+        "rating_kp": rating.get("kp") or None,
+        "votes": votes.get("kp"),
+        "budget": budget.get("value"),
+        "updated_at": film.get("updatedAt"),
+        "data": json.dumps(film, ensure_ascii=False),
+    }
+
+
+def upsert_movies(films: Iterable[Dict[str, Any]]) -> int:
+    """
+    Добавляет фильмы в каталог или обновляет уже сохранённые
+    вместе с их названиями в индексе для поиска по названию.
+    Неполный ответ API (например, результаты поиска по названию) только
+    дополняет сохранённый фильм и не затирает его бюджет, оценки и другие поля.
+
+    Args:
+        films (Iterable[Dict[str, Any]]): Фильмы из ответа API.
+
+    Returns:
+        int: Количество сохранённых фильмов.
+    """
+    films = [film for film in films if film.get("id")]
+    update = {field: getattr(EXCLUDED, field.column_name) for field in DERIVED_FIELDS}
+    update.update(
+        {
+            field: fn.COALESCE(getattr(EXCLUDED, field.column_name), field)
+            for field in NULLABLE_FIELDS
+        }
+    )
+    with db.atomic():
+        saved = _saved_films([film["id"] for film in films])
+        rows = [_to_row(_merge(saved.get(film["id"], {}), film)) for film in films]
+        for i in range(0, len(rows), UPSERT_BATCH):
+            CatalogMovie.insert_many(rows[i : i + UPSERT_BATCH]).on_conflict(
+                conflict_target=[CatalogMovie.kp_id], update=update
+            ).execute()
+        title_index.add_titles((row["kp_id"], row["search_title"]) for row in rows)
+    return len(rows)
+
+
+def get_sync_state() -> CatalogSyncState:
+    """
+    Возвращает состояние синхронизации каталога, создавая его при первом обращении.
+
+    Returns:
+        CatalogSyncState: Запись состояния.
+    """
+    state, _ = CatalogSyncState.get_or_create(name=SYNC_NAME)
+    return state
+
+
+def is_fresh(max_age: float) -> bool:
+    """
+    Проверяет, что каталог полностью синхронизирован не раньше max_age секунд назад.
+
+    Args:
+        max_age (float): Допустимый возраст каталога, в секундах.
+
+    Returns:
+        bool: True, если поиск можно выполнять по локальному каталогу.
+    """
+    state = CatalogSyncState.get_or_none(CatalogSyncState.name == SYNC_NAME)
+    if state is None or state.completed_at is None:
+        return False
+    age = datetime.datetime.now() - state.completed_at
+    return age.total_seconds() <= max_age
+
+
+def _films(query, limit: int, offset: int = 0) -> List[Dict[str, Any]]:
+    """Выполняет запрос к каталогу и возвращает фильмы в формате ответа API."""
+    query = query.select(CatalogMovie.data).limit(limit).offset(offset)
+    return [json.loads(row.data) for row in query]
+
+
+def search_by_title(name: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Ищет фильмы по названию в индексе названий с учётом опечаток
+    и транслитерации.
+
+    Args:
+        name (str): Название фильма, введённое пользователем.
+        limit (int): Максимальное число фильмов.
+
+    Returns:
+        List[Dict[str, Any]]: Найденные фильмы от лучшего совпадения к худшему.
+    """
+    kp_ids = title_index.search(name, limit)
+    if not kp_ids:
+        return []
+    rows = CatalogMovie.select(CatalogMovie.kp_id, CatalogMovie.data).where(
+        CatalogMovie.kp_id.in_(kp_ids)
+    )
+    data = {row.kp_id: row.data for row in rows}
+    return [json.loads(data[kp_id]) for kp_id in kp_ids if kp_id in data]
+
+
+def search_by_genre(
+    genre: str, limit: int = 10, offset: int = 0
+) -> List[Dict[str, Any]]:
+    """
+    Ищет фильмы каталога заданного жанра. Порядок совпадает с порядком
+    запроса к API: по убыванию числа оценок на Кинопоиске, затем по ID.
+
+    Args:
+        genre (str): Название жанра.
+        limit (int): Максимальное число фильмов.
+        offset (int): Сколько первых фильмов пропустить.
+
+    Returns:
+        List[Dict[str, Any]]: Найденные фильмы.
+    """
+    query = CatalogMovie.select().where(
+        CatalogMovie.genres.contains(f",{genre.strip().lower()},")
+    )
+    order = (CatalogMovie.votes.desc(nulls="LAST"), CatalogMovie.kp_id)
+    return _films(query.order_by(*order), limit, offset)
+
+
+def search_by_rating(
+    min_rating: float, limit: int = 10, offset: int = 0
+) -> List[Dict[str, Any]]:
+    """
+    Ищет фильмы каталога с рейтингом IMDB не ниже заданного.
+
+    Args:
+        min_rating (float): Минимальный рейтинг.
+        limit (int): Максимальное число фильмов.
+        offset (int): Сколько первых фильмов пропустить.
+
+    Returns:
+        List[Dict[str, Any]]: Найденные фильмы, от высокого рейтинга к низкому.
+    """
+    query = CatalogMovie.select().where(CatalogMovie.rating_imdb >= min_rating)
+    order = (CatalogMovie.rating_imdb.desc(), CatalogMovie.kp_id)
+    return _films(query.order_by(*order), limit, offset)
+
+
+def search_by_budget(
+    min_budget: Optional[int] = None,
+    max_budget: Optional[int] = None,
+    limit: int = 10,
+    sort_by: str = "budget",
+    descending: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Ищет фильмы каталога с бюджетом в заданных пределах.
+
+    Args:
+        min_budget (int, optional): Минимальный бюджет.
+        max_budget (int, optional): Максимальный бюджет.
+        limit (int): Максимальное число фильмов.
+        sort_by (str): Поле сортировки: "budget", "rating" или "year".
+        descending (bool): Сортировать по убыванию.
+
+    Returns:
+        List[Dict[str, Any]]: Найденные фильмы, упорядоченные по полю и ID.
+    """
+    condition = CatalogMovie.budget.is_null(False)
+    if min_budget is not None:
+        condition &= CatalogMovie.budget >= min_budget
+    if max_budget is not None:
+        condition &= CatalogMovie.budget <= max_budget
+    field = SORT_FIELDS[sort_by]
+    order = field.desc(nulls="LAST") if descending else field.asc(nulls="LAST")
+    query = CatalogMovie.select().where(condition)
+    return _films(query.order_by(order, CatalogMovie.kp_id), limit)
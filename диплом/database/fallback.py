@@ -0,0 +1,168 @@
+"""
+Поиск фильмов по данным, уже сохранённым в базе (избранное и история запросов).
+Используется, когда API Кинопоиска недоступен: результаты возвращаются
+в том же формате, что и ответы API.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from database import Movie
+
+
+def _to_float(value: Optional[str]) -> Optional[float]:
+    """Преобразует сохранённое строкой значение рейтинга в число."""
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def _to_film(
+    movie_id: Optional[str],
+    title: Optional[str],
+    description: Optional[str],
+    rating: Optional[str],
+    year: Optional[str],
+    genre: Optional[str],
+    age_limit: Optional[str],
+    poster_url: Optional[str],
+) -> Dict[str, Any]:
+    """
+    Собирает словарь фильма в формате ответа API из сохранённых полей.
+
+    Returns:
+        Dict[str, Any]: Данные фильма.
+    """
+    film = {
+        "name": title or "Название неизвестно",
+        "description": description or "Нет описания",
+        "year": year if year and year != "None" else "неизвестно",
+        "rating": {"kp": _to_float(rating)},
+        "genres": (
+            [{"name": g.strip()} for g in genre.split(",") if g.strip()]
+            if genre
+            else []
+        ),
+        "ratingAgeLimits": {"name": age_limit or "—"},
+        "poster": {"url": poster_url},
+    }
+    if movie_id and movie_id.isdigit():
+        film["id"] = int(movie_id)
+    return film
+
+
+def film_from_movie(movie: Movie) -> Dict[str, Any]:
+    """
+    Преобразует сохранённый фильм в словарь в формате ответа API.
+
+    Args:
+        movie (Movie): Запись фильма.
+
+    Returns:
+        Dict[str, Any]: Данные фильма для форматирования.
+    """
+    return _to_film(
+        movie.kp_id,
+        movie.title,
+        movie.description,
+        movie.rating,
+        movie.year,
+        movie.genre,
+        movie.age_limit,
+        movie.poster_url,
+    )
+
+
+def _unique(movies: List[Movie], limit: int) -> List[Dict[str, Any]]:
+    """
+    Преобразует найденные фильмы, убирая повторы одного и того же фильма,
+    сохранённого без ID.
+
+    Returns:
+        List[Dict[str, Any]]: Не более limit фильмов.
+    """
+    films, seen = [], set()
+    for film in map(film_from_movie, movies):
+        key = (film["name"].lower(), str(film["year"]))
+        if key in seen:
+            continue
+        seen.add(key)
+        films.append(film)
+        if len(films) >= limit:
+            break
+    return films
+
+
+def find_films_by_name(name: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Ищет сохранённые фильмы, в названии которых есть заданная строка.
+
+    Args:
+        name (str): Часть названия фильма.
+        limit (int): Максимальное число фильмов.
+
+    Returns:
+        List[Dict[str, Any]]: Найденные фильмы.
+    """
+    movies = (
+        Movie.select()
+        .where(Movie.title.contains(name))
+        .order_by(Movie.id.desc())
+        .limit(limit * 2)
+    )
+    return _unique(list(movies), limit)
+
+
+def find_films_by_genre(genre: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Ищет сохранённые фильмы заданного жанра.
+
+    Args:
+        genre (str): Название жанра.
+        limit (int): Максимальное число фильмов.
+
+    Returns:
+        List[Dict[str, Any]]: Найденные фильмы.
+    """
+    movies = (
+        Movie.select()
+        .where(Movie.genre.contains(genre))
+        .order_by(Movie.id.desc())
+        .limit(limit * 2)
+    )
+    return _unique(list(movies), limit)
+
+
+def find_films_by_rating(min_rating: float, limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Ищет сохранённые фильмы с рейтингом не ниже заданного.
+
+    Args:
+        min_rating (float): Минимальный рейтинг.
+        limit (int): Максимальное число фильмов.
+
+    Returns:
+        List[Dict[str, Any]]: Найденные фильмы, от высокого рейтинга к низкому.
+    """
+    rating = Movie.rating.cast("REAL")
+    movies = (
+        Movie.select()
+        .where(rating >= min_rating)
+        .order_by(rating.desc())
+        .limit(limit * 2)
+    )
+    return _unique(list(movies), limit)
+
+
+def find_film_by_id(movie_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Ищет фильм по ID среди сохранённых фильмов.
+
+    Args:
+        movie_id (str): Идентификатор фильма на Кинопоиске.
+
+    Returns:
+        Optional[Dict[str, Any]]: Данные фильма или None, если он не сохранён.
+    """
+    movie = Movie.get_or_none(Movie.kp_id == str(movie_id))
+    return film_from_movie(movie) if movie else None
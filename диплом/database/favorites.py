@@ -0,0 +1,238 @@
+"""
+Запросы к избранным фильмам пользователей.
+ID избранных фильмов пользователя загружаются из базы при первом обращении
+и хранятся в памяти; добавление и удаление фильмов сразу обновляют и базу,
+и кэш, поэтому проверки статуса избранного не обращаются к SQLite.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from peewee import IntegrityError
+
+from config_data.config import FAVORITES_CACHE_USERS
+from database import db, User, Movie, FavoriteMovie
+from database.fallback import film_from_movie
+from database.movies import save_movie
+
+
+class FavoriteIdsCache:
+    """
+    Ограниченный по числу пользователей LRU-кэш множеств ID избранных фильмов.
+
+    Общая блокировка защищает только словарь в памяти. Загрузка из SQLite
+    и изменения множества пользователя выполняются под блокировкой его группы
+    (пользователи распределены по LOCK_STRIPES группам по хэшу ID), поэтому
+    загрузка одного пользователя не задерживает остальных, а добавление фильма
+    во время загрузки не затирается прочитанным до него множеством.
+    """
+
+    # Число блокировок групп пользователей
+    LOCK_STRIPES = 64
+
+    def __init__(self, max_users: int = 10000) -> None:
+        """
+        Args:
+            max_users (int): Максимальное число пользователей в кэше.
+        """
+        self.max_users = max_users
+        self._users: "OrderedDict[str, Set[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._user_locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        # Номер полной очистки: загрузка, начатая до неё, не попадает в кэш
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _user_lock(self, user_id: str) -> threading.Lock:
+        """Возвращает блокировку группы пользователя."""
+        return self._user_locks[hash(user_id) % self.LOCK_STRIPES]
+
+    def _cached(self, user_id: str) -> Optional[Set[str]]:
+        """Возвращает копию множества пользователя из кэша. Вызывается под _lock."""
+        movie_ids = self._users.get(user_id)
+        if movie_ids is None:
+            return None
+        self.hits += 1
+        self._users.move_to_end(user_id)
+        return set(movie_ids)
+
+    def get(self, user_id) -> Set[str]:
+        """
+        Возвращает ID избранных фильмов пользователя, загружая их при промахе.
+
+        Args:
+            user_id: Telegram ID пользователя.
+
+        Returns:
+            Set[str]: Копия множества ID избранных фильмов.
+        """
+        user_id = str(user_id)
+        with self._lock:
+            movie_ids = self._cached(user_id)
+        if movie_ids is not None:
+            return movie_ids
+
+        with self._user_lock(user_id):
+            with self._lock:
+                # Пока ждали блокировку группы, множество мог загрузить другой поток
+                movie_ids = self._cached(user_id)
+                if movie_ids is not None:
+                    return movie_ids
+                self.misses += 1
+                generation = self._generation
+            movie_ids = self._load(user_id)
+            with self._lock:
+                if generation == self._generation:
+                    self._users[user_id] = movie_ids
+                    while len(self._users) > self.max_users:
+                        self._users.popitem(last=False)
+            return set(movie_ids)
+
+    def add(self, user_id, movie_id) -> None:
+        """Добавляет фильм в множество пользователя, если оно уже загружено."""
+        user_id = str(user_id)
+        with self._user_lock(user_id), self._lock:
+            movie_ids = self._users.get(user_id)
+            if movie_ids is not None:
+                movie_ids.add(str(movie_id))
+
+    def discard(self, user_id, movie_id) -> None:
+        """Удаляет фильм из множества пользователя, если оно уже загружено."""
+        user_id = str(user_id)
+        with self._user_lock(user_id), self._lock:
+            movie_ids = self._users.get(user_id)
+            if movie_ids is not None:
+                movie_ids.discard(str(movie_id))
+
+    def invalidate(self, user_id=None) -> None:
+        """
+        Удаляет из кэша данные пользователя или всех пользователей.
+
+        Args:
+            user_id (optional): Telegram ID пользователя; None - очистить весь кэш.
+        """
+        if user_id is None:
+            with self._lock:
+                self._generation += 1
+                self._users.clear()
+            return
+        user_id = str(user_id)
+        with self._user_lock(user_id), self._lock:
+            self._users.pop(user_id, None)
+
+    @staticmethod
+    def _load(user_id: str) -> Set[str]:
+        """Читает ID избранных фильмов пользователя из базы одним запросом."""
+        query = (
+            FavoriteMovie.select(Movie.kp_id)
+            .join(Movie)
+            .switch(FavoriteMovie)
+            .join(User)
+            .where(User.user_id == user_id)
+        )
+        return {kp_id for (kp_id,) in query.tuples()}
+
+
+favorite_ids = FavoriteIdsCache(max_users=FAVORITES_CACHE_USERS)
+
+
+def get_favorite_movie_ids(user_id: int, movie_ids: Iterable) -> Set[str]:
+    """
+    Определяет, какие из фильмов добавлены в избранное пользователя.
+    Для всего списка выполняется не больше одного запроса к базе.
+
+    Args:
+        user_id (int): Telegram ID пользователя.
+        movie_ids (Iterable): ID фильмов на Кинопоиске.
+
+    Returns:
+        Set[str]: ID избранных фильмов из переданного списка.
+    """
+    movie_ids = {str(movie_id) for movie_id in movie_ids}
+    if not movie_ids:
+        return set()
+    return favorite_ids.get(user_id) & movie_ids
+
+
+def is_favorite(user_id: int, movie_id) -> bool:
+    """
+    Проверяет, добавлен ли фильм в избранное пользователя.
+
+    Args:
+        user_id (int): Telegram ID пользователя.
+        movie_id: ID фильма на Кинопоиске.
+
+    Returns:
+        bool: True, если фильм в избранном.
+    """
+    return str(movie_id) in favorite_ids.get(user_id)
+
+
+def add_favorite(user: User, movie_id, film_data: dict) -> FavoriteMovie:
+    """
+    Сохраняет фильм в таблицу Movie и добавляет его в избранное пользователя.
+    Если фильм уже в избранном, возвращает существующую запись.
+
+    Args:
+        user (User): Пользователь.
+        movie_id: ID фильма на Кинопоиске.
+        film_data (dict): Данные фильма в формате ответа API.
+
+    Returns:
+        FavoriteMovie: Созданная запись.
+    """
+    with db.atomic():
+        movie = save_movie(film_data, movie_id)
+        try:
+            with db.atomic():
+                favorite = FavoriteMovie.create(user=user, movie=movie)
+        except IntegrityError:
+            # Уникальный индекс (user, movie): фильм уже добавлен параллельно
+            favorite = FavoriteMovie.get(
+                (FavoriteMovie.user == user) & (FavoriteMovie.movie == movie)
+            )
+    favorite_ids.add(user.user_id, movie_id)
+    return favorite
+
+
+def remove_favorite(user: User, movie_id) -> int:
+    """
+    Удаляет фильм из избранного пользователя.
+
+    Args:
+        user (User): Пользователь.
+        movie_id: ID фильма на Кинопоиске.
+
+    Returns:
+        int: Количество удалённых записей.
+    """
+    movies = Movie.select(Movie.id).where(Movie.kp_id == str(movie_id))
+    deleted = (
+        FavoriteMovie.delete()
+        .where((FavoriteMovie.user == user) & FavoriteMovie.movie.in_(movies))
+        .execute()
+    )
+    favorite_ids.discard(user.user_id, movie_id)
+    return deleted
+
+
+def favorite_films(user: User) -> List[Dict[str, Any]]:
+    """
+    Возвращает избранные фильмы пользователя в порядке добавления.
+    Данные фильмов загружаются тем же запросом.
+
+    Args:
+        user (User): Пользователь.
+
+    Returns:
+        List[Dict[str, Any]]: Фильмы в формате ответа API.
+    """
+    query = (
+        FavoriteMovie.select(FavoriteMovie, Movie)
+        .join(Movie)
+        .where(FavoriteMovie.user == user)
+        .order_by(FavoriteMovie.id)
+    )
+    return [film_from_movie(fav.movie) for fav in query]
@@ -0,0 +1,266 @@
+"""
+Отложенная пакетная запись истории запросов пользователей.
+Обработчики только ставят запись в очередь, а фоновый поток сохраняет
+накопленные записи одним INSERT в одной транзакции: когда набирается пакет
+или истекает интервал ожидания. Фильмы из записей сохраняются в таблицу
+Movie в той же транзакции. Если запись не удалась (например, база
+заблокирована или заняты все соединения пула), пакет возвращается в начало очереди и запись повторяется с растущей паузой;
+пакет отбрасывается только после max_attempts неудачных попыток подряд.
+При завершении бота очередь сбрасывается.
+"""
+
+import atexit
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from config_data.config import (
+    HISTORY_BATCH_SIZE,
+    HISTORY_FLUSH_INTERVAL,
+    HISTORY_DEDUP_WINDOW,
+    HISTORY_MAX_ATTEMPTS,
+    HISTORY_RETRY_MAX_DELAY,
+)
+from database import db, connection, SearchHistory
+from database.movies import upsert_movies
+from utils.logger_config import logger
+
+# Пакет строк для одного INSERT, чтобы не превысить лимит переменных SQLite
+INSERT_BATCH = 50
+
+
+def _dedup_key(row: Dict[str, Any]) -> Tuple:
+    """Ключ записи для отбрасывания повторов: все поля, кроме времени."""
+    return tuple(
+        sorted(
+            (k, tuple(sorted(v.items())) if isinstance(v, dict) else v)
+            for k, v in row.items()
+            if k != "timestamp"
+        )
+    )
+
+
+def _save_movies(rows: List[Dict[str, Any]]) -> None:
+    """Сохраняет фильмы записей в Movie и заменяет их данные ключами."""
+    with_movie = [row for row in rows if isinstance(row.get("movie"), dict)]
+    if not with_movie:
+        return
+    movie_ids = upsert_movies([row["movie"] for row in with_movie])
+    for row, movie_id in zip(with_movie, movie_ids):
+        row["movie"] = movie_id
+
+
+class HistoryWriter:
+    """
+    Очередь записей SearchHistory с фоновым сохранением пакетами.
+    Одинаковая запись одного пользователя, повторённая в течение
+    dedup_window секунд, сохраняется один раз.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        flush_interval: float = 2.0,
+        dedup_window: float = 5.0,
+        max_attempts: int = 5,
+        retry_max_delay: float = 60.0,
+    ) -> None:
+        """
+        Args:
+            batch_size (int): Размер очереди, при котором запись начинается сразу.
+            flush_interval (float): Максимальная задержка записи, в секундах.
+            dedup_window (float): Окно отбрасывания повторов, в секундах.
+            max_attempts (int): Сколько неудачных попыток записи подряд
+                допускается, прежде чем записи очереди будут отброшены.
+            retry_max_delay (float): Наибольшая пауза между попытками, в секундах.
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dedup_window = dedup_window
+        self.max_attempts = max_attempts
+        self.retry_max_delay = retry_max_delay
+        self._rows: List[Dict[str, Any]] = []
+        # содержимое записи -> время её постановки в очередь
+        self._recent: Dict[Tuple, float] = {}
+        self._cond = threading.Condition()
+        # Сериализует сохранение пакетов из фонового потока и из flush()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        # Неудачные попытки записи подряд
+        self._failures = 0
+        self.written = 0
+        self.dropped_duplicates = 0
+        self.dropped_failed = 0
+
+    def add(self, row: Dict[str, Any]) -> bool:
+        """
+        Ставит запись истории в очередь на сохранение.
+
+        Args:
+            row (Dict[str, Any]): Значения полей SearchHistory; поле timestamp
+                заполняется временем вызова, если не указано, а в поле movie
+                передаются значения колонок Movie (см. movie_fields) или None.
+
+        Returns:
+            bool: False, если запись отброшена как повтор.
+        """
+        key = _dedup_key(row)
+        now = time.monotonic()
+        with self._cond:
+            seen_at = self._recent.get(key)
+            if seen_at is not None and now - seen_at < self.dedup_window:
+                self.dropped_duplicates += 1
+                return False
+            self._recent[key] = now
+            self._rows.append(row)
+            if self._closed:
+                pending = True
+            else:
+                pending = False
+                self._ensure_thread()
+                if len(self._rows) >= self.batch_size:
+                    self._cond.notify()
+        if pending:
+            # После остановки фонового потока записи сохраняются сразу
+            self.flush()
+        return True
+
+    def flush(self) -> int:
+        """
+        Сохраняет все записи из очереди. Вызывается перед чтением истории,
+        чтобы пользователь видел и ещё не записанные запросы.
+
+        При любой ошибке записи записи возвращаются в начало очереди:
+        кроме ошибок базы, это, например, MaxConnectionsExceeded пула
+        соединений (ValueError).
+
+        Returns:
+            int: Количество сохранённых записей.
+        """
+        with self._flush_lock:
+            with self._cond:
+                rows, self._rows = self._rows, []
+                self._prune_recent()
+            if not rows:
+                return 0
+            try:
+                with connection(), db.atomic():
+                    # Данные фильмов заменяются ключами только после успешной
+                    # записи, чтобы повторная попытка сохранила их заново
+                    pending = [dict(row) for row in rows]
+                    _save_movies(pending)
+                    for i in range(0, len(pending), INSERT_BATCH):
+                        SearchHistory.insert_many(
+                            pending[i : i + INSERT_BATCH]
+                        ).execute()
+            except Exception as e:
+                self._requeue(rows, e)
+                return 0
+            with self._cond:
+                self._failures = 0
+            self.written += len(rows)
+            return len(rows)
+
+    def _requeue(self, rows: List[Dict[str, Any]], error: Exception) -> None:
+        """
+        Возвращает записи неудавшейся попытки в начало очереди или отбрасывает
+        их после max_attempts неудачных попыток подряд.
+        """
+        with self._cond:
+            self._failures += 1
+            if self._failures < self.max_attempts:
+                self._rows[:0] = rows
+                logger.warning(
+                    f"Не удалось сохранить {len(rows)} записей истории "
+                    f"(попытка {self._failures} из {self.max_attempts}): {error}"
+                )
+                return
+            self._failures = 0
+            self.dropped_failed += len(rows)
+        logger.error(
+            f"Записи истории отброшены после {self.max_attempts} "
+            f"неудачных попыток: {len(rows)}. Последняя ошибка: {error}"
+        )
+
+    def _retry_delay(self) -> float:
+        """Пауза перед следующей записью: растёт с каждой неудачной попыткой."""
+        if not self._failures:
+            return self.flush_interval
+        return min(self.flush_interval * 2**self._failures, self.retry_max_delay)
+
+    def close(self) -> None:
+        """
+        Останавливает фоновый поток и сохраняет оставшиеся записи.
+        Неудачная запись повторяется с короткой паузой, пока записи
+        не будут сохранены или отброшены после max_attempts попыток.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+        attempt = 0
+        while not self.flush() and self.stats()["pending"]:
+            attempt += 1
+            time.sleep(min(0.1 * 2**attempt, 1.0))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns:
+            Dict[str, int]: Размер очереди, число сохранённых записей и записей,
+                отброшенных как повторы и после неудачных попыток.
+        """
+        with self._cond:
+            pending = len(self._rows)
+        return {
+            "pending": pending,
+            "written": self.written,
+            "dropped_duplicates": self.dropped_duplicates,
+            "dropped_failed": self.dropped_failed,
+        }
+
+    def _ensure_thread(self) -> None:
+        """Запускает фоновый поток при первой записи. Вызывается под блокировкой."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="history-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _prune_recent(self) -> None:
+        """Удаляет ключи повторов старше окна. Вызывается под блокировкой."""
+        border = time.monotonic() - self.dedup_window
+        self._recent = {k: t for k, t in self._recent.items() if t >= border}
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                # После неудачной попытки пауза выдерживается полностью,
+                # даже если очередь успела набрать пакет
+                deadline = time.monotonic() + self._retry_delay()
+                while not self._closed and (
+                    self._failures or len(self._rows) < self.batch_size
+                ):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                # Поток записи не должен останавливаться: записи остаются в очереди
+                logger.error(f"Ошибка фоновой записи истории: {e}", exc_info=True)
+
+
+history_writer = HistoryWriter(
+    batch_size=HISTORY_BATCH_SIZE,
+    flush_interval=HISTORY_FLUSH_INTERVAL,
+    dedup_window=HISTORY_DEDUP_WINDOW,
+    max_attempts=HISTORY_MAX_ATTEMPTS,
+    retry_max_delay=HISTORY_RETRY_MAX_DELAY,
+)
+# Обычное завершение интерпретатора; SIGTERM обрабатывается в main.py
+atexit.register(history_writer.close)
@@ -0,0 +1,120 @@
+"""
+Обслуживание файла базы данных бота: возврат свободных страниц (VACUUM),
+обновление статистики планировщика (ANALYZE), перестроение индексов
+и проверка целостности. Функции выполняются на соединении текущего потока.
+"""
+
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from database import db
+
+# Режим auto_vacuum, при котором работает PRAGMA incremental_vacuum
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+def _pragma(name: str) -> Any:
+    """Возвращает значение PRAGMA без аргументов."""
+    return db.execute_sql(f"PRAGMA {name}").fetchone()[0]
+
+
+def incremental_vacuum(pages: Optional[int] = None) -> int:
+    """
+    Возвращает операционной системе свободные страницы файла базы.
+    Работает только в режиме auto_vacuum = INCREMENTAL, иначе ничего не делает.
+    Вызывается вне транзакции.
+
+    Args:
+        pages (int, optional): Максимальное число страниц; None - все свободные.
+
+    Returns:
+        int: Количество освобождённых страниц.
+    """
+    if _pragma("auto_vacuum") != AUTO_VACUUM_INCREMENTAL:
+        return 0
+    before = _pragma("freelist_count")
+    limit = "" if pages is None else f"({int(pages)})"
+    # execute() модуля sqlite3 делает один шаг запроса, а каждый шаг
+    # incremental_vacuum освобождает одну страницу; executescript выполняет все
+    db.connection().executescript(f"PRAGMA incremental_vacuum{limit};")
+    return before - _pragma("freelist_count")
+
+
+def full_vacuum() -> None:
+    """
+    Полностью перестраивает файл базы и включает режим auto_vacuum = INCREMENTAL,
+    чтобы дальше свободные страницы возвращались по частям. На время работы
+    блокирует запись в базу.
+    """
+    db.execute_sql("PRAGMA auto_vacuum = INCREMENTAL")
+    db.execute_sql("VACUUM")
+
+
+def analyze() -> None:
+    """Обновляет статистику, по которой SQLite выбирает индексы."""
+    db.execute_sql("ANALYZE")
+
+
+def optimize() -> None:
+    """Обновляет статистику только тех таблиц, где она устарела (PRAGMA optimize)."""
+    db.execute_sql("PRAGMA optimize")
+
+
+def reindex() -> None:
+    """Перестраивает все индексы базы."""
+    db.execute_sql("REINDEX")
+
+
+def integrity_check(quick: bool = False) -> List[str]:
+    """
+    Проверяет целостность базы.
+
+    Args:
+        quick (bool): Быстрая проверка без сверки индексов с таблицами.
+
+    Returns:
+        List[str]: Найденные ошибки; ["ok"], если база цела.
+    """
+    pragma = "quick_check" if quick else "integrity_check"
+    return [row[0] for row in db.execute_sql(f"PRAGMA {pragma}").fetchall()]
+
+
+def checkpoint() -> Tuple[int, int, int]:
+    """
+    Переносит изменения из WAL в файл базы и усекает WAL-файл.
+
+    Returns:
+        Tuple[int, int, int]: Признак занятости, страниц в WAL, перенесено страниц.
+    """
+    return tuple(db.execute_sql("PRAGMA wal_checkpoint(TRUNCATE)").fetchone())
+
+
+def database_stats() -> Dict[str, Any]:
+    """
+    Возвращает размеры файлов базы, число страниц и строк в таблицах.
+
+    Returns:
+        Dict[str, Any]: Показатели базы.
+    """
+    path = db.database
+    wal_path = f"{path}-wal"
+    page_size = _pragma("page_size")
+    tables = [
+        row[0]
+        for row in db.execute_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'table' "
+            "AND name NOT LIKE 'sqlite_%' AND name NOT LIKE 'movie_title_index_%'"
+        )
+    ]
+    return {
+        "file_size": os.path.getsize(path) if os.path.exists(path) else 0,
+        "wal_size": os.path.getsize(wal_path) if os.path.exists(wal_path) else 0,
+        "page_size": page_size,
+        "page_count": _pragma("page_count"),
+        "free_pages": _pragma("freelist_count"),
+        "auto_vacuum": _pragma("auto_vacuum"),
+        "rows": {
+            table: db.execute_sql(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+            for table in tables
+        },
+    }
@@ -0,0 +1,395 @@
+"""
+Версионные миграции схемы базы данных бота.
+Номера применённых миграций хранятся в таблице schemamigration. При запуске
+бота проверяется только максимальная версия; если база отстаёт, недостающие
+миграции выполняются по порядку, каждая в своей транзакции вместе с записью
+её номера. Новая база создаётся по текущим моделям и сразу отмечается
+последней версией.
+
+Чтобы изменить схему, добавьте функцию с декоратором @migration и следующим
+номером версии. Миграция описывает изменение явно (колонки, индексы, таблицы),
+а не через текущие модели, чтобы её результат не зависел от их дальнейших правок.
+"""
+
+import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from peewee import (
+    CharField,
+    DateTimeField,
+    IntegerField,
+    OperationalError,
+    TextField,
+)
+from playhouse.migrate import SqliteMigrator, migrate as run_operations
+
+from database import (
+    db,
+    BaseModel,
+    User,
+    Movie,
+    SearchHistory,
+    FavoriteMovie,
+    CatalogMovie,
+    CatalogSyncState,
+    ConversationState,
+)
+from utils.logger_config import logger
+
+# Модели, таблицы которых создаются в новой базе
+MODELS = [
+    User,
+    Movie,
+    SearchHistory,
+    FavoriteMovie,
+    CatalogMovie,
+    CatalogSyncState,
+    ConversationState,
+]
+
+
+class SchemaMigration(BaseModel):
+    """Применённая миграция схемы"""
+
+    version = IntegerField(primary_key=True)
+    name = CharField()
+    applied_at = DateTimeField(default=datetime.datetime.now)
+
+
+class Migration(NamedTuple):
+    """Шаг миграции: номер версии, имя и функция применения"""
+
+    version: int
+    name: str
+    apply: Callable[[SqliteMigrator], None]
+
+
+MIGRATIONS: List[Migration] = []
+
+
+def migration(version: int, name: str) -> Callable:
+    """
+    Регистрирует функцию как миграцию схемы с заданным номером версии.
+    Номера должны идти подряд, начиная с 1.
+
+    Args:
+        version (int): Номер версии схемы после миграции.
+        name (str): Краткое имя миграции.
+
+    Returns:
+        Callable: Декоратор функции миграции.
+    """
+
+    def decorator(func: Callable[[SqliteMigrator], None]) -> Callable:
+        assert version == len(MIGRATIONS) + 1, f"Пропущена миграция {version - 1}"
+        MIGRATIONS.append(Migration(version, name, func))
+        return func
+
+    return decorator
+
+
+def _columns(table: str) -> List[str]:
+    """Возвращает имена колонок таблицы."""
+    return [column.name for column in db.get_columns(table)]
+
+
+@migration(1, "legacy_movie_columns")
+def _add_movie_columns(migrator: SqliteMigrator) -> None:
+    """Колонки данных фильма, которые раньше добавлял скрипт migrate_db.py."""
+    new_columns: Dict[str, Dict[str, object]] = {
+        "searchhistory": {
+            "movie_title": CharField(null=True),
+            "movie_description": TextField(null=True),
+            "movie_rating": CharField(null=True),
+            "movie_year": CharField(null=True),
+            "movie_genre": CharField(null=True),
+            "movie_age_limit": CharField(null=True),
+            "movie_poster_url": CharField(null=True),
+        },
+        "favoritemovie": {
+            "description": TextField(null=True),
+            "rating": CharField(null=True),
+            "movie_year": CharField(null=True),
+            "movie_genre": CharField(null=True),
+            "movie_age_limit": CharField(null=True),
+            "movie_poster_url": CharField(null=True),
+        },
+    }
+    for table, fields in new_columns.items():
+        existing = _columns(table)
+        run_operations(
+            *(
+                migrator.add_column(table, column, field)
+                for column, field in fields.items()
+                if column not in existing
+            )
+        )
+
+
+@migration(2, "catalog_tables")
+def _create_catalog_tables(migrator: SqliteMigrator) -> None:
+    """Таблицы локальной копии каталога Кинопоиска."""
+    db.execute_sql(
+        "CREATE TABLE IF NOT EXISTS catalogmovie ("
+        "id INTEGER NOT NULL PRIMARY KEY, kp_id INTEGER NOT NULL, "
+        "name VARCHAR(255), search_title TEXT NOT NULL, genres TEXT NOT NULL, "
+        "year INTEGER, rating_imdb REAL, rating_kp REAL, budget INTEGER, "
+        "updated_at VARCHAR(255), data TEXT NOT NULL)"
+    )
+    db.execute_sql(
+        "CREATE UNIQUE INDEX IF NOT EXISTS catalogmovie_kp_id ON catalogmovie (kp_id)"
+    )
+    db.execute_sql(
+        "CREATE INDEX IF NOT EXISTS catalogmovie_rating_imdb "
+        "ON catalogmovie (rating_imdb)"
+    )
+    db.execute_sql(
+        "CREATE INDEX IF NOT EXISTS catalogmovie_budget ON catalogmovie (budget)"
+    )
+    db.execute_sql(
+        "CREATE TABLE IF NOT EXISTS catalogsyncstate ("
+        "id INTEGER NOT NULL PRIMARY KEY, name VARCHAR(255) NOT NULL, "
+        "page INTEGER, since DATETIME, run_started_at DATETIME, "
+        "completed_at DATETIME)"
+    )
+    db.execute_sql(
+        "CREATE UNIQUE INDEX IF NOT EXISTS catalogsyncstate_name "
+        "ON catalogsyncstate (name)"
+    )
+
+
+@migration(3, "history_favorites_indexes")
+def _add_history_favorites_indexes(migrator: SqliteMigrator) -> None:
+    """
+    Составные индексы истории и избранного вместо индексов по одному user_id.
+    Перед уникальным индексом (user_id, movie_id) удаляются повторы избранного,
+    остаётся самая ранняя запись.
+    """
+    for statement in (
+        "DELETE FROM favoritemovie WHERE id NOT IN "
+        "(SELECT MIN(id) FROM favoritemovie GROUP BY user_id, movie_id)",
+        "CREATE INDEX IF NOT EXISTS searchhistory_user_id_timestamp "
+        "ON searchhistory (user_id, timestamp)",
+        "CREATE INDEX IF NOT EXISTS searchhistory_command_timestamp "
+        "ON searchhistory (command, timestamp)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS favoritemovie_user_id_movie_id "
+        "ON favoritemovie (user_id, movie_id)",
+        "CREATE INDEX IF NOT EXISTS favoritemovie_movie_id "
+        "ON favoritemovie (movie_id)",
+        "DROP INDEX IF EXISTS searchhistory_user_id",
+        "DROP INDEX IF EXISTS favoritemovie_user_id",
+    ):
+        db.execute_sql(statement)
+
+
+# Фильм истории совпадает с сохранённым, если совпадают название, год и постер
+_SAME_MOVIE = (
+    "m.title = h.movie_title AND m.year IS NULLIF(h.movie_year, 'None') "
+    "AND m.poster_url IS h.movie_poster_url"
+)
+
+
+@migration(4, "normalized_movies")
+def _normalize_movies(migrator: SqliteMigrator) -> None:
+    """
+    Переносит данные фильмов из истории и избранного в таблицу movie.
+    Фильм избранного определяется по ID на Кинопоиске; фильмы истории, у которых
+    ID не сохранялся, объединяются по названию, году и постеру. Таблицы истории
+    и избранного пересоздаются с одной ссылкой на фильм вместо его данных.
+    """
+    for statement in (
+        'CREATE TABLE IF NOT EXISTS "movie" ("id" INTEGER NOT NULL PRIMARY KEY, '
+        '"kp_id" VARCHAR(255), "title" VARCHAR(255), "description" TEXT, '
+        '"rating" VARCHAR(255), "year" VARCHAR(255), "genre" VARCHAR(255), '
+        '"age_limit" VARCHAR(255), "poster_url" VARCHAR(255))',
+        'CREATE UNIQUE INDEX IF NOT EXISTS "movie_kp_id" ON "movie" ("kp_id")',
+        # Временный индекс для сопоставления записей истории с фильмами
+        'CREATE INDEX "movie_title_migration" ON "movie" ("title")',
+        # Фильмы избранного: по последней записи каждого ID
+        "INSERT INTO movie "
+        "(kp_id, title, description, rating, year, genre, age_limit, poster_url) "
+        "SELECT movie_id, title, description, NULLIF(rating, 'None'), "
+        "NULLIF(movie_year, 'None'), NULLIF(movie_genre, ''), movie_age_limit, "
+        "movie_poster_url FROM favoritemovie "
+        "WHERE id IN (SELECT MAX(id) FROM favoritemovie GROUP BY movie_id)",
+        # Фильмы истории, которых нет среди фильмов избранного
+        "INSERT INTO movie "
+        "(title, description, rating, year, genre, age_limit, poster_url) "
+        "SELECT h.movie_title, h.movie_description, NULLIF(h.movie_rating, 'None'), "
+        "NULLIF(h.movie_year, 'None'), NULLIF(h.movie_genre, ''), "
+        "h.movie_age_limit, h.movie_poster_url FROM searchhistory h "
+        "WHERE h.id IN (SELECT MAX(id) FROM searchhistory "
+        "WHERE movie_title IS NOT NULL "
+        "GROUP BY movie_title, movie_year, movie_poster_url) "
+        f"AND NOT EXISTS (SELECT 1 FROM movie m WHERE {_SAME_MOVIE})",
+        'CREATE TABLE "searchhistory_new" ("id" INTEGER NOT NULL PRIMARY KEY, '
+        '"user_id" INTEGER NOT NULL, "query" VARCHAR(255) NOT NULL, '
+        '"command" VARCHAR(255), "timestamp" DATETIME NOT NULL, '
+        '"movie_id" INTEGER, '
+        'FOREIGN KEY ("user_id") REFERENCES "user" ("id") ON DELETE CASCADE, '
+        'FOREIGN KEY ("movie_id") REFERENCES "movie" ("id") ON DELETE SET NULL)',
+        "INSERT INTO searchhistory_new "
+        "(id, user_id, query, command, timestamp, movie_id) "
+        "SELECT h.id, h.user_id, h.query, h.command, h.timestamp, "
+        f"(SELECT m.id FROM movie m WHERE {_SAME_MOVIE} ORDER BY m.id LIMIT 1) "
+        "FROM searchhistory h",
+        "DROP TABLE searchhistory",
+        "ALTER TABLE searchhistory_new RENAME TO searchhistory",
+        'CREATE INDEX "searchhistory_movie_id" ON "searchhistory" ("movie_id")',
+        'CREATE INDEX "searchhistory_user_id_timestamp" '
+        'ON "searchhistory" ("user_id", "timestamp")',
+        'CREATE INDEX "searchhistory_command_timestamp" '
+        'ON "searchhistory" ("command", "timestamp")',
+        'CREATE TABLE "favoritemovie_new" ("id" INTEGER NOT NULL PRIMARY KEY, '
+        '"user_id" INTEGER NOT NULL, "movie_id" INTEGER NOT NULL, '
+        'FOREIGN KEY ("user_id") REFERENCES "user" ("id") ON DELETE CASCADE, '
+        'FOREIGN KEY ("movie_id") REFERENCES "movie" ("id") ON DELETE CASCADE)',
+        "INSERT INTO favoritemovie_new (id, user_id, movie_id) "
+        "SELECT f.id, f.user_id, m.id FROM favoritemovie f "
+        "JOIN movie m ON m.kp_id = f.movie_id",
+        "DROP TABLE favoritemovie",
+        "ALTER TABLE favoritemovie_new RENAME TO favoritemovie",
+        'CREATE INDEX "favoritemovie_movie_id" ON "favoritemovie" ("movie_id")',
+        'CREATE UNIQUE INDEX "favoritemovie_user_id_movie_id" '
+        'ON "favoritemovie" ("user_id", "movie_id")',
+        'DROP INDEX "movie_title_migration"',
+    ):
+        db.execute_sql(statement)
+
+
+@migration(5, "conversation_states")
+def _create_conversation_states(migrator: SqliteMigrator) -> None:
+    """Таблица состояний диалогов вместо хранения их в памяти процесса."""
+    db.execute_sql(
+        "CREATE TABLE IF NOT EXISTS conversationstate ("
+        "chat_id INTEGER NOT NULL, user_id INTEGER NOT NULL, state VARCHAR(255), "
+        "data TEXT NOT NULL, updated_at DATETIME NOT NULL, "
+        "PRIMARY KEY (chat_id, user_id))"
+    )
+    db.execute_sql(
+        "CREATE INDEX IF NOT EXISTS conversationstate_updated_at "
+        "ON conversationstate (updated_at)"
+    )
+
+
+@migration(6, "catalog_votes")
+def _add_catalog_votes(migrator: SqliteMigrator) -> None:
+    """
+    Число оценок фильма на Кинопоиске для сортировки каталога по жанру так же,
+    как в запросе к API. Заполняется из сохранённого ответа API, если оно там есть;
+    у остальных фильмов появится после полной синхронизации каталога.
+    """
+    if "votes" not in _columns("catalogmovie"):
+        db.execute_sql("ALTER TABLE catalogmovie ADD COLUMN votes INTEGER")
+    db.execute_sql(
+        "UPDATE catalogmovie SET votes = json_extract(data, '$.votes.kp') "
+        "WHERE votes IS NULL"
+    )
+    db.execute_sql(
+        "CREATE INDEX IF NOT EXISTS catalogmovie_votes ON catalogmovie (votes)"
+    )
+
+
+# Фильм без ID, который остаётся после объединения: первый с тем же названием и годом
+_KEPT_MOVIE = (
+    "(SELECT MIN(k.id) FROM movie k WHERE k.kp_id IS NULL "
+    "AND k.title IS m.title AND k.year IS m.year)"
+)
+# Фильмы без ID, объединённые с оставшимся
+_MERGED_MOVIES = (
+    "SELECT id FROM movie WHERE kp_id IS NULL AND id NOT IN "
+    "(SELECT MIN(id) FROM movie WHERE kp_id IS NULL GROUP BY title, year)"
+)
+
+
+@migration(7, "unkeyed_movie_dedupe")
+def _dedupe_unkeyed_movies(migrator: SqliteMigrator) -> None:
+    """
+    Объединяет фильмы без ID на Кинопоиске с одинаковыми названием и годом.
+    Раньше такие фильмы добавлялись новой записью при каждом сохранении
+    в историю, а миграция 4 различала их ещё и по постеру. Записи истории
+    и избранного переводятся на оставшийся фильм.
+    """
+    for statement in (
+        'CREATE INDEX IF NOT EXISTS "movie_title_year" ON "movie" ("title", "year")',
+        "UPDATE searchhistory SET movie_id = "
+        f"(SELECT {_KEPT_MOVIE} FROM movie m WHERE m.id = searchhistory.movie_id) "
+        "WHERE movie_id IN (SELECT id FROM movie WHERE kp_id IS NULL)",
+        # Фильм может уже быть в избранном пользователя: такие записи удаляются
+        "UPDATE OR IGNORE favoritemovie SET movie_id = "
+        f"(SELECT {_KEPT_MOVIE} FROM movie m WHERE m.id = favoritemovie.movie_id) "
+        "WHERE movie_id IN (SELECT id FROM movie WHERE kp_id IS NULL)",
+        f"DELETE FROM favoritemovie WHERE movie_id IN ({_MERGED_MOVIES})",
+        f"DELETE FROM movie WHERE id IN ({_MERGED_MOVIES})",
+    ):
+        db.execute_sql(statement)
+
+
+def latest_version() -> int:
+    """
+    Returns:
+        int: Версия схемы после всех зарегистрированных миграций.
+    """
+    return MIGRATIONS[-1].version if MIGRATIONS else 0
+
+
+def current_version() -> Optional[int]:
+    """
+    Читает версию схемы базы одним запросом.
+
+    Returns:
+        Optional[int]: Версия схемы; None, если таблицы версий ещё нет.
+    """
+    try:
+        row = db.execute_sql(
+            f"SELECT MAX(version) FROM {SchemaMigration._meta.table_name}"
+        ).fetchone()
+    except OperationalError:
+        return None
+    return row[0] or 0
+
+
+def migrate() -> int:
+    """
+    Приводит схему базы к последней версии. Соединение должно быть открыто.
+
+    Returns:
+        int: Количество применённых миграций.
+    """
+    version = current_version()
+    if version is not None and version >= latest_version():
+        return 0
+
+    if version is None:
+        if not User.table_exists():
+            _create_schema()
+            return 0
+        # База создана до появления миграций: все шаги проверяют,
+        # что уже есть, и применяются с первого
+        SchemaMigration.create_table(safe=True)
+
+    migrator = SqliteMigrator(db)
+    applied = 0
+    for step in MIGRATIONS:
+        # IMMEDIATE сразу берёт блокировку записи: второй процесс бота
+        # дождётся её и не применит ту же миграцию повторно
+        with db.atomic("IMMEDIATE"):
+            if (current_version() or 0) >= step.version:
+                continue
+            step.apply(migrator)
+            SchemaMigration.create(version=step.version, name=step.name)
+        applied += 1
+        logger.info(f"Применена миграция схемы {step.version}: {step.name}")
+    return applied
+
+
+def _create_schema() -> None:
+    """Создаёт таблицы новой базы по моделям и отмечает все миграции применёнными."""
+    with db.atomic("IMMEDIATE"):
+        if current_version() is not None:
+            return
+        db.create_tables(MODELS + [SchemaMigration], safe=True)
+        SchemaMigration.insert_many(
+            [{"version": step.version, "name": step.name} for step in MIGRATIONS]
+        ).execute()
+    logger.info(f"Создана схема базы версии {latest_version()}")
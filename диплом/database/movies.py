@@ -0,0 +1,151 @@
+"""
+Сохранение фильмов в общую таблицу Movie.
+Записи истории поиска и избранного ссылаются на фильм по ключу, поэтому
+данные фильма (описание, постер и т.д.) хранятся в базе один раз.
+Фильм без ID на Кинопоиске определяется по названию и году.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from peewee import EXCLUDED, Expression, Field, fn
+
+from database import db, Movie
+
+# Колонки Movie с данными фильма, обновляемые при повторном сохранении
+DATA_FIELDS = [
+    Movie.title,
+    Movie.description,
+    Movie.rating,
+    Movie.year,
+    Movie.genre,
+    Movie.age_limit,
+    Movie.poster_url,
+]
+
+# Пакет строк для одного INSERT, чтобы не превысить лимит переменных SQLite
+INSERT_BATCH = 50
+
+
+def movie_fields(film: Dict[str, Any], kp_id=None) -> Dict[str, Any]:
+    """
+    Преобразует фильм в формате ответа API в значения колонок Movie.
+
+    Args:
+        film (Dict[str, Any]): Данные фильма.
+        kp_id (optional): ID фильма, если его нет в данных фильма.
+
+    Returns:
+        Dict[str, Any]: Значения колонок Movie.
+    """
+    kp_id = kp_id or film.get("id") or film.get("kinopoiskId")
+    rating_data = film.get("rating") or {}
+    rating_kp = rating_data.get("kp")
+    rating = rating_kp if rating_kp and rating_kp > 0 else rating_data.get("imdb")
+    year = film.get("year")
+    genres = ", ".join(g.get("name") for g in film.get("genres", []) if g.get("name"))
+    return {
+        "kp_id": str(kp_id) if kp_id else None,
+        "title": film.get("name") or film.get("alternativeName"),
+        "description": film.get("description"),
+        "rating": str(rating) if rating else None,
+        "year": str(year) if year else None,
+        "genre": genres or None,
+        "age_limit": (film.get("ratingAgeLimits") or {}).get("name"),
+        "poster_url": (film.get("poster") or {}).get("url"),
+    }
+
+
+def _matches(field: Field, value: Optional[str]) -> Expression:
+    """Условие совпадения колонки со значением, в том числе с пустым."""
+    return field.is_null() if value is None else field == value
+
+
+def _save_unkeyed(row: Dict[str, Any]) -> int:
+    """
+    Сохраняет фильм без kp_id: обновляет фильм без ID с тем же названием
+    и годом или добавляет новый.
+
+    Args:
+        row (Dict[str, Any]): Значения колонок Movie.
+
+    Returns:
+        int: Ключ Movie.
+    """
+    pk = (
+        Movie.select(Movie.id)
+        .where(
+            Movie.kp_id.is_null()
+            & _matches(Movie.title, row.get("title"))
+            & _matches(Movie.year, row.get("year"))
+        )
+        .order_by(Movie.id)
+        .scalar()
+    )
+    if pk is None:
+        return Movie.insert(row).execute()
+    data = {
+        field: row[field.name]
+        for field in DATA_FIELDS
+        if row.get(field.name) is not None
+    }
+    if data:
+        Movie.update(data).where(Movie.id == pk).execute()
+    return pk
+
+
+def upsert_movies(rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    Сохраняет фильмы и возвращает их ключи в таблице Movie.
+    Фильм с уже известным kp_id обновляется; пустые значения не затирают
+    сохранённые ранее данные. Фильмы без kp_id объединяются по названию и году.
+
+    Args:
+        rows (List[Dict[str, Any]]): Значения колонок Movie (см. movie_fields).
+
+    Returns:
+        List[int]: Ключи Movie в порядке rows.
+    """
+    keyed = {row["kp_id"]: row for row in rows if row.get("kp_id")}
+    update = {
+        field: fn.COALESCE(getattr(EXCLUDED, field.column_name), field)
+        for field in DATA_FIELDS
+    }
+    ids: Dict[str, int] = {}
+    with db.atomic():
+        batch_rows = list(keyed.values())
+        for i in range(0, len(batch_rows), INSERT_BATCH):
+            batch = batch_rows[i : i + INSERT_BATCH]
+            (
+                Movie.insert_many(batch)
+                .on_conflict(conflict_target=[Movie.kp_id], update=update)
+                .execute()
+            )
+            query = Movie.select(Movie.id, Movie.kp_id).where(
+                Movie.kp_id.in_([row["kp_id"] for row in batch])
+            )
+            ids.update({kp_id: pk for pk, kp_id in query.tuples()})
+        unkeyed: Dict[Tuple[Optional[str], Optional[str]], int] = {}
+        result = []
+        for row in rows:
+            if row.get("kp_id"):
+                result.append(ids[row["kp_id"]])
+                continue
+            key = (row.get("title"), row.get("year"))
+            if key not in unkeyed:
+                unkeyed[key] = _save_unkeyed(row)
+            result.append(unkeyed[key])
+        return result
+
+
+def save_movie(film: Dict[str, Any], kp_id=None) -> int:
+    """
+    Сохраняет один фильм в формате ответа API.
+
+    Args:
+        film (Dict[str, Any]): Данные фильма.
+        kp_id (optional): ID фильма, если его нет в данных фильма.
+
+    Returns:
+        int: Ключ Movie.
+    """
+    return upsert_movies([movie_fields(film, kp_id)])[0]
@@ -0,0 +1,249 @@
+"""
+Ограничение размера истории запросов.
+Фоновый поток периодически удаляет записи истории старше заданного срока
+и сверх заданного числа записей на пользователя, затем фильмы, на которые
+больше ничего не ссылается, и возвращает освободившиеся страницы файла базы.
+Удаление идёт небольшими пакетами, каждый в своей короткой транзакции,
+поэтому обработчики бота не ждут блокировку записи дольше одного пакета.
+"""
+
+import datetime
+import threading
+import time
+from typing import Dict, List, Optional
+
+from peewee import DatabaseError, fn
+
+from config_data.config import (
+    HISTORY_RETENTION_DAYS,
+    HISTORY_MAX_PER_USER,
+    RETENTION_INTERVAL,
+    RETENTION_CHUNK,
+    RETENTION_PAUSE,
+    RETENTION_VACUUM_PAGES,
+)
+from database import db, connection, Movie, SearchHistory, FavoriteMovie
+from database import maintenance
+from utils.logger_config import logger
+
+
+def delete_expired_history(
+    before: datetime.datetime, chunk: int = 500, pause: float = 0.0
+) -> int:
+    """
+    Удаляет записи истории, сохранённые раньше заданного момента.
+    Записи добавляются в порядке времени, поэтому устаревшие ищутся в начале
+    таблицы по первичному ключу, без просмотра всей истории.
+
+    Args:
+        before (datetime): Граница: удаляются записи старше неё.
+        chunk (int): Записей на одну транзакцию.
+        pause (float): Пауза между транзакциями, в секундах.
+
+    Returns:
+        int: Количество удалённых записей.
+    """
+    deleted = 0
+    while True:
+        with connection(), db.atomic("IMMEDIATE"):
+            rows = (
+                SearchHistory.select(SearchHistory.id, SearchHistory.timestamp)
+                .order_by(SearchHistory.id)
+                .limit(chunk)
+                .tuples()
+            )
+            expired: List[int] = []
+            for row_id, timestamp in rows:
+                if timestamp >= before:
+                    break
+                expired.append(row_id)
+            if expired:
+                SearchHistory.delete().where(SearchHistory.id <= expired[-1]).execute()
+        deleted += len(expired)
+        if len(expired) < chunk:
+            return deleted
+        time.sleep(pause)
+
+
+def trim_user_history(max_rows: int, chunk: int = 500, pause: float = 0.0) -> int:
+    """
+    Оставляет у каждого пользователя не больше max_rows последних записей истории.
+
+    Args:
+        max_rows (int): Сколько последних записей хранить на пользователя.
+        chunk (int): Записей на одну транзакцию.
+        pause (float): Пауза между транзакциями, в секундах.
+
+    Returns:
+        int: Количество удалённых записей.
+    """
+    with connection():
+        users = [
+            user_id
+            for (user_id,) in SearchHistory.select(SearchHistory.user)
+            .group_by(SearchHistory.user)
+            .having(fn.COUNT(SearchHistory.id) > max_rows)
+            .tuples()
+        ]
+    deleted = 0
+    for user_id in users:
+        of_user = SearchHistory.user == user_id
+        with connection():
+            # Время самой старой из записей, которые остаются
+            border = (
+                SearchHistory.select(SearchHistory.timestamp)
+                .where(of_user)
+                .order_by(SearchHistory.timestamp.desc())
+                .offset(max_rows - 1)
+                .limit(1)
+                .scalar()
+            )
+        while border is not None:
+            with connection(), db.atomic("IMMEDIATE"):
+                ids = [
+                    row_id
+                    for (row_id,) in SearchHistory.select(SearchHistory.id)
+                    .where(of_user & (SearchHistory.timestamp < border))
+                    .limit(chunk)
+                    .tuples()
+                ]
+                if ids:
+                    SearchHistory.delete().where(SearchHistory.id.in_(ids)).execute()
+            deleted += len(ids)
+            if len(ids) < chunk:
+                break
+            time.sleep(pause)
+    return deleted
+
+
+def delete_orphan_movies(chunk: int = 500, pause: float = 0.0) -> int:
+    """
+    Удаляет фильмы, на которые не ссылаются ни история, ни избранное.
+    Таблица фильмов просматривается окнами по первичному ключу.
+
+    Args:
+        chunk (int): Фильмов в одном окне.
+        pause (float): Пауза между транзакциями, в секундах.
+
+    Returns:
+        int: Количество удалённых фильмов.
+    """
+    in_history = SearchHistory.select(1).where(SearchHistory.movie == Movie.id)
+    in_favorites = FavoriteMovie.select(1).where(FavoriteMovie.movie == Movie.id)
+    deleted = 0
+    last_id = 0
+    while True:
+        with connection(), db.atomic("IMMEDIATE"):
+            window_end = (
+                Movie.select(Movie.id)
+                .where(Movie.id > last_id)
+                .order_by(Movie.id)
+                .offset(chunk - 1)
+                .limit(1)
+                .scalar()
+            )
+            in_window = Movie.id > last_id
+            if window_end is not None:
+                in_window &= Movie.id <= window_end
+            orphans = Movie.select(Movie.id).where(
+                in_window & ~fn.EXISTS(in_history) & ~fn.EXISTS(in_favorites)
+            )
+            deleted += Movie.delete().where(Movie.id.in_(orphans)).execute()
+        if window_end is None:
+            return deleted
+        last_id = window_end
+        time.sleep(pause)
+
+
+class HistoryRetention:
+    """
+    Фоновый поток, ограничивающий историю по сроку и числу записей.
+    """
+
+    def __init__(
+        self,
+        interval: float = RETENTION_INTERVAL,
+        days: int = HISTORY_RETENTION_DAYS,
+        max_per_user: int = HISTORY_MAX_PER_USER,
+        chunk: int = RETENTION_CHUNK,
+        pause: float = RETENTION_PAUSE,
+        vacuum_pages: int = RETENTION_VACUUM_PAGES,
+    ) -> None:
+        """
+        Args:
+            interval (float): Период очистки, в секундах.
+            days (int): Срок хранения истории в днях; 0 - без ограничения.
+            max_per_user (int): Записей на пользователя; 0 - без ограничения.
+            chunk (int): Строк на одну транзакцию удаления.
+            pause (float): Пауза между транзакциями, в секундах.
+            vacuum_pages (int): Сколько свободных страниц возвращать за проход.
+        """
+        self.interval = interval
+        self.days = days
+        self.max_per_user = max_per_user
+        self.chunk = chunk
+        self.pause = pause
+        self.vacuum_pages = vacuum_pages
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Запускает фоновый поток очистки, если он ещё не запущен."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="history-retention", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Очистка истории запущена: каждые {self.interval} с, срок "
+            f"{self.days or '∞'} дн., до {self.max_per_user or '∞'} записей "
+            f"на пользователя"
+        )
+
+    def stop(self) -> None:
+        """Останавливает фоновый поток очистки."""
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except DatabaseError as e:
+                logger.error(f"Ошибка очистки истории: {e}")
+            except Exception as e:
+                logger.error(f"Ошибка очистки истории: {e}", exc_info=True)
+            self._stop.wait(self.interval)
+
+    def run_once(self) -> Dict[str, int]:
+        """
+        Выполняет один проход очистки.
+
+        Returns:
+            Dict[str, int]: Число удалённых записей истории по сроку и по лимиту,
+                удалённых фильмов и освобождённых страниц файла.
+        """
+        result = {"expired": 0, "trimmed": 0, "movies": 0, "pages": 0}
+        if self.days > 0:
+            before = datetime.datetime.now() - datetime.timedelta(days=self.days)
+            result["expired"] = delete_expired_history(before, self.chunk, self.pause)
+        if self.max_per_user > 0:
+            result["trimmed"] = trim_user_history(
+                self.max_per_user, self.chunk, self.pause
+            )
+        if result["expired"] or result["trimmed"]:
+            result["movies"] = delete_orphan_movies(self.chunk, self.pause)
+        with connection():
+            result["pages"] = maintenance.incremental_vacuum(self.vacuum_pages)
+            maintenance.optimize()
+        if any(result.values()):
+            logger.info(
+                f"Очистка истории: удалено записей {result['expired']} по сроку, "
+                f"{result['trimmed']} сверх лимита, фильмов {result['movies']}, "
+                f"освобождено страниц {result['pages']}"
+            )
+        return result
+
+
+history_retention = HistoryRetention()
@@ -0,0 +1,242 @@
+"""
+Полнотекстовый индекс названий фильмов (SQLite FTS5 с токенизатором trigram).
+Находит фильмы по названию с опечатками и в транслитерации: кандидаты
+отбираются по общим триграммам, затем ранжируются по сходству строк.
+"""
+
+import re
+from difflib import SequenceMatcher
+from typing import Iterable, List, Set, Tuple
+
+from peewee import DatabaseError
+
+from database import db
+from utils.logger_config import logger
+
+TABLE = "movie_title_index"
+
+# Сколько кандидатов из индекса ранжировать и минимальная оценка совпадения
+CANDIDATES = 50
+MIN_SCORE = 0.75
+
+# Вес совпадения запроса с частью названия относительно совпадения целиком
+PART_WEIGHT = 0.9
+
+# Ограничение числа триграмм в запросе для очень длинных строк
+MAX_TRIGRAMS = 64
+
+_LATIN_TO_CYRILLIC = [
+    ("shch", "щ"),
+    ("sch", "щ"),
+    ("zh", "ж"),
+    ("kh", "х"),
+    ("ts", "ц"),
+    ("ch", "ч"),
+    ("sh", "ш"),
+    ("yu", "ю"),
+    ("ya", "я"),
+    ("yo", "е"),
+    ("a", "а"),
+    ("b", "б"),
+    ("c", "к"),
+    ("d", "д"),
+    ("e", "е"),
+    ("f", "ф"),
+    ("g", "г"),
+    ("h", "х"),
+    ("i", "и"),
+    ("j", "дж"),
+    ("k", "к"),
+    ("l", "л"),
+    ("m", "м"),
+    ("n", "н"),
+    ("o", "о"),
+    ("p", "п"),
+    ("q", "к"),
+    ("r", "р"),
+    ("s", "с"),
+    ("t", "т"),
+    ("u", "у"),
+    ("v", "в"),
+    ("w", "в"),
+    ("x", "кс"),
+    ("y", "й"),
+    ("z", "з"),
+]
+
+_CYRILLIC_TO_LATIN = {
+    "а": "a",
+    "б": "b",
+    "в": "v",
+    "г": "g",
+    "д": "d",
+    "е": "e",
+    "ж": "zh",
+    "з": "z",
+    "и": "i",
+    "й": "y",
+    "к": "k",
+    "л": "l",
+    "м": "m",
+    "н": "n",
+    "о": "o",
+    "п": "p",
+    "р": "r",
+    "с": "s",
+    "т": "t",
+    "у": "u",
+    "ф": "f",
+    "х": "kh",
+    "ц": "ts",
+    "ч": "ch",
+    "ш": "sh",
+    "щ": "shch",
+    "ъ": "",
+    "ы": "y",
+    "ь": "",
+    "э": "e",
+    "ю": "yu",
+    "я": "ya",
+}
+
+_LATIN_RE = re.compile("|".join(latin for latin, _ in _LATIN_TO_CYRILLIC))
+_LATIN_MAP = dict(_LATIN_TO_CYRILLIC)
+
+_available = True
+
+
+def normalize(text: str) -> str:
+    """
+    Приводит название к виду для индекса: нижний регистр, 'ё' как 'е',
+    знаки препинания заменены пробелами.
+
+    Args:
+        text (str): Исходная строка.
+
+    Returns:
+        str: Нормализованная строка.
+    """
+    text = text.lower().replace("ё", "е")
+    return " ".join(re.sub(r"[^\w]+", " ", text).split())
+
+
+def transliterate(text: str) -> str:
+    """
+    Переводит нормализованную строку из латиницы в кириллицу или наоборот,
+    в зависимости от того, каких букв в ней больше.
+
+    Args:
+        text (str): Нормализованная строка.
+
+    Returns:
+        str: Строка в другом алфавите.
+    """
+    cyrillic = sum(1 for ch in text if ch in _CYRILLIC_TO_LATIN)
+    latin = sum(1 for ch in text if "a" <= ch <= "z")
+    if cyrillic >= latin:
+        return "".join(_CYRILLIC_TO_LATIN.get(ch, ch) for ch in text)
+    return _LATIN_RE.sub(lambda m: _LATIN_MAP[m.group(0)], text)
+
+
+def create_index() -> None:
+    """
+    Создаёт таблицу индекса, если её ещё нет, и заполняет её названиями
+    фильмов, уже сохранённых в каталоге.
+    """
+    global _available
+    try:
+        exists = db.execute_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (TABLE,)
+        ).fetchone()
+        if exists:
+            return
+        db.execute_sql(
+            f"CREATE VIRTUAL TABLE {TABLE} USING fts5(titles, tokenize='trigram')"
+        )
+        with db.atomic():
+            db.execute_sql(
+                f"INSERT INTO {TABLE} (rowid, titles) "
+                f"SELECT kp_id, search_title FROM catalogmovie"
+            )
+    except DatabaseError as e:
+        _available = False
+        logger.error(f"Индекс названий фильмов недоступен: {e}")
+
+
+def add_titles(rows: Iterable[Tuple[int, str]]) -> None:
+    """
+    Добавляет или обновляет названия фильмов в индексе.
+    Вызывается внутри транзакции сохранения фильмов в каталог.
+
+    Args:
+        rows (Iterable[Tuple[int, str]]): Пары (ID фильма, названия через перевод строки).
+    """
+    if not _available:
+        return
+    for kp_id, titles in rows:
+        db.execute_sql(
+            f"INSERT OR REPLACE INTO {TABLE} (rowid, titles) VALUES (?, ?)",
+            (kp_id, titles),
+        )
+
+
+def _trigrams(forms: Set[str]) -> List[str]:
+    """Возвращает триграммы всех вариантов запроса."""
+    trigrams = {form[i : i + 3] for form in forms for i in range(len(form) - 2)}
+    return sorted(trigrams)[:MAX_TRIGRAMS]
+
+
+def _score(query: str, title: str) -> float:
+    """
+    Оценивает сходство запроса с названием от 0 до 1.
+    Запрос сравнивается со всем названием и с каждой частью названия из того же
+    числа слов; совпадение с частью названия оценивается чуть ниже полного.
+    """
+    score = SequenceMatcher(None, query, title).ratio()
+    words, size = title.split(), len(query.split())
+    for i in range(len(words) - size + 1):
+        part = " ".join(words[i : i + size])
+        score = max(score, PART_WEIGHT * SequenceMatcher(None, query, part).ratio())
+    return score
+
+
+def search(query: str, limit: int = 10) -> List[int]:
+    """
+    Ищет фильмы по названию с учётом опечаток и транслитерации.
+
+    Args:
+        query (str): Название фильма, введённое пользователем.
+        limit (int): Максимальное число фильмов.
+
+    Returns:
+        List[int]: ID найденных фильмов от лучшего совпадения к худшему.
+    """
+    if not _available:
+        return []
+    query = normalize(query)
+    forms = {query, transliterate(query)} - {""}
+    trigrams = _trigrams(forms)
+    if not trigrams:
+        return []
+
+    match = " OR ".join('"' + t.replace('"', '""') + '"' for t in trigrams)
+    try:
+        rows = db.execute_sql(
+            f"SELECT rowid, titles FROM {TABLE} WHERE {TABLE} MATCH ? "
+            f"ORDER BY rank LIMIT ?",
+            (match, CANDIDATES),
+        ).fetchall()
+    except DatabaseError as e:
+        logger.error(f"Ошибка поиска по индексу названий: {e}")
+        return []
+
+    scored = []
+    for kp_id, titles in rows:
+        score = max(
+            (_score(form, title) for form in forms for title in titles.split("\n")),
+            default=0.0,
+        )
+        if score >= MIN_SCORE:
+            scored.append((score, kp_id))
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return [kp_id for _, kp_id in scored[:limit]]
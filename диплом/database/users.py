@@ -2,9 +2,75 @@
 Модуль для управления пользователями в базе данных
 """
 
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from config_data.config import USER_CACHE_SIZE
 from database import User
 
 
+class UserCache:
+    """
+    Ограниченный LRU-кэш соответствия Telegram ID пользователя
+    первичному ключу и профилю записи User.
+    """
+
+    def __init__(self, max_entries: int = 10000) -> None:
+        """
+        Args:
+            max_entries (int): Максимальное число пользователей в кэше.
+        """
+        self.max_entries = max_entries
+        # telegram id -> (pk, username, first_name)
+        self._entries: "OrderedDict[str, Tuple[int, Optional[str], Optional[str]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> Optional[User]:
+        """
+        Возвращает пользователя из кэша без запроса к базе.
+
+        Args:
+            user_id (str): Telegram ID пользователя.
+
+        Returns:
+            Optional[User]: Запись пользователя или None при промахе.
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            self._entries.move_to_end(user_id)
+        pk, username, first_name = entry
+        return User(id=pk, user_id=user_id, username=username, first_name=first_name)
+
+    def put(self, user: User) -> None:
+        """Сохраняет пользователя в кэше."""
+        with self._lock:
+            self._entries[user.user_id] = (user.id, user.username, user.first_name)
+            self._entries.move_to_end(user.user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """
+        Удаляет пользователя из кэша или очищает кэш целиком.
+
+        Args:
+            user_id (str, optional): Telegram ID пользователя; None - все пользователи.
+        """
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+
+user_cache = UserCache(max_entries=USER_CACHE_SIZE)
+
+
 def get_or_create_user(
     user_id: str, username: str = None, first_name: str = None
 ) -> User:
@@ -23,3 +89,45 @@ def get_or_create_user(
         user_id=user_id, defaults={"username": username, "first_name": first_name}
     )
     return user
+
+
+def get_user(user_id) -> User:
+    """
+    Возвращает пользователя по Telegram ID: из кэша, а при промахе из базы,
+    создавая запись при первом обращении.
+
+    Args:
+        user_id: Telegram ID пользователя.
+
+    Returns:
+        User: Запись пользователя.
+    """
+    user_id = str(user_id)
+    user = user_cache.get(user_id)
+    if user is None:
+        user, _ = User.get_or_create(user_id=user_id)
+        user_cache.put(user)
+    return user
+
+
+def resolve_user(from_user) -> User:
+    """
+    Возвращает пользователя, отправившего обновление, и обновляет имя
+    и username в базе, только если они изменились.
+
+    Args:
+        from_user (telebot.types.User): Отправитель сообщения или callback-запроса.
+
+    Returns:
+        User: Запись пользователя.
+    """
+    user_id = str(from_user.id)
+    user = user_cache.get(user_id)
+    if user is None:
+        user = get_or_create_user(user_id, from_user.username, from_user.first_name)
+    profile = {"username": from_user.username, "first_name": from_user.first_name}
+    if (user.username, user.first_name) != tuple(profile.values()):
+        User.update(**profile).where(User.id == user.id).execute()
+        user.username, user.first_name = profile["username"], profile["first_name"]
+    user_cache.put(user)
+    return user
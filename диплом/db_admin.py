@@ -0,0 +1,109 @@
+"""
+Утилита обслуживания базы данных бота.
+Выполняет очистку истории по сроку хранения, возврат свободных страниц
+(VACUUM), обновление статистики (ANALYZE), перестроение индексов (REINDEX)
+и проверку целостности, выводя время каждой операции.
+
+Запуск: python db_admin.py {stats,retention,vacuum,analyze,reindex,check,all}
+    [--pages N] [--full] [--quick]
+"""
+
+import argparse
+import time
+from typing import Any, Callable
+
+from database import connection, initialize_db
+from database import maintenance
+from database.retention import history_retention
+
+
+def timed(title: str, func: Callable[[], Any]) -> Any:
+    """
+    Выполняет операцию и выводит её результат и длительность.
+
+    Args:
+        title (str): Название операции.
+        func (Callable): Операция без аргументов.
+
+    Returns:
+        Any: Результат операции.
+    """
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    suffix = f": {result}" if result is not None else ""
+    print(f"{title}{suffix} ({elapsed:.2f} с)")
+    return result
+
+
+def print_stats() -> None:
+    """Выводит размер файлов базы, свободные страницы и число строк в таблицах."""
+    stats = maintenance.database_stats()
+    print(
+        f"Файл базы: {stats['file_size'] / 2**20:.1f} МБ, "
+        f"WAL: {stats['wal_size'] / 2**20:.1f} МБ"
+    )
+    print(
+        f"Страниц: {stats['page_count']} по {stats['page_size']} байт, "
+        f"свободных: {stats['free_pages']}, auto_vacuum: {stats['auto_vacuum']}"
+    )
+    for table, count in stats["rows"].items():
+        print(f"  {table}: {count}")
+
+
+def vacuum(pages: int = None, full: bool = False) -> None:
+    """Возвращает свободные страницы по частям или перестраивает файл целиком."""
+    if full:
+        timed("VACUUM", maintenance.full_vacuum)
+    else:
+        timed("Освобождено страниц", lambda: maintenance.incremental_vacuum(pages))
+    timed("Контрольная точка WAL", maintenance.checkpoint)
+
+
+def check(quick: bool = False) -> None:
+    """Проверяет целостность базы."""
+    title = "Быстрая проверка целостности" if quick else "Проверка целостности"
+    timed(title, lambda: ", ".join(maintenance.integrity_check(quick)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "command",
+        choices=["stats", "retention", "vacuum", "analyze", "reindex", "check", "all"],
+    )
+    parser.add_argument(
+        "--pages", type=int, default=None, help="сколько страниц освободить"
+    )
+    parser.add_argument(
+        "--full", action="store_true", help="полный VACUUM с блокировкой базы"
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="быстрая проверка целостности"
+    )
+    args = parser.parse_args()
+
+    initialize_db()
+    commands = (
+        ["retention", "vacuum", "analyze", "check", "stats"]
+        if args.command == "all"
+        else [args.command]
+    )
+    with connection():
+        for command in commands:
+            if command == "stats":
+                print_stats()
+            elif command == "retention":
+                timed("Очистка истории", history_retention.run_once)
+            elif command == "vacuum":
+                vacuum(args.pages, args.full)
+            elif command == "analyze":
+                timed("ANALYZE", maintenance.analyze)
+            elif command == "reindex":
+                timed("REINDEX", maintenance.reindex)
+            elif command == "check":
+                check(args.quick)
+
+
+if __name__ == "__main__":
+    main()
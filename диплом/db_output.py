@@ -1,7 +1,9 @@
 """
 Утилита для вывода содержимого таблицы SearchHistory из базы данных в консоль.
 """
-from database import SearchHistory
+from peewee import JOIN
+
+from database import Movie, SearchHistory
 
 
 def print_search_history() -> None:
@@ -9,7 +11,7 @@ def print_search_history() -> None:
     Выводит все записи из таблицы SearchHistory в удобочитаемом виде.
     Отсутствие записей выводит соответствующее сообщение.
     """
-    entries = SearchHistory.select()
+    entries = SearchHistory.select(SearchHistory, Movie).join(Movie, JOIN.LEFT_OUTER)
     if entries.count() == 0:
         print("Таблица SearchHistory пуста.")
     else:
@@ -19,13 +21,15 @@ def print_search_history() -> None:
             print(f"Запрос: {entry.query}")
             print(f"Команда: {entry.command}")
             print(f"Время: {entry.timestamp}")
-            print(f"Название фильма: {entry.movie_title}")
-            print(f"Описание: {entry.movie_description}")
-            print(f"Рейтинг: {entry.movie_rating}")
-            print(f"Год: {entry.movie_year}")
-            print(f"Жанр: {entry.movie_genre}")
-            print(f"Возрастной рейтинг: {entry.movie_age_limit}")
-            print(f"Постер URL: {entry.movie_poster_url}")
+            movie = entry.movie or Movie()
+            print(f"ID фильма: {movie.kp_id}")
+            print(f"Название фильма: {movie.title}")
+            print(f"Описание: {movie.description}")
+            print(f"Рейтинг: {movie.rating}")
+            print(f"Год: {movie.year}")
+            print(f"Жанр: {movie.genre}")
+            print(f"Возрастной рейтинг: {movie.age_limit}")
+            print(f"Постер URL: {movie.poster_url}")
             print("------")
 
 
@@ -0,0 +1,865 @@
+"""
+Обработчики команд для асинхронного режима работы бота на AsyncTeleBot.
+Повторяют поведение синхронных обработчиков и используют их тексты, проверку
+ввода и клавиатуры: HTTP-запросы к API выполняются через aiohttp, обращения
+к базе данных - в пуле потоков asyncio. Запись User отправителя обработчики
+получают от AsyncUserMiddleware в параметре user.
+"""
+
+import functools
+from typing import Awaitable, Callable, Optional, Tuple
+
+from telebot.async_telebot import AsyncTeleBot
+from telebot.asyncio_helper import ApiTelegramException
+from telebot.types import Message, CallbackQuery
+
+from api import async_kinopoisk_api as api
+from config_data.config import RESULTS_PAGE_SIZE
+from database import run_db, User
+from database import favorites
+from database.history_writer import history_writer
+from handlers.custom_handlers.history import (
+    log_user_query,
+    history_page_message,
+    parse_history_day,
+)
+from handlers.default_handlers.help import HELP_TEXT
+from handlers.default_handlers.start import STARTED_TEXT, WELCOME_TEXT
+from handlers.default_handlers.stop import user_active_status
+from handlers.custom_handlers.pagination import cursors, results_page_message
+from handlers.custom_handlers.results import film_message, results_message
+from keyboards.inline import get_main_inline_keyboard
+from keyboards.reply import get_main_reply_keyboard
+from states import MovieSearchStates
+from utils.callbacks import (
+    ADD_FAVORITE,
+    HISTORY_PAGE,
+    MENU_FAVORITES,
+    MENU_GENRE,
+    MENU_HIGH_BUDGET,
+    MENU_HISTORY,
+    MENU_LOW_BUDGET,
+    MENU_NAME_SEARCH,
+    MENU_RATING,
+    REMOVE_FAVORITE,
+    RESULTS_PAGE,
+)
+from utils.logger_config import logger
+from utils.misc.budget_args import BUDGET_USAGE, parse_budget_args
+from utils.misc.formatters import (
+    EMPTY_FAVORITES_MESSAGE,
+    QUOTA_EXHAUSTED_MESSAGE,
+    format_favorites,
+    split_message,
+    toggle_favorite_keyboard,
+)
+from utils.misc.user_input import (
+    DIGITS_GENRE_MESSAGE,
+    DIGITS_NAME_MESSAGE,
+    EMPTY_GENRE_MESSAGE,
+    EMPTY_NAME_MESSAGE,
+    HISTORY_DATE_MESSAGE,
+    RATING_FORMAT_MESSAGE,
+    check_text_input,
+    parse_history_date,
+    parse_rating,
+)
+from utils.router import AsyncCallbackRouter, AsyncMessageRouter
+
+# Маршрутизаторы команд, кнопок и ввода в состояниях и нажатий inline-кнопок
+# асинхронного бота
+router = AsyncMessageRouter()
+callback_router = AsyncCallbackRouter()
+
+# Функции получения страницы результатов для каждого вида поиска
+PAGE_SOURCES = {"genre": api.get_genre_page, "rating": api.get_rating_page}
+
+
+def _history_page(user: User, target_date=None, direction=None, key=None):
+    """
+    Возвращает текст и клавиатуру страницы истории пользователя или None.
+    Перед первой страницей записывает в базу накопленную историю.
+    """
+    if key is None:
+        history_writer.flush()
+    return history_page_message(user, target_date, direction, key)
+
+
+async def send_long_message(bot: AsyncTeleBot, chat_id: int, text: str) -> None:
+    """
+    Разбивает длинное сообщение на части, чтобы не превышать лимит Telegram.
+
+    Args:
+        bot (AsyncTeleBot): Экземпляр бота.
+        chat_id (int): ID чата для отправки.
+        text (str): Текст сообщения.
+    """
+    for part in split_message(text):
+        await bot.send_message(chat_id, part)
+
+
+async def send_results(
+    bot: AsyncTeleBot, chat_id: int, user_id: int, title: str, films: list
+) -> None:
+    """
+    Отправляет список фильмов одним сообщением с кнопками избранного.
+
+    Args:
+        bot (AsyncTeleBot): Экземпляр бота.
+        chat_id (int): ID чата пользователя.
+        user_id (int): ID пользователя.
+        title (str): Заголовок списка.
+        films (list): Фильмы для отправки.
+    """
+    text, keyboard = await run_db(results_message, user_id, title, films)
+    await bot.send_message(chat_id, text, reply_markup=keyboard)
+
+
+async def send_film_with_fav_buttons(
+    bot: AsyncTeleBot, chat_id: int, user_id: int, film: dict
+) -> None:
+    """
+    Отправляет информацию о фильме с кнопкой добавления/удаления из избранного.
+
+    Args:
+        bot (AsyncTeleBot): Экземпляр бота.
+        chat_id (int): ID чата пользователя.
+        user_id (int): ID пользователя.
+        film (dict): Словарь с данными фильма.
+    """
+    text, keyboard = await run_db(film_message, user_id, film)
+    await bot.send_message(chat_id, text, reply_markup=keyboard)
+
+
+async def send_results_page(
+    bot: AsyncTeleBot,
+    chat_id: int,
+    user_id: int,
+    token: str,
+    page: int,
+    message_id: Optional[int] = None,
+) -> bool:
+    """
+    Отправляет страницу результатов поиска или заменяет ею текст сообщения
+    и запускает фоновую загрузку следующей страницы.
+
+    Args:
+        bot (AsyncTeleBot): Экземпляр бота.
+        chat_id (int): ID чата.
+        user_id (int): ID пользователя.
+        token (str): Токен курсора поиска.
+        page (int): Номер страницы.
+        message_id (int, optional): ID сообщения с предыдущей страницей.
+
+    Returns:
+        bool: False, если курсор истёк или страница пуста.
+    """
+    cursor = cursors.get(token)
+    if cursor is None:
+        return False
+    get_page = PAGE_SOURCES[cursor["kind"]]
+    result = await get_page(
+        cursor["query"], page, RESULTS_PAGE_SIZE, cursor.get("source")
+    )
+    if not result["docs"]:
+        return False
+    cursor.setdefault("source", result["source"])
+
+    text, keyboard = await run_db(results_page_message, user_id, token, cursor, result)
+    if message_id is None:
+        await bot.send_message(chat_id, text, reply_markup=keyboard)
+    else:
+        try:
+            await bot.edit_message_text(
+                text, chat_id, message_id, reply_markup=keyboard
+            )
+        except ApiTelegramException as e:
+            logger.warning(f"Не удалось обновить страницу результатов: {e}")
+
+    if result["has_next"] and result["source"] == api.SOURCE_API:
+        api.prefetch(
+            get_page, cursor["query"], page + 1, RESULTS_PAGE_SIZE, api.SOURCE_API
+        )
+    return True
+
+
+async def send_history_page(
+    bot: AsyncTeleBot,
+    chat_id: int,
+    user: User,
+    target_date=None,
+    direction: Optional[str] = None,
+    key: Optional[Tuple[int, int]] = None,
+    message_id: Optional[int] = None,
+) -> bool:
+    """
+    Отправляет страницу истории или заменяет ею текст сообщения.
+
+    Args:
+        bot (AsyncTeleBot): Экземпляр бота.
+        chat_id (int): ID чата.
+        user (User): Пользователь.
+        target_date (date, optional): Только записи за этот день.
+        direction (str, optional): Направление перехода от ключа.
+        key (Tuple[int, int], optional): Ключ крайней записи текущей страницы.
+        message_id (int, optional): ID сообщения с текущей страницей.
+
+    Returns:
+        bool: False, если записей нет.
+    """
+    page = await run_db(_history_page, user, target_date, direction, key)
+    if page is None:
+        return False
+    text, keyboard = page
+    if message_id is None:
+        await bot.send_message(chat_id, text, reply_markup=keyboard)
+    else:
+        try:
+            await bot.edit_message_text(
+                text, chat_id, message_id, reply_markup=keyboard
+            )
+        except ApiTelegramException as e:
+            logger.warning(f"Не удалось обновить страницу истории: {e}")
+    return True
+
+
+async def start_paginated_search(
+    bot: AsyncTeleBot, chat_id: int, user_id: int, kind: str, query
+) -> bool:
+    """
+    Создаёт курсор поиска и отправляет первую страницу результатов.
+
+    Args:
+        bot (AsyncTeleBot): Экземпляр бота.
+        chat_id (int): ID чата.
+        user_id (int): ID пользователя.
+        kind (str): Вид поиска: "genre" или "rating".
+        query: Параметр поиска: жанр или минимальный рейтинг.
+
+    Returns:
+        bool: True, если найден хотя бы один фильм.
+    """
+    token = cursors.put({"kind": kind, "query": query})
+    return await send_results_page(bot, chat_id, user_id, token, 1)
+
+
+def error_handler_decorator(
+    bot: AsyncTeleBot, empty_msg: str = None, digits_msg: str = None
+):
+    """
+    Декоратор для обработки ошибок в асинхронных обработчиках сообщений.
+
+    Args:
+        bot (AsyncTeleBot): Экземпляр бота.
+        empty_msg (str, optional): Ответ на пустой ввод. Если указан,
+            пустой ввод и ввод только из цифр отклоняются.
+        digits_msg (str, optional): Ответ на ввод, состоящий только из цифр.
+
+    Returns:
+        Callable: Декоратор функции.
+    """
+
+    def decorator(func=None, *, custom_error_msg='Произошла ошибка. Попробуйте позже.'):
+        if func is None:
+
+            def wrapper(f):
+                return decorator(f, custom_error_msg=custom_error_msg)
+
+            return wrapper
+
+        # Сигнатура обработчика сохраняется: маршрутизатор передаёт ему
+        # только названные в параметрах данные middleware
+        @functools.wraps(func)
+        async def inner(message: Message, **kwargs):
+            try:
+                if empty_msg:
+                    error = check_text_input(message.text, empty_msg, digits_msg)
+                    if error:
+                        await bot.send_message(message.chat.id, error)
+                        return
+                return await func(message, **kwargs)
+            except Exception as e:
+                logger.error(
+                    f'Ошибка в обработчике {func.__name__}: {e}', exc_info=True
+                )
+                await bot.send_message(message.chat.id, custom_error_msg)
+
+        return inner
+
+    return decorator
+
+
+def register_async_default_handlers(bot: AsyncTeleBot) -> None:
+    """
+    Регистрирует обработчики /start, /help, /stop и reply-кнопок
+    "Старт", "Помощь" и "Стоп".
+
+    Args:
+        bot (AsyncTeleBot): Экземпляр бота.
+    """
+
+    @router.command("start", "Старт")
+    @router.text("Старт")
+    async def start_command(message: Message):
+        logger.info(f"Пользователь {message.from_user.id} вызвал команду /start")
+        user_active_status[message.from_user.id] = True
+        await bot.send_message(
+            message.chat.id, STARTED_TEXT, reply_markup=get_main_reply_keyboard()
+        )
+        await bot.send_message(
+            message.chat.id, WELCOME_TEXT, reply_markup=get_main_inline_keyboard()
+        )
+
+    @router.command("help")
+    @router.text("Помощь")
+    async def help_command(message: Message):
+        logger.info(f"Пользователь {message.from_user.id} вызвал команду /help")
+        await bot.send_message(
+            message.chat.id, HELP_TEXT, reply_markup=get_main_inline_keyboard()
+        )
+
+    @router.command("stop", "Стоп")
+    @router.text("Стоп")
+    async def stop_command(message: Message):
+        user_active_status[message.from_user.id] = False
+        await bot.delete_state(message.from_user.id, message.chat.id)
+        await bot.send_message(
+            message.chat.id, "Обработка остановлена. Для возобновления нажмите /start."
+        )
+
+
+def register_async_search_handlers(bot: AsyncTeleBot) -> None:
+    """
+    Регистрирует обработчики поиска по жанру, названию, рейтингу и бюджету.
+
+    Args:
+        bot (AsyncTeleBot): Экземпляр бота.
+    """
+    guard = error_handler_decorator(bot)
+    genre_guard = error_handler_decorator(
+        bot, empty_msg=EMPTY_GENRE_MESSAGE, digits_msg=DIGITS_GENRE_MESSAGE
+    )
+    name_guard = error_handler_decorator(
+        bot, empty_msg=EMPTY_NAME_MESSAGE, digits_msg=DIGITS_NAME_MESSAGE
+    )
+
+    @router.command('movie_by_genre')
+    @genre_guard(custom_error_msg='Ошибка при обработке команды. Попробуйте позже.')
+    async def ask_genre(message: Message):
+        logger.info(
+            f'Пользователь {message.from_user.id} вызвал команду /movie_by_genre'
+        )
+        await run_db(
+            log_user_query, message.from_user.id, message.text, '/movie_by_genre'
+        )
+        await bot.set_state(
+            message.from_user.id, MovieSearchStates.waiting_for_genre, message.chat.id
+        )
+        await bot.send_message(
+            message.chat.id,
+            'Введите жанр фильма (например: комедия, боевик, фантастика):',
+        )
+
+    @router.state(MovieSearchStates.waiting_for_genre)
+    @genre_guard(
+        custom_error_msg='Ошибка при поиске фильмов по жанру. Попробуйте еще раз.'
+    )
+    async def genre_search(message: Message):
+        genre = message.text.lower()
+        logger.info(f'Поиск фильмов по жанру: {genre}')
+        try:
+            found = await start_paginated_search(
+                bot, message.chat.id, message.from_user.id, 'genre', genre
+            )
+        except Exception as e:
+            logger.error(f'Ошибка при вызове get_genre_page: {e}', exc_info=True)
+            await bot.send_message(
+                message.chat.id, 'Ошибка при обращении к API. Попробуйте позже.'
+            )
+            return
+
+        if found:
+            await run_db(
+                log_user_query, message.from_user.id, message.text, '/movie_by_genre'
+            )
+            await bot.delete_state(message.from_user.id, message.chat.id)
+        elif api.is_quota_exhausted():
+            await bot.send_message(message.chat.id, QUOTA_EXHAUSTED_MESSAGE)
+        else:
+            await bot.send_message(
+                message.chat.id,
+                'Фильмы по такому жанру не найдены. Попробуйте другой жанр.',
+            )
+
+    @router.command('movie_search')
+    @name_guard(
+        custom_error_msg='Ошибка при обработке команды поиска. Попробуйте позже.'
+    )
+    async def ask_movie_name(message: Message):
+        logger.info(f'Пользователь {message.from_user.id} вызвал команду /movie_search')
+        await run_db(
+            log_user_query, message.from_user.id, message.text, '/movie_search'
+        )
+        await bot.set_state(
+            message.from_user.id, MovieSearchStates.waiting_for_name, message.chat.id
+        )
+        await bot.send_message(message.chat.id, 'Введите название фильма:')
+
+    @router.state(MovieSearchStates.waiting_for_name)
+    @name_guard(custom_error_msg='Ошибка при поиске фильма. Попробуйте еще раз.')
+    async def process_movie_name_step(message: Message):
+        movie_name = message.text.strip()
+        logger.info(f'Ищем фильмы по названию: {movie_name}')
+        try:
+            films = await api.search_films_by_name(movie_name)
+        except Exception as e:
+            logger.error(f'Ошибка при вызове search_films_by_name: {e}', exc_info=True)
+            await bot.send_message(
+                message.chat.id, 'Ошибка при обращении к API. Попробуйте позже.'
+            )
+            await bot.delete_state(message.from_user.id, message.chat.id)
+            return
+
+        if films:
+            await run_db(
+                log_user_query,
+                message.from_user.id,
+                movie_name,
+                '/movie_search',
+                films[0],
+            )
+            await send_film_with_fav_buttons(
+                bot, message.chat.id, message.from_user.id, films[0]
+            )
+            await bot.delete_state(message.from_user.id, message.chat.id)
+        elif api.is_quota_exhausted():
+            await bot.send_message(message.chat.id, QUOTA_EXHAUSTED_MESSAGE)
+        else:
+            await bot.send_message(
+                message.chat.id,
+                'Фильмы с таким названием не найдены. Попробуйте другой запрос.',
+            )
+
+    @router.command('movie_by_rating')
+    @guard(custom_error_msg='Ошибка при обработке команды. Попробуйте позже.')
+    async def ask_rating_params(message: Message):
+        logger.info(
+            f'Пользователь {message.from_user.id} вызвал команду /movie_by_rating'
+        )
+        await run_db(
+            log_user_query, message.from_user.id, message.text, '/movie_by_rating'
+        )
+        await bot.set_state(
+            message.from_user.id, MovieSearchStates.waiting_for_rating, message.chat.id
+        )
+        await bot.send_message(
+            message.chat.id, 'Введите минимальный рейтинг IMDB (например, 7.5):'
+        )
+
+    @router.state(MovieSearchStates.waiting_for_rating)
+    @guard(custom_error_msg='Ошибка при обработке рейтинга. Попробуйте снова.')
+    async def process_min_imdb(message: Message):
+        try:
+            min_rating = parse_rating(message.text)
+            logger.info(f'Минимальный рейтинг для поиска: {min_rating}')
+        except ValueError:
+            await bot.send_message(message.chat.id, RATING_FORMAT_MESSAGE)
+            return
+
+        try:
+            found = await start_paginated_search(
+                bot, message.chat.id, message.from_user.id, 'rating', min_rating
+            )
+        except Exception as e:
+            logger.error(f'Ошибка при вызове get_rating_page: {e}', exc_info=True)
+            await bot.send_message(
+                message.chat.id, 'Ошибка при обращении к API. Попробуйте позже.'
+            )
+            await bot.delete_state(message.from_user.id, message.chat.id)
+            return
+
+        if found:
+            await run_db(
+                log_user_query, message.from_user.id, message.text, '/movie_by_rating'
+            )
+        elif api.is_quota_exhausted():
+            await bot.send_message(message.chat.id, QUOTA_EXHAUSTED_MESSAGE)
+        else:
+            await bot.send_message(
+                message.chat.id, 'По вашему запросу фильмы не найдены.'
+            )
+        await bot.delete_state(message.from_user.id, message.chat.id)
+
+    @router.command("low_budget_movie")
+    @guard(
+        custom_error_msg="Ошибка при поиске фильмов с низким бюджетом. Попробуйте позже."
+    )
+    async def send_low_budget_movies(message: Message):
+        try:
+            max_budget, sort_by = parse_budget_args(message.text)
+        except ValueError:
+            await bot.send_message(
+                message.chat.id, BUDGET_USAGE.format(command="low_budget_movie")
+            )
+            return
+        await run_db(log_user_query, message.from_user.id, message.text)
+        sort_by = sort_by or "budget"
+        films = await api.search_films_by_low_budget(
+            max_budget=max_budget or api.LOW_BUDGET_MAX,
+            sort_by=sort_by,
+            descending=sort_by != "budget",
+        )
+        if films:
+            await send_results(
+                bot,
+                message.chat.id,
+                message.from_user.id,
+                "Фильмы с низким бюджетом",
+                films,
+            )
+        elif api.is_quota_exhausted():
+            await bot.send_message(message.chat.id, QUOTA_EXHAUSTED_MESSAGE)
+        else:
+            await bot.send_message(
+                message.chat.id, "Фильмы с низким бюджетом не найдены."
+            )
+
+    @router.command("high_budget_movie")
+    @guard(
+        custom_error_msg="Ошибка при поиске фильмов с высоким бюджетом. Попробуйте позже."
+    )
+    async def send_high_budget_movies(message: Message):
+        try:
+            min_budget, sort_by = parse_budget_args(message.text)
+        except ValueError:
+            await bot.send_message(
+                message.chat.id, BUDGET_USAGE.format(command="high_budget_movie")
+            )
+            return
+        await run_db(log_user_query, message.from_user.id, message.text)
+        films = await api.search_films_by_high_budget(
+            min_budget=min_budget or api.HIGH_BUDGET_MIN, sort_by=sort_by or "budget"
+        )
+        if films:
+            await send_results(
+                bot,
+                message.chat.id,
+                message.from_user.id,
+                "Фильмы с высоким бюджетом",
+                films,
+            )
+        elif api.is_quota_exhausted():
+            await bot.send_message(message.chat.id, QUOTA_EXHAUSTED_MESSAGE)
+        else:
+            await bot.send_message(
+                message.chat.id, "Фильмы с высоким бюджетом не найдены."
+            )
+
+
+def register_async_history_handlers(bot: AsyncTeleBot) -> None:
+    """
+    Регистрирует обработчики команды /history, состояния ожидания даты
+    и кнопок перехода между страницами истории.
+
+    Args:
+        bot (AsyncTeleBot): Экземпляр бота.
+    """
+
+    @router.command('history')
+    async def history_command(message: Message):
+        await bot.set_state(
+            message.from_user.id,
+            MovieSearchStates.waiting_for_history_date,
+            message.chat.id,
+        )
+        await bot.send_message(
+            message.chat.id,
+            "Введите дату в формате дд.мм.гггг для фильтрации истории или 'все' для всей истории:",
+        )
+
+    @router.state(MovieSearchStates.waiting_for_history_date)
+    async def process_history_date(message: Message, user: User):
+        try:
+            target_date = parse_history_date(message.text)
+        except ValueError:
+            await bot.send_message(message.chat.id, HISTORY_DATE_MESSAGE)
+            return
+
+        if not await send_history_page(bot, message.chat.id, user, target_date):
+            await bot.send_message(message.chat.id, "По вашему запросу история пустая.")
+        await bot.delete_state(message.from_user.id, message.chat.id)
+
+    @callback_router.action(HISTORY_PAGE)
+    async def history_page_callback_handler(
+        call: CallbackQuery,
+        direction: str,
+        day: int,
+        timestamp: int,
+        entry_id: int,
+        user: User,
+    ):
+        logger.info(f"Пользователь {call.from_user.id} листает историю поиска")
+        try:
+            shown = await send_history_page(
+                bot,
+                call.message.chat.id,
+                user,
+                parse_history_day(day),
+                direction,
+                (timestamp, entry_id),
+                call.message.message_id,
+            )
+        except Exception as e:
+            logger.error(f"Ошибка при выводе страницы истории: {e}", exc_info=True)
+            await bot.answer_callback_query(call.id, text="Ошибка. Попробуйте позже.")
+            return
+        # Новая страница уже видна после правки сообщения, поэтому callback
+        # подтверждается отдельным запросом только при ошибке
+        if not shown:
+            await bot.answer_callback_query(
+                call.id, text="Записи удалены, повторите /history."
+            )
+
+
+def register_async_favorite_handlers(bot: AsyncTeleBot) -> None:
+    """
+    Регистрирует команды и callback-обработчики избранного.
+
+    Args:
+        bot (AsyncTeleBot): Экземпляр бота.
+    """
+
+    @router.command('add_favorite')
+    async def add_favorite(message: Message, user: User):
+        user_id = message.from_user.id
+        try:
+            _, movie_id, _title = message.text.split(maxsplit=2)
+        except ValueError:
+            await bot.send_message(
+                message.chat.id,
+                'Неверный формат команды. Используйте:\n/add_favorite <movie_id> <название фильма>',
+            )
+            return
+
+        if await run_db(favorites.is_favorite, user_id, movie_id):
+            await bot.send_message(
+                message.chat.id, 'Этот фильм уже добавлен в избранное.'
+            )
+            return
+
+        film_data = await api.get_film_data_by_id(movie_id)
+        if not film_data:
+            await bot.send_message(
+                message.chat.id, "Не удалось получить данные фильма по ID."
+            )
+            return
+
+        await run_db(favorites.add_favorite, user, movie_id, film_data)
+        await bot.send_message(
+            message.chat.id, f'Фильм "{film_data.get("name")}" добавлен в избранное.'
+        )
+        logger.info(
+            f'Пользователь {user_id} добавил фильм "{film_data.get("name")}" в избранное.'
+        )
+
+    @router.command('favorites')
+    async def show_favorites(message: Message, user: User):
+        films = await run_db(favorites.favorite_films, user)
+        if not films:
+            await bot.send_message(message.chat.id, EMPTY_FAVORITES_MESSAGE)
+            return
+        await bot.send_message(message.chat.id, format_favorites(films))
+
+    @router.command('remove_favorite')
+    async def remove_favorite(message: Message, user: User):
+        user_id = message.from_user.id
+        try:
+            _, movie_id = message.text.split(maxsplit=1)
+        except ValueError:
+            await bot.send_message(
+                message.chat.id,
+                'Неверный формат команды. Используйте:\n/remove_favorite <movie_id>',
+            )
+            return
+
+        deleted = await run_db(favorites.remove_favorite, user, movie_id)
+        if deleted:
+            await bot.send_message(
+                message.chat.id, f'Фильм с ID {movie_id} удалён из избранного.'
+            )
+            logger.info(
+                f'Пользователь {user_id} удалил фильм с ID {movie_id} из избранного.'
+            )
+        else:
+            await bot.send_message(
+                message.chat.id, 'Фильм не найден в вашем избранном.'
+            )
+
+    async def update_favorite_button(call: CallbackQuery, movie_id: str) -> None:
+        is_favorite = await run_db(favorites.is_favorite, call.from_user.id, movie_id)
+        keyboard = toggle_favorite_keyboard(
+            call.message.reply_markup, movie_id, is_favorite
+        )
+        await bot.edit_message_reply_markup(
+            call.message.chat.id, call.message.message_id, reply_markup=keyboard
+        )
+
+    @callback_router.action(ADD_FAVORITE)
+    async def add_favorite_callback(call: CallbackQuery, movie_id: str, user: User):
+        try:
+            if await run_db(favorites.is_favorite, call.from_user.id, movie_id):
+                await bot.answer_callback_query(call.id, text="Фильм уже в избранном")
+                return
+            film_data = await api.get_film_data_by_id(movie_id)
+            if not film_data:
+                await bot.answer_callback_query(
+                    call.id, text="Не удалось получить данные фильма"
+                )
+                return
+            await run_db(favorites.add_favorite, user, movie_id, film_data)
+            await bot.answer_callback_query(call.id, text="Добавлено в избранное")
+            await update_favorite_button(call, movie_id)
+        except Exception as e:
+            logger.error(f"Ошибка в add_favorite_callback: {e}", exc_info=True)
+            await bot.answer_callback_query(call.id, text=f"Ошибка: {e}")
+
+    @callback_router.action(REMOVE_FAVORITE)
+    async def remove_favorite_callback(call: CallbackQuery, movie_id: str, user: User):
+        try:
+            if await run_db(favorites.remove_favorite, user, movie_id):
+                await bot.answer_callback_query(call.id, text="Удалено из избранного")
+            else:
+                await bot.answer_callback_query(
+                    call.id, text="Фильм не найден в избранном"
+                )
+            await update_favorite_button(call, movie_id)
+        except Exception as e:
+            logger.error(f"Ошибка в remove_favorite_callback: {e}", exc_info=True)
+            await bot.answer_callback_query(call.id, text=f"Ошибка: {e}")
+
+
+def register_async_pagination_handler(bot: AsyncTeleBot) -> None:
+    """
+    Регистрирует обработчик кнопок перехода между страницами результатов.
+
+    Args:
+        bot (AsyncTeleBot): Экземпляр бота.
+    """
+
+    @callback_router.action(RESULTS_PAGE)
+    async def page_callback_handler(call: CallbackQuery, token: str, page: int):
+        logger.info(
+            f"Пользователь {call.from_user.id} открыл страницу {page} результатов"
+        )
+        try:
+            shown = await send_results_page(
+                bot,
+                call.message.chat.id,
+                call.from_user.id,
+                token,
+                page,
+                call.message.message_id,
+            )
+        except Exception as e:
+            logger.error(f"Ошибка при выводе страницы результатов: {e}", exc_info=True)
+            await bot.answer_callback_query(call.id, text="Ошибка. Попробуйте позже.")
+            return
+        if shown:
+            await bot.answer_callback_query(call.id)
+        else:
+            await bot.answer_callback_query(
+                call.id, text="Результаты устарели, повторите поиск."
+            )
+
+
+def register_async_callback_handlers(bot: AsyncTeleBot) -> None:
+    """
+    Регистрирует обработчики кнопок inline-меню в маршрутизаторе нажатий.
+
+    Args:
+        bot (AsyncTeleBot): Экземпляр бота.
+    """
+
+    async def accept(call: CallbackQuery) -> None:
+        await bot.answer_callback_query(call.id)
+        logger.info(f"Пользователь {call.from_user.id} нажал кнопку меню '{call.data}'")
+
+    async def ask(call: CallbackQuery, state, prompt: str) -> None:
+        await accept(call)
+        await bot.set_state(call.from_user.id, state, call.message.chat.id)
+        await bot.send_message(call.message.chat.id, prompt)
+
+    async def send_budget_films(
+        call: CallbackQuery, search: Callable[[], Awaitable[list]], title: str
+    ) -> None:
+        await accept(call)
+        chat_id = call.message.chat.id
+        films = await search()
+        if films:
+            await send_results(
+                bot, chat_id, call.from_user.id, f"Фильмы с {title} бюджетом", films
+            )
+        elif api.is_quota_exhausted():
+            await bot.send_message(chat_id, QUOTA_EXHAUSTED_MESSAGE)
+        else:
+            await bot.send_message(chat_id, f"Фильмы с {title} бюджетом не найдены.")
+
+    @callback_router.action(MENU_NAME_SEARCH)
+    async def movie_search(call: CallbackQuery) -> None:
+        await ask(call, MovieSearchStates.waiting_for_name, "Введите название фильма:")
+
+    @callback_router.action(MENU_RATING)
+    async def movie_by_rating(call: CallbackQuery) -> None:
+        await ask(
+            call,
+            MovieSearchStates.waiting_for_rating,
+            "Введите минимальный рейтинг IMDB:",
+        )
+
+    @callback_router.action(MENU_GENRE)
+    async def movie_by_genre(call: CallbackQuery) -> None:
+        await ask(call, MovieSearchStates.waiting_for_genre, "Введите жанр фильма:")
+
+    @callback_router.action(MENU_HISTORY)
+    async def history(call: CallbackQuery) -> None:
+        await ask(
+            call,
+            MovieSearchStates.waiting_for_history_date,
+            "Введите дату для истории:",
+        )
+
+    @callback_router.action(MENU_LOW_BUDGET)
+    async def low_budget_movie(call: CallbackQuery) -> None:
+        await send_budget_films(call, api.search_films_by_low_budget, "низким")
+
+    @callback_router.action(MENU_HIGH_BUDGET)
+    async def high_budget_movie(call: CallbackQuery) -> None:
+        await send_budget_films(call, api.search_films_by_high_budget, "высоким")
+
+    @callback_router.action(MENU_FAVORITES)
+    async def show_favorites(call: CallbackQuery, user: User) -> None:
+        await accept(call)
+        chat_id = call.message.chat.id
+        films = await run_db(favorites.favorite_films, user)
+        if not films:
+            await bot.send_message(chat_id, EMPTY_FAVORITES_MESSAGE)
+            return
+        await send_long_message(bot, chat_id, format_favorites(films))
+
+
+def register_async_handlers(bot: AsyncTeleBot) -> None:
+    """
+    Регистрирует все обработчики асинхронного бота в том же порядке,
+    что и в синхронном режиме.
+
+    Args:
+        bot (AsyncTeleBot): Экземпляр бота.
+    """
+    register_async_default_handlers(bot)
+    register_async_search_handlers(bot)
+    register_async_history_handlers(bot)
+    register_async_favorite_handlers(bot)
+    router.setup(bot)
+    register_async_pagination_handler(bot)
+    register_async_callback_handlers(bot)
+    callback_router.setup(bot)
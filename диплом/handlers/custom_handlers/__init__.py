@@ -10,6 +10,7 @@ from .low_budget import register_low_budget_handler
 from .high_budget import register_high_budget_handler
 from .history import register_history_handler
 from .favorites import register_favorite_handler, register_favorite_callback_handler
+from .pagination import register_pagination_handler
 
 
 def register_custom_handlers(bot: TeleBot) -> None:
@@ -21,3 +22,4 @@ def register_custom_handlers(bot: TeleBot) -> None:
     register_history_handler(bot)
     register_favorite_handler(bot)
     register_favorite_callback_handler(bot)
+    register_pagination_handler(bot)
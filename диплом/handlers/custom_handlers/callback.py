@@ -1,16 +1,37 @@
 """
-Обработчики callback-запросов от inline-кнопок Telegram бота.
+Обработчики callback-запросов от inline-кнопок главного меню Telegram бота.
+Каждая кнопка регистрируется в маршрутизаторе нажатий по своему действию.
 """
 
 from utils.logger_config import logger
-from api.kinopoisk_api import search_films_by_low_budget, search_films_by_high_budget
+from api.kinopoisk_api import (
+    search_films_by_low_budget,
+    search_films_by_high_budget,
+    is_quota_exhausted,
+)
 from states import MovieSearchStates
-from database import User, FavoriteMovie
-from utils.misc.formatters import format_film_info
+from database import User
+from database.favorites import favorite_films
+from database.users import get_user
+from handlers.custom_handlers.results import send_results
+from utils.callbacks import (
+    MENU_FAVORITES,
+    MENU_GENRE,
+    MENU_HIGH_BUDGET,
+    MENU_HISTORY,
+    MENU_LOW_BUDGET,
+    MENU_NAME_SEARCH,
+    MENU_RATING,
+)
+from utils.misc.formatters import (
+    EMPTY_FAVORITES_MESSAGE,
+    QUOTA_EXHAUSTED_MESSAGE,
+    format_favorites,
+    split_message,
+)
+from utils.router import callback_router
 from telebot.types import CallbackQuery
 
-MAX_MESSAGE_LENGTH = 4000
-
 
 def send_long_message(bot, chat_id: int, text: str) -> None:
     """
@@ -20,103 +41,89 @@ def send_long_message(bot, chat_id: int, text: str) -> None:
         chat_id (int): ID чата для отправки.
         text (str): Текст сообщения.
     """
-    while text:
-        if len(text) > MAX_MESSAGE_LENGTH:
-            part = text[:MAX_MESSAGE_LENGTH]
-            last_newline = part.rfind('\n')
-            if last_newline != -1:
-                part = part[:last_newline]
-                text = text[last_newline + 1 :]
-            else:
-                text = text[MAX_MESSAGE_LENGTH:]
-        else:
-            part = text
-            text = ''
+    for part in split_message(text):
         bot.send_message(chat_id, part)
 
 
+def send_budget_films(bot, chat_id: int, user_id: int, films: list, title: str) -> None:
+    """
+    Отправляет фильмы подборки по бюджету с кнопками избранного.
+    Args:
+        bot: Экземпляр бота.
+        chat_id (int): ID чата для отправки.
+        user_id (int): ID пользователя.
+        films (list): Найденные фильмы.
+        title (str): Бюджет подборки: "низким" или "высоким".
+    """
+    if films:
+        send_results(bot, chat_id, user_id, f"Фильмы с {title} бюджетом", films)
+    elif is_quota_exhausted():
+        bot.send_message(chat_id, QUOTA_EXHAUSTED_MESSAGE)
+    else:
+        bot.send_message(chat_id, f"Фильмы с {title} бюджетом не найдены.")
+
+
 def register_callback_handlers(bot) -> None:
     """
-    Регистрирует универсальный обработчик для всех callback-запросов inline-кнопок.
+    Регистрирует обработчики кнопок inline-меню в маршрутизаторе нажатий.
     Args:
         bot: Экземпляр Telegram бота.
     """
 
-    @bot.callback_query_handler(func=lambda call: True)
-    def callback_inline_handler(call: CallbackQuery) -> None:
+    def accept(call: CallbackQuery) -> None:
         bot.answer_callback_query(call.id)
-        data = call.data
+        logger.info(f"Пользователь {call.from_user.id} нажал кнопку меню '{call.data}'")
+
+    def ask(call: CallbackQuery, state, prompt: str) -> None:
+        accept(call)
+        bot.set_state(call.from_user.id, state, call.message.chat.id)
+        bot.send_message(call.message.chat.id, prompt)
+
+    @callback_router.action(MENU_NAME_SEARCH)
+    def movie_search(call: CallbackQuery) -> None:
+        ask(call, MovieSearchStates.waiting_for_name, "Введите название фильма:")
+
+    @callback_router.action(MENU_RATING)
+    def movie_by_rating(call: CallbackQuery) -> None:
+        ask(
+            call,
+            MovieSearchStates.waiting_for_rating,
+            "Введите минимальный рейтинг IMDB:",
+        )
+
+    @callback_router.action(MENU_GENRE)
+    def movie_by_genre(call: CallbackQuery) -> None:
+        ask(call, MovieSearchStates.waiting_for_genre, "Введите жанр фильма:")
+
+    @callback_router.action(MENU_HISTORY)
+    def history(call: CallbackQuery) -> None:
+        ask(
+            call,
+            MovieSearchStates.waiting_for_history_date,
+            "Введите дату для истории:",
+        )
+
+    @callback_router.action(MENU_LOW_BUDGET)
+    def low_budget_movie(call: CallbackQuery) -> None:
+        accept(call)
+        films = search_films_by_low_budget()
+        send_budget_films(bot, call.message.chat.id, call.from_user.id, films, "низким")
+
+    @callback_router.action(MENU_HIGH_BUDGET)
+    def high_budget_movie(call: CallbackQuery) -> None:
+        accept(call)
+        films = search_films_by_high_budget()
+        send_budget_films(
+            bot, call.message.chat.id, call.from_user.id, films, "высоким"
+        )
+
+    @callback_router.action(MENU_FAVORITES)
+    def show_favorites(call: CallbackQuery, user: User = None) -> None:
+        accept(call)
         chat_id = call.message.chat.id
-        user_id = call.from_user.id
-
-        logger.info(f"Пользователь {user_id} нажал кнопку с callback_data '{data}'")
-
-        if data == "movie_search":
-            bot.set_state(user_id, MovieSearchStates.waiting_for_name, chat_id)
-            bot.send_message(chat_id, "Введите название фильма:")
-        elif data == "movie_by_rating":
-            bot.set_state(user_id, MovieSearchStates.waiting_for_rating, chat_id)
-            bot.send_message(chat_id, "Введите минимальный рейтинг IMDB:")
-        elif data == "movie_by_genre":
-            bot.set_state(user_id, MovieSearchStates.waiting_for_genre, chat_id)
-            bot.send_message(chat_id, "Введите жанр фильма:")
-        elif data == "low_budget_movie":
-            films = search_films_by_low_budget()
-            if films:
-                reply = "Фильмы с низким бюджетом:\n\n"
-                for film in films[:5]:
-                    name = (
-                        film.get("name")
-                        or film.get("alternativeName")
-                        or "Название неизвестно"
-                    )
-                    reply += f"{name}\n"
-                send_long_message(bot, chat_id, reply)
-            else:
-                bot.send_message(chat_id, "Фильмы с низким бюджетом не найдены.")
-        elif data == "high_budget_movie":
-            films = search_films_by_high_budget()
-            if films:
-                reply = "Фильмы с высоким бюджетом:\n\n"
-                for film in films[:5]:
-                    name = (
-                        film.get("name")
-                        or film.get("alternativeName")
-                        or "Название неизвестно"
-                    )
-                    reply += f"{name}\n"
-                send_long_message(bot, chat_id, reply)
-            else:
-                bot.send_message(chat_id, "Фильмы с высоким бюджетом не найдены.")
-        elif data == "history":
-            bot.set_state(user_id, MovieSearchStates.waiting_for_history_date, chat_id)
-            bot.send_message(chat_id, "Введите дату для истории:")
-        elif data == "help":
-            bot.send_message(
-                chat_id, "Доступные команды:\n/start\n/help\n/movie_search\n..."
-            )
-        elif data == "show_favorites":
-            user, _ = User.get_or_create(user_id=str(user_id))
-            favorites = FavoriteMovie.select().where(FavoriteMovie.user == user)
-            if not favorites.exists():
-                bot.send_message(chat_id, "Ваш список избранных фильмов пуст.")
-                return
-            reply = "Ваши избранные фильмы:\n\n"
-            for fav in favorites:
-                film_data = {
-                    "name": fav.title or "Название неизвестно",
-                    "description": fav.description or "Нет описания",
-                    "year": fav.movie_year or "неизвестно",
-                    "rating": {"kp": float(fav.rating) if fav.rating else None},
-                    "genres": (
-                        [{"name": g.strip()} for g in fav.movie_genre.split(",")]
-                        if fav.movie_genre
-                        else []
-                    ),
-                    "ratingAgeLimits": {"name": fav.movie_age_limit or "—"},
-                    "poster": {"url": fav.movie_poster_url},
-                }
-                reply += format_film_info(film_data) + "\n---\n"
-            send_long_message(bot, chat_id, reply)
-        else:
-            bot.send_message(chat_id, "Неизвестная команда.")
+        user = user or get_user(call.from_user.id)
+        films = favorite_films(user)
+        if not films:
+            bot.send_message(chat_id, EMPTY_FAVORITES_MESSAGE)
+            return
+        send_long_message(bot, chat_id, format_favorites(films))
@@ -4,15 +4,30 @@
 
 from telebot import TeleBot
 from telebot.types import Message, CallbackQuery
-from database import User, FavoriteMovie
+from database import User
+from utils.callbacks import ADD_FAVORITE, REMOVE_FAVORITE
 from utils.logger_config import logger
-from utils.misc.formatters import get_favorite_inline_keyboard, format_film_info
-from api.kinopoisk_api import session, API_KINOPOISK_TOKEN  # импорт из kinopoisk_api.py
+from utils.misc.formatters import (
+    EMPTY_FAVORITES_MESSAGE,
+    format_favorites,
+    toggle_favorite_keyboard,
+)
+from api.kinopoisk_api import fetch_json
+from database import fallback
+from database.favorites import (
+    add_favorite as save_favorite,
+    favorite_films,
+    is_favorite,
+    remove_favorite as delete_favorite,
+)
+from database.users import get_user
+from utils.router import callback_router, router
 
 
 def get_film_data_by_id(movie_id: str) -> dict | None:
     """
     Получение подробных данных о фильме по его ID из API Кинопоиска.
+    Если API недоступен, данные берутся из сохранённых в базе фильмов.
 
     Args:
         movie_id (str): Идентификатор фильма
@@ -20,18 +35,11 @@ def get_film_data_by_id(movie_id: str) -> dict | None:
     Returns:
          dcit | None: Словарь с данными фильма, или None при ошибке.
     """
-    headers = {"X-API-KEY": API_KINOPOISK_TOKEN}
-    response = session.get(
-        f"https://api.kinopoisk.dev/v1.4/movie/{movie_id}", headers=headers
-    )
-    if response.status_code == 200:
-        data = response.json()
-        return data
-    else:
-        logger.error(
-            f"Ошибка при получении данных фильма с ID {movie_id}: {response.text}"
-        )
-        return None
+    data = fetch_json("movie", f"/v1.4/movie/{movie_id}")
+    if data is None:
+        logger.error(f"Ошибка при получении данных фильма с ID {movie_id}")
+        data = fallback.find_film_by_id(movie_id)
+    return data
 
 
 def register_favorite_handler(bot: TeleBot) -> None:
@@ -43,10 +51,10 @@ def register_favorite_handler(bot: TeleBot) -> None:
         bot (Telebot): Экземпляр Telegram бота.
     """
 
-    @bot.message_handler(commands=['add_favorite'])
-    def add_favorite(message: Message):
+    @router.command('add_favorite')
+    def add_favorite(message: Message, user: User = None):
         user_id = str(message.from_user.id)
-        user, _ = User.get_or_create(user_id=user_id)
+        user = user or get_user(user_id)
 
         try:
             _, movie_id, title = message.text.split(maxsplit=2)
@@ -57,12 +65,7 @@ def register_favorite_handler(bot: TeleBot) -> None:
             )
             return
 
-        exists = (
-            FavoriteMovie.select()
-            .where((FavoriteMovie.user == user) & (FavoriteMovie.movie_id == movie_id))
-            .exists()
-        )
-        if exists:
+        if is_favorite(user_id, movie_id):
             bot.send_message(message.chat.id, 'Этот фильм уже добавлен в избранное.')
             return
 
@@ -73,20 +76,7 @@ def register_favorite_handler(bot: TeleBot) -> None:
             )
             return
 
-        FavoriteMovie.create(
-            user=user,
-            movie_id=movie_id,
-            title=film_data.get("name") or "Название неизвестно",
-            description=film_data.get("description"),
-            rating=str(
-                film_data.get("rating", {}).get("kp")
-                or film_data.get("rating", {}).get("imdb")
-            ),
-            movie_year=str(film_data.get("year")),
-            movie_genre=", ".join(g.get("name") for g in film_data.get("genres", [])),
-            movie_age_limit=film_data.get("ratingAgeLimits", {}).get("name"),
-            movie_poster_url=film_data.get("poster", {}).get("url"),
-        )
+        save_favorite(user, movie_id, film_data)
         bot.send_message(
             message.chat.id, f'Фильм "{film_data.get("name")}" добавлен в избранное.'
         )
@@ -94,40 +84,23 @@ def register_favorite_handler(bot: TeleBot) -> None:
             f'Пользователь {user_id} добавил фильм "{film_data.get("name")}" в избранное.'
         )
 
-    @bot.message_handler(commands=['favorites'])
-    def show_favorites(message: Message):
+    @router.command('favorites')
+    def show_favorites(message: Message, user: User = None):
         user_id = str(message.from_user.id)
-        user, _ = User.get_or_create(user_id=user_id)
+        user = user or get_user(user_id)
 
-        favorites = FavoriteMovie.select().where(FavoriteMovie.user == user)
+        films = favorite_films(user)
 
-        if favorites.count() == 0:
-            bot.send_message(message.chat.id, 'Ваш список избранных фильмов пуст.')
+        if not films:
+            bot.send_message(message.chat.id, EMPTY_FAVORITES_MESSAGE)
             return
 
-        reply = "Ваши избранные фильмы:\n\n"
-        for fav in favorites:
-            film_data = {
-                "name": fav.title or "Название неизвестно",
-                "description": fav.description or "Нет описания",
-                "year": fav.movie_year or "неизвестно",
-                "rating": {"kp": float(fav.rating) if fav.rating else None},
-                "genres": (
-                    [{"name": g.strip()} for g in fav.movie_genre.split(",")]
-                    if fav.movie_genre
-                    else []
-                ),
-                "ratingAgeLimits": {"name": fav.movie_age_limit or "—"},
-                "poster": {"url": fav.movie_poster_url},
-            }
-            reply += format_film_info(film_data) + "\n---\n"
-
-        bot.send_message(message.chat.id, reply)
-
-    @bot.message_handler(commands=['remove_favorite'])
-    def remove_favorite(message: Message):
+        bot.send_message(message.chat.id, format_favorites(films))
+
+    @router.command('remove_favorite')
+    def remove_favorite(message: Message, user: User = None):
         user_id = str(message.from_user.id)
-        user, _ = User.get_or_create(user_id=user_id)
+        user = user or get_user(user_id)
 
         try:
             _, movie_id = message.text.split(maxsplit=1)
@@ -138,11 +111,7 @@ def register_favorite_handler(bot: TeleBot) -> None:
             )
             return
 
-        deleted = (
-            FavoriteMovie.delete()
-            .where((FavoriteMovie.user == user) & (FavoriteMovie.movie_id == movie_id))
-            .execute()
-        )
+        deleted = delete_favorite(user, movie_id)
 
         if deleted:
             bot.send_message(
@@ -157,89 +126,57 @@ def register_favorite_handler(bot: TeleBot) -> None:
 
 def register_favorite_callback_handler(bot: TeleBot) -> None:
     """
-    Регистрирует обработчик callback запросов для inline кнопок добавления и удаоения
+    Регистрирует обработчики callback запросов для inline кнопок добавления и удаоения
     фильмов из избранного.
 
     Args:
         bot (Telebot): Экземпляр бота.
     """
 
-    @bot.callback_query_handler(
-        func=lambda call: call.data.startswith(("add_fav:", "remove_fav:"))
-    )
-    def favorite_callback_handler(call: CallbackQuery):
+    def update_favorite_button(call: CallbackQuery, user_id: str, movie_id: str):
+        # Под списком фильмов меняется только кнопка нажатого фильма
+        keyboard = toggle_favorite_keyboard(
+            call.message.reply_markup, movie_id, is_favorite(user_id, movie_id)
+        )
+        bot.edit_message_reply_markup(
+            call.message.chat.id, call.message.message_id, reply_markup=keyboard
+        )
+
+    @callback_router.action(ADD_FAVORITE)
+    def add_favorite_callback(call: CallbackQuery, movie_id: str, user: User = None):
         try:
-            action, movie_id = call.data.split(":")
             user_id = str(call.from_user.id)
-            user, _ = User.get_or_create(user_id=user_id)
-
-            if action == "add_fav":
-                exists = (
-                    FavoriteMovie.select()
-                    .where(
-                        (FavoriteMovie.user == user)
-                        & (FavoriteMovie.movie_id == movie_id)
-                    )
-                    .exists()
-                )
-                if exists:
-                    bot.answer_callback_query(call.id, text="Фильм уже в избранном")
-                    return
-
-                film_data = get_film_data_by_id(movie_id)
-                if not film_data:
-                    bot.answer_callback_query(
-                        call.id, text="Не удалось получить данные фильма"
-                    )
-                    return
-
-                FavoriteMovie.create(
-                    user=user,
-                    movie_id=movie_id,
-                    title=film_data.get("name") or "Название неизвестно",
-                    description=film_data.get("description"),
-                    rating=str(
-                        film_data.get("rating", {}).get("kp")
-                        or film_data.get("rating", {}).get("imdb")
-                    ),
-                    movie_year=str(film_data.get("year")),
-                    movie_genre=", ".join(
-                        g.get("name") for g in film_data.get("genres", [])
-                    ),
-                    movie_age_limit=film_data.get("ratingAgeLimits", {}).get("name"),
-                    movie_poster_url=film_data.get("poster", {}).get("url"),
-                )
-                bot.answer_callback_query(call.id, text="Добавлено в избранное")
-            elif action == "remove_fav":
-                deleted = (
-                    FavoriteMovie.delete()
-                    .where(
-                        (FavoriteMovie.user == user)
-                        & (FavoriteMovie.movie_id == movie_id)
-                    )
-                    .execute()
-                )
-                if deleted:
-                    bot.answer_callback_query(call.id, text="Удалено из избранного")
-                else:
-                    bot.answer_callback_query(
-                        call.id, text="Фильм не найден в избранном"
-                    )
-            else:
-                bot.answer_callback_query(call.id, text="Неизвестное действие")
+            user = user or get_user(user_id)
+
+            if is_favorite(user_id, movie_id):
+                bot.answer_callback_query(call.id, text="Фильм уже в избранном")
+                return
 
-            is_favorite = (
-                FavoriteMovie.select()
-                .where(
-                    (FavoriteMovie.user == user) & (FavoriteMovie.movie_id == movie_id)
+            film_data = get_film_data_by_id(movie_id)
+            if not film_data:
+                bot.answer_callback_query(
+                    call.id, text="Не удалось получить данные фильма"
                 )
-                .exists()
-            )
+                return
 
-            keyboard = get_favorite_inline_keyboard(movie_id, is_favorite)
-            bot.edit_message_reply_markup(
-                call.message.chat.id, call.message.message_id, reply_markup=keyboard
-            )
+            save_favorite(user, movie_id, film_data)
+            bot.answer_callback_query(call.id, text="Добавлено в избранное")
+            update_favorite_button(call, user_id, movie_id)
+        except Exception as e:
+            logger.error(f"Ошибка в add_favorite_callback: {e}", exc_info=True)
+            bot.answer_callback_query(call.id, text=f"Ошибка: {e}")
+
+    @callback_router.action(REMOVE_FAVORITE)
+    def remove_favorite_callback(call: CallbackQuery, movie_id: str, user: User = None):
+        try:
+            user_id = str(call.from_user.id)
+            user = user or get_user(user_id)
+
+            if delete_favorite(user, movie_id):
+                bot.answer_callback_query(call.id, text="Удалено из избранного")
+            else:
+                bot.answer_callback_query(call.id, text="Фильм не найден в избранном")
+            update_favorite_button(call, user_id, movie_id)
         except Exception as e:
-            logger.error(f"Ошибка в favorite_callback_handler: {e}", exc_info=True)
+            logger.error(f"Ошибка в remove_favorite_callback: {e}", exc_info=True)
             bot.answer_callback_query(call.id, text=f"Ошибка: {e}")
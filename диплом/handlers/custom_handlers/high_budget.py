@@ -3,39 +3,17 @@
 """
 
 from telebot.types import Message
-from api.kinopoisk_api import search_films_by_high_budget
+from api.kinopoisk_api import (
+    HIGH_BUDGET_MIN,
+    search_films_by_high_budget,
+    is_quota_exhausted,
+)
 from utils.logger_config import logger
 from .history import log_user_query
-from utils.misc.formatters import format_film_info, format_films_list
-from utils.misc.formatters import get_favorite_inline_keyboard
-from database import User, FavoriteMovie
-
-
-def send_film_with_fav_buttons(bot, chat_id: int, user_id: int, film: dict) -> None:
-    """
-    Отправляет информацию о фильме с кнопкой добавления/удаления из избранного.
-
-    Args:
-        bot(TeleBot): Экземпляр бота.
-        chat_id(int): ID чата пользователя.
-        user_id(int): ID пользователя.
-        film(dict): Словарь с данными фильма.
-    """
-    movie_id = film.get("id") or str(film.get("kinopoiskId", "unknown"))
-
-    user = User.get_or_none(user_id=str(user_id))
-    is_favorite = False
-    if user:
-        is_favorite = (
-            FavoriteMovie.select()
-            .where((FavoriteMovie.user == user) & (FavoriteMovie.movie_id == movie_id))
-            .exists()
-        )
-
-    reply_text = format_film_info(film)  # Ваша функция форматирования
-
-    keyboard = get_favorite_inline_keyboard(movie_id, is_favorite)
-    bot.send_message(chat_id, reply_text, reply_markup=keyboard)
+from .results import send_results
+from utils.misc.formatters import QUOTA_EXHAUSTED_MESSAGE
+from utils.misc.budget_args import BUDGET_USAGE, parse_budget_args
+from utils.router import router
 
 
 def error_handler_decorator(bot):
@@ -73,22 +51,38 @@ def error_handler_decorator(bot):
 
 def register_high_budget_handler(bot) -> None:
     """
-    Регистрирует обработчик команды /high_budget_movie.
+    Регистрирует обработчик команды /high_budget_movie [бюджет] [сортировка].
 
     Args:
         bot: Экземпляр Telegram бота.
     """
     decorator = error_handler_decorator(bot)
 
-    @bot.message_handler(commands=["high_budget_movie"])
+    @router.command("high_budget_movie")
     @decorator(
         custom_error_msg="Ошибка при поиске фильмов с высоким бюджетом. Попробуйте позже."
     )
     def send_high_budget_movies(message: Message):
+        try:
+            min_budget, sort_by = parse_budget_args(message.text)
+        except ValueError:
+            bot.send_message(
+                message.chat.id, BUDGET_USAGE.format(command="high_budget_movie")
+            )
+            return
         log_user_query(message.from_user.id, message.text)
-        films = search_films_by_high_budget()
+        films = search_films_by_high_budget(
+            min_budget=min_budget or HIGH_BUDGET_MIN, sort_by=sort_by or "budget"
+        )
         if films:
-            reply = "Фильмы с высоким бюджетом:\n\n" + format_films_list(films)
-            bot.send_message(message.chat.id, reply, parse_mode="Markdown")
+            send_results(
+                bot,
+                message.chat.id,
+                message.from_user.id,
+                "Фильмы с высоким бюджетом",
+                films,
+            )
+        elif is_quota_exhausted():
+            bot.send_message(message.chat.id, QUOTA_EXHAUSTED_MESSAGE)
         else:
             bot.send_message(message.chat.id, "Фильмы с высоким бюджетом не найдены.")
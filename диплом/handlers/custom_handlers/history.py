@@ -4,15 +4,31 @@
 """
 
 from telebot import TeleBot
-from telebot.types import Message
+from telebot.apihelper import ApiTelegramException
+from telebot.types import CallbackQuery, InlineKeyboardMarkup, Message
 from telebot.handler_backends import State, StatesGroup
-from peewee import fn
-from database import User, SearchHistory
-from datetime import datetime
+from peewee import JOIN, Tuple as RowValue
+
+from config_data.config import HISTORY_PAGE_SIZE
+from database import User, Movie, SearchHistory
+from database.movies import movie_fields
+from database.users import get_user
+from database.history_writer import history_writer
+from datetime import date, datetime, time, timedelta
+from keyboards.inline import get_history_keyboard
+from typing import List, Optional, Tuple
+from utils.callbacks import HISTORY_PAGE, NEWER
 from utils.logger_config import logger
+from utils.misc.user_input import HISTORY_DATE_MESSAGE, parse_history_date
+from utils.router import callback_router, router
 
 bot = TeleBot('YOUR_BOT_TOKEN', parse_mode='HTML')
 
+MAX_MESSAGE_LENGTH = 4000
+
+# Длина описания фильма в записи истории на странице /history
+DESCRIPTION_LIMIT = 300
+
 
 class MovieSearchStates(StatesGroup):
     """Состояния для работы с историей поиска"""
@@ -25,6 +41,8 @@ def log_user_query(
 ) -> None:
     """
     Записывает запрос пользователя и связанную информацию о фильме в историю.
+    Запись ставится в очередь и сохраняется в базу фоновым потоком; данные
+    фильма сохраняются в таблицу Movie, запись истории ссылается на неё.
 
     Args:
         user_id (int): ID пользователя
@@ -33,85 +51,275 @@ def log_user_query(
         film (dict, optional):  Данные о фильме для записи дополнительной
     информации.
     """
-    user, _ = User.get_or_create(user_id=str(user_id))
-    movie_data = {
-        "movie_title": None,
-        "movie_description": None,
-        "movie_rating": None,
-        "movie_year": None,
-        "movie_genre": None,
-        "movie_age_limit": None,
-        "movie_poster_url": None,
-    }
-    if film:
-        movie_data["movie_title"] = film.get("name") or film.get("alternativeName")
-        movie_data["movie_description"] = film.get("description")
-        rating_data = film.get("rating", {})
-        rating_kp = rating_data.get("kp")
-        rating_imdb = rating_data.get("imdb")
-        if rating_kp and rating_kp > 0:
-            movie_data["movie_rating"] = str(rating_kp)
-        elif rating_imdb:
-            movie_data["movie_rating"] = str(rating_imdb)
-        movie_data["movie_year"] = str(film.get("year"))
-        genres_list = film.get("genres", [])
-        movie_data["movie_genre"] = ", ".join(
-            g.get("name") for g in genres_list if g.get("name")
-        )
-        movie_data["movie_age_limit"] = film.get("ratingAgeLimits", {}).get("name")
-        movie_data["movie_poster_url"] = film.get("poster", {}).get("url")
-
-    SearchHistory.create(
-        user=user,
-        query=query,
-        command=command,
-        timestamp=datetime.now(),
-        movie_title=movie_data["movie_title"],
-        movie_description=movie_data["movie_description"],
-        movie_rating=movie_data["movie_rating"],
-        movie_year=movie_data["movie_year"],
-        movie_genre=movie_data["movie_genre"],
-        movie_age_limit=movie_data["movie_age_limit"],
-        movie_poster_url=movie_data["movie_poster_url"],
+    user = get_user(user_id)
+    history_writer.add(
+        {
+            "user": user.id,
+            "query": query,
+            "command": command,
+            "timestamp": datetime.now(),
+            "movie": movie_fields(film) if film else None,
+        }
     )
     logger.info(f"Запись истории: пользователь {user.user_id}, запрос '{query}'")
 
 
-def format_history_entry(entry) -> str:
+def day_range(target_date: date) -> Tuple[datetime, datetime]:
     """
-    Форматирует запись истории для вывода пользователю.
+    Возвращает полуинтервал [начало дня, начало следующего дня).
+    Сравнение столбца timestamp с границами, в отличие от DATE(timestamp),
+    позволяет SQLite использовать индекс (user, timestamp).
+
+    Args:
+        target_date (date): День.
+
+    Returns:
+        Tuple[datetime, datetime]: Начало дня и начало следующего дня.
+    """
+    start = datetime.combine(target_date, time.min)
+    return start, start + timedelta(days=1)
+
+
+def history_query(user: User, target_date: Optional[date] = None):
+    """
+    Строит запрос истории пользователя от новых записей к старым.
+
+    Args:
+        user (User): Пользователь.
+        target_date (date, optional): Только записи за этот день.
+
+    Returns:
+        ModelSelect: Запрос записей SearchHistory.
+    """
+    condition = SearchHistory.user == user
+    if target_date is not None:
+        start, end = day_range(target_date)
+        condition &= (SearchHistory.timestamp >= start) & (
+            SearchHistory.timestamp < end
+        )
+    return (
+        SearchHistory.select(SearchHistory, Movie)
+        .join(Movie, JOIN.LEFT_OUTER)
+        .where(condition)
+        .order_by(SearchHistory.timestamp.desc(), SearchHistory.id.desc())
+    )
+
+
+def history_key(entry) -> Tuple[int, int]:
+    """
+    Возвращает ключ записи истории для callback_data: время и ID записи.
 
     Args:
         entry: Объект записи SearchHistory.
 
+    Returns:
+        Tuple[int, int]: Время записи числом ГГГГММДДччммссмкс и ID записи.
+    """
+    return int(f"{entry.timestamp:%Y%m%d%H%M%S%f}"), entry.id
+
+
+def parse_history_key(key: Tuple[int, int]) -> Tuple[datetime, int]:
+    """
+    Разбирает ключ записи истории, созданный history_key.
+
+    Args:
+        key (Tuple[int, int]): Ключ записи.
+
+    Returns:
+        Tuple[datetime, int]: Время и ID записи.
+    """
+    timestamp, entry_id = key
+    return datetime.strptime(str(timestamp), "%Y%m%d%H%M%S%f"), entry_id
+
+
+def history_day(target_date: Optional[date]) -> int:
+    """
+    Возвращает день фильтра истории для callback_data.
+
+    Args:
+        target_date (date, optional): День; None - вся история.
+
+    Returns:
+        int: День числом ГГГГММДД или 0 для всей истории.
+    """
+    return int(f"{target_date:%Y%m%d}") if target_date else 0
+
+
+def parse_history_day(day: int) -> Optional[date]:
+    """
+    Разбирает день фильтра истории, созданный history_day.
+
+    Args:
+        day (int): День числом ГГГГММДД или 0.
+
+    Returns:
+        Optional[date]: День или None для всей истории.
+    """
+    return datetime.strptime(str(day), "%Y%m%d").date() if day else None
+
+
+def history_page(
+    user: User,
+    target_date: Optional[date] = None,
+    direction: Optional[str] = None,
+    key: Optional[Tuple[int, int]] = None,
+    size: int = HISTORY_PAGE_SIZE,
+) -> Tuple[List[SearchHistory], bool, bool]:
+    """
+    Выбирает страницу истории пользователя от новых записей к старым.
+    Соседняя страница ищется по ключу (timestamp, id) крайней записи текущей,
+    а не через OFFSET, поэтому SQLite сразу переходит к нужному месту индекса
+    (user, timestamp) и дальние страницы выбираются так же быстро, как первая.
+
+    Args:
+        user (User): Пользователь.
+        target_date (date, optional): Только записи за этот день.
+        direction (str, optional): OLDER - записи старее ключа,
+            NEWER - записи новее ключа.
+        key (Tuple[int, int], optional): Ключ крайней записи текущей
+            страницы; None - первая страница.
+        size (int): Записей на странице.
+
+    Returns:
+        Tuple[List[SearchHistory], bool, bool]: Записи страницы, есть ли
+            записи новее и есть ли записи старее.
+    """
+    query = history_query(user, target_date)
+    if key is None:
+        rows = list(query.limit(size + 1))
+        return rows[:size], False, len(rows) > size
+
+    position = RowValue(SearchHistory.timestamp, SearchHistory.id)
+    border = RowValue(*parse_history_key(key))
+    if direction == NEWER:
+        rows = list(
+            query.where(position > border)
+            .order_by(SearchHistory.timestamp, SearchHistory.id)
+            .limit(size + 1)
+        )
+        return rows[:size][::-1], len(rows) > size, True
+    rows = list(query.where(position < border).limit(size + 1))
+    return rows[:size], True, len(rows) > size
+
+
+def format_history_entry(entry, description_limit: int = None) -> str:
+    """
+    Форматирует запись истории для вывода пользователю.
+
+    Args:
+        entry: Объект записи SearchHistory с загруженным фильмом.
+        description_limit (int, optional): Максимальная длина описания фильма.
+
     Returns:
         str: Отформатированное строковое представление записи.
     """
     date = entry.timestamp.strftime('%d.%m.%Y %H:%M:%S')
     cmd = entry.command or "неизвестная команда"
+    movie = entry.movie or Movie()
+    description = movie.description or "Отсутствует"
+    if description_limit and len(description) > description_limit:
+        description = description[:description_limit].rstrip() + "…"
     return (
         f'Дата поиска: {date}\n'
         f'Команда: {cmd}\n'
-        f'Название: {entry.movie_title or "Неизвестно"}\n'
-        f'Описание: {entry.movie_description or "Отсутствует"}\n'
-        f'Рейтинг: {entry.movie_rating or "Нет данных"}\n'
-        f'Год: {entry.movie_year or "Неизвестно"}\n'
-        f'Жанр: {entry.movie_genre or "Неизвестно"}\n'
-        f'Возрастной рейтинг: {entry.movie_age_limit or "—"}\n'
-        + (f'Постер: {entry.movie_poster_url}\n' if entry.movie_poster_url else '')
+        f'Название: {movie.title or "Неизвестно"}\n'
+        f'Описание: {description}\n'
+        f'Рейтинг: {movie.rating or "Нет данных"}\n'
+        f'Год: {movie.year or "Неизвестно"}\n'
+        f'Жанр: {movie.genre or "Неизвестно"}\n'
+        f'Возрастной рейтинг: {movie.age_limit or "—"}\n'
+        + (f'Постер: {movie.poster_url}\n' if movie.poster_url else '')
+    )
+
+
+def history_page_message(
+    user: User,
+    target_date: Optional[date] = None,
+    direction: Optional[str] = None,
+    key: Optional[Tuple[int, int]] = None,
+) -> Optional[Tuple[str, InlineKeyboardMarkup]]:
+    """
+    Готовит страницу истории для вывода одним сообщением.
+
+    Args:
+        user (User): Пользователь.
+        target_date (date, optional): Только записи за этот день.
+        direction (str, optional): Направление перехода от ключа.
+        key (Tuple[int, int], optional): Ключ крайней записи текущей страницы.
+
+    Returns:
+        Optional[Tuple[str, InlineKeyboardMarkup]]: Текст сообщения и клавиатура
+            перехода между страницами; None, если записей нет.
+    """
+    entries, has_newer, has_older = history_page(user, target_date, direction, key)
+    if not entries:
+        return None
+
+    title = (
+        f"История поиска за {target_date:%d.%m.%Y}" if target_date else "История поиска"
+    )
+    text = f"{title}:\n\n" + "\n".join(
+        format_history_entry(entry, DESCRIPTION_LIMIT) for entry in entries
+    )
+    if len(text) > MAX_MESSAGE_LENGTH:
+        text = text[: text.rfind("\n", 0, MAX_MESSAGE_LENGTH)]
+    keyboard = get_history_keyboard(
+        history_day(target_date),
+        newer=history_key(entries[0]) if has_newer else None,
+        older=history_key(entries[-1]) if has_older else None,
     )
+    return text, keyboard
+
+
+def send_history_page(
+    bot: TeleBot,
+    chat_id: int,
+    user: User,
+    target_date: Optional[date] = None,
+    direction: Optional[str] = None,
+    key: Optional[Tuple[int, int]] = None,
+    message_id: Optional[int] = None,
+) -> bool:
+    """
+    Отправляет страницу истории или заменяет ею текст сообщения.
+
+    Args:
+        bot (TeleBot): Экземпляр бота.
+        chat_id (int): ID чата.
+        user (User): Пользователь.
+        target_date (date, optional): Только записи за этот день.
+        direction (str, optional): Направление перехода от ключа.
+        key (Tuple[int, int], optional): Ключ крайней записи текущей страницы.
+        message_id (int, optional): ID сообщения с текущей страницей.
+
+    Returns:
+        bool: False, если записей нет.
+    """
+    page = history_page_message(user, target_date, direction, key)
+    if page is None:
+        return False
+    text, keyboard = page
+    if message_id is None:
+        bot.send_message(chat_id, text, reply_markup=keyboard)
+    else:
+        try:
+            bot.edit_message_text(text, chat_id, message_id, reply_markup=keyboard)
+        except ApiTelegramException as e:
+            logger.warning(f"Не удалось обновить страницу истории: {e}")
+    return True
 
 
 def register_history_handler(bot: TeleBot) -> None:
     """
-    Регистрирует обработчики команды /history  и состояния ожидания даты.
+    Регистрирует обработчики команды /history, состояния ожидания даты
+    и кнопок перехода между страницами истории.
     Позволяет запросить и вывести историю поисков.
 
     Args:
         bot (TeleBot): Экземпляр бота.
     """
 
-    @bot.message_handler(commands=['history'])
+    @router.command('history')
     def history_command(message: Message):
         bot.set_state(
             message.from_user.id,
@@ -123,43 +331,50 @@ def register_history_handler(bot: TeleBot) -> None:
             "Введите дату в формате дд.мм.гггг для фильтрации истории или 'все' для всей истории:",
         )
 
-    @bot.message_handler(state=MovieSearchStates.waiting_for_history_date)
-    def process_history_date(message: Message):
+    @router.state(MovieSearchStates.waiting_for_history_date)
+    def process_history_date(message: Message, user: User = None):
         user_id = message.from_user.id
-        text = message.text.strip().lower()
-        user, _ = User.get_or_create(user_id=str(user_id))
-
-        if text == 'все':
-            history = (
-                SearchHistory.select()
-                .where(SearchHistory.user == user)
-                .order_by(SearchHistory.timestamp.desc())
-            )
-        else:
-            try:
-                target_date = datetime.strptime(text, '%d.%m.%Y').date()
-            except ValueError:
-                bot.send_message(
-                    message.chat.id,
-                    "Неверный формат даты. Введите дату в формате дд.мм.гггг или 'все'. Попробуйте снова.",
-                )
-                return
-            history = (
-                SearchHistory.select()
-                .where(
-                    (SearchHistory.user == user)
-                    & (fn.DATE(SearchHistory.timestamp) == target_date)
-                )
-                .order_by(SearchHistory.timestamp.desc())
-            )
+        user = user or get_user(user_id)
+        history_writer.flush()
 
-        if not history.exists():
-            bot.send_message(message.chat.id, "По вашему запросу история пустая.")
-            bot.delete_state(user_id, message.chat.id)
+        try:
+            target_date = parse_history_date(message.text)
+        except ValueError:
+            bot.send_message(message.chat.id, HISTORY_DATE_MESSAGE)
             return
 
-        for entry in history.limit(10):
-            text = format_history_entry(entry)
-            bot.send_message(message.chat.id, text)  # Кнопки не добавляем
-
+        if not send_history_page(bot, message.chat.id, user, target_date):
+            bot.send_message(message.chat.id, "По вашему запросу история пустая.")
         bot.delete_state(user_id, message.chat.id)
+
+    @callback_router.action(HISTORY_PAGE)
+    def history_page_callback_handler(
+        call: CallbackQuery,
+        direction: str,
+        day: int,
+        timestamp: int,
+        entry_id: int,
+        user: User = None,
+    ):
+        user = user or get_user(call.from_user.id)
+        logger.info(f"Пользователь {call.from_user.id} листает историю поиска")
+        try:
+            shown = send_history_page(
+                bot,
+                call.message.chat.id,
+                user,
+                parse_history_day(day),
+                direction,
+                (timestamp, entry_id),
+                call.message.message_id,
+            )
+        except Exception as e:
+            logger.error(f"Ошибка при выводе страницы истории: {e}", exc_info=True)
+            bot.answer_callback_query(call.id, text="Ошибка. Попробуйте позже.")
+            return
+        # Новая страница уже видна после правки сообщения, поэтому callback
+        # подтверждается отдельным запросом только при ошибке
+        if not shown:
+            bot.answer_callback_query(
+                call.id, text="Записи удалены, повторите /history."
+            )
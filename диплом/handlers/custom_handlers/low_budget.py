@@ -3,39 +3,17 @@
 """
 
 from telebot.types import Message
-from api.kinopoisk_api import search_films_by_low_budget, search_films_by_high_budget
+from api.kinopoisk_api import (
+    LOW_BUDGET_MAX,
+    search_films_by_low_budget,
+    is_quota_exhausted,
+)
 from utils.logger_config import logger
 from .history import log_user_query
-from utils.misc.formatters import format_film_info, format_films_list
-from utils.misc.formatters import get_favorite_inline_keyboard
-from database import User, FavoriteMovie
-
-
-def send_film_with_fav_buttons(bot, chat_id: int, user_id: int, film: dict) -> None:
-    """
-    Отправляет информацию о фильме с кнопкой добавления/удаления из избранного.
-
-    Args:
-        bot: Экземпляр бота.
-        chat_id (int): ID чата пользователя.
-        user_id (int): ID пользователя.
-        film (dict): Словарь с данными фильма.
-    """
-    movie_id = film.get("id") or str(film.get("kinopoiskId", "unknown"))
-
-    user = User.get_or_none(user_id=str(user_id))
-    is_favorite = False
-    if user:
-        is_favorite = (
-            FavoriteMovie.select()
-            .where((FavoriteMovie.user == user) & (FavoriteMovie.movie_id == movie_id))
-            .exists()
-        )
-
-    reply_text = format_film_info(film)
-
-    keyboard = get_favorite_inline_keyboard(movie_id, is_favorite)
-    bot.send_message(chat_id, reply_text, reply_markup=keyboard)
+from .results import send_results
+from utils.misc.formatters import QUOTA_EXHAUSTED_MESSAGE
+from utils.misc.budget_args import BUDGET_USAGE, parse_budget_args
+from utils.router import router
 
 
 def error_handler_decorator(bot):
@@ -73,26 +51,41 @@ def error_handler_decorator(bot):
 
 def register_low_budget_handler(bot) -> None:
     """
-    Регистрирует обработчик команды /low_budget_movie.
+    Регистрирует обработчик команды /low_budget_movie [бюджет] [сортировка].
 
     Args:
         bot: Экземпляр Telegram бота
     """
     decorator = error_handler_decorator(bot)
 
-    @bot.message_handler(commands=["low_budget_movie"])
+    @router.command("low_budget_movie")
     @decorator(
         custom_error_msg="Ошибка при поиске фильмов с низким бюджетом. Попробуйте позже."
     )
     def send_low_budget_movies(message: Message):
+        try:
+            max_budget, sort_by = parse_budget_args(message.text)
+        except ValueError:
+            bot.send_message(
+                message.chat.id, BUDGET_USAGE.format(command="low_budget_movie")
+            )
+            return
         log_user_query(message.from_user.id, message.text)
-        films = search_films_by_low_budget()
+        sort_by = sort_by or "budget"
+        films = search_films_by_low_budget(
+            max_budget=max_budget or LOW_BUDGET_MAX,
+            sort_by=sort_by,
+            descending=sort_by != "budget",
+        )
         if films:
-            warning = (
-                "⚠️ На Кинопоиске отсутствуют точные данные о бюджете фильмов, "
-                "поэтому результаты могут содержать неточную информацию.\n\n"
+            send_results(
+                bot,
+                message.chat.id,
+                message.from_user.id,
+                "Фильмы с низким бюджетом",
+                films,
             )
-            reply = "Фильмы с низким бюджетом:\n\n" + format_films_list(films)
-            bot.send_message(message.chat.id, reply)
+        elif is_quota_exhausted():
+            bot.send_message(message.chat.id, QUOTA_EXHAUSTED_MESSAGE)
         else:
             bot.send_message(message.chat.id, "Фильмы с низким бюджетом не найдены.")
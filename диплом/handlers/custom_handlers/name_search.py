@@ -5,94 +5,18 @@
 
 from telebot import TeleBot
 from telebot.types import Message
-from api.kinopoisk_api import search_films_by_name
+from api.kinopoisk_api import search_films_by_name, is_quota_exhausted
 from .history import log_user_query
+from .results import send_film_with_fav_buttons
 from states import MovieSearchStates
 from utils.logger_config import logger
-from utils.misc.formatters import get_favorite_inline_keyboard
-from database import User, FavoriteMovie
-
-
-def format_genres(film: dict) -> str:
-    """
-    Форматирует список жанров фильма в строку через запятую.
-
-    Args:
-        film (dict): Информация о фильме.
-
-    Returns:
-         str: Строка с перечисленными жанрами.
-    """
-    genres_list = film.get('genres', [])
-    genres_names = [genre.get('name', '') for genre in genres_list]
-    return ', '.join(genres_names)
-
-
-def format_film_info(film: dict) -> str:
-    """
-    Форматирует подробную информацию о фильме для вывода.
-
-    Args:
-        film (dict):  Информация о фильме.
-
-    Returns:
-         str: Отформатированная строка с деталями фильма.
-    """
-    name = film.get('name') or film.get('alternativeName') or 'Название неизвестно'
-    description = film.get('description', '')
-    year = film.get('year', 'неизвестно')
-    rating_data = film.get('rating', {})
-    rating_kp = rating_data.get('kp')
-    rating_imdb = rating_data.get('imdb')
-    if rating_kp and rating_kp > 0:
-        rating = rating_kp
-    elif rating_imdb:
-        rating = rating_imdb
-    else:
-        rating = 'Нет данных'
-
-    genres = format_genres(film)
-    age_limit = film.get('ratingAgeLimits', {}).get('name', '—')
-    poster_url = film.get('poster', {}).get('url')
-
-    info = f'Название: {name}\n'
-    info += f'Описание: {description}\n'
-    info += f'Рейтинг: {rating}\n'
-    info += f'Год: {year}\n'
-    info += f'Жанр: {genres}\n'
-    info += f'Возрастной рейтинг: {age_limit}\n'
-    if poster_url:
-        info += f'Постер: {poster_url}\n'
-    return info
-
-
-def send_film_with_fav_buttons(
-    bot: TeleBot, chat_id: int, user_id: int, film: dict
-) -> None:
-    """
-    Отправляет подробную информацию о фильме с кнопкой добавления/удаления из избранного.
-
-    Args:
-        bot (TeleBot): Экземпляр Telegram бота.
-        chat_id (int):ID чата для отправки сообщения.
-        user_id (int): ID пользователя.
-        film (dict): Данные фильма
-    """
-    movie_id = film.get("id") or str(film.get("kinopoiskId", "unknown"))
-
-    user = User.get_or_none(user_id=str(user_id))
-    is_favorite = False
-    if user:
-        is_favorite = (
-            FavoriteMovie.select()
-            .where((FavoriteMovie.user == user) & (FavoriteMovie.movie_id == movie_id))
-            .exists()
-        )
-
-    reply_text = format_film_info(film)
-
-    keyboard = get_favorite_inline_keyboard(movie_id, is_favorite)
-    bot.send_message(chat_id, reply_text, reply_markup=keyboard)
+from utils.router import router
+from utils.misc.formatters import QUOTA_EXHAUSTED_MESSAGE
+from utils.misc.user_input import (
+    DIGITS_NAME_MESSAGE,
+    EMPTY_NAME_MESSAGE,
+    check_text_input,
+)
 
 
 def error_handler_decorator(bot: TeleBot):
@@ -120,16 +44,11 @@ def error_handler_decorator(bot: TeleBot):
                 logger.info(
                     f'Проверка ввода названия фильма: "{input_text}" от пользователя {message.from_user.id}'
                 )
-                if not input_text:
-                    bot.send_message(
-                        message.chat.id, 'Пожалуйста, введите название фильма.'
-                    )
-                    return
-                if input_text.isdigit():
-                    bot.send_message(
-                        message.chat.id,
-                        'Название не может состоять только из цифр. Попробуйте снова.',
-                    )
+                error = check_text_input(
+                    input_text, EMPTY_NAME_MESSAGE, DIGITS_NAME_MESSAGE
+                )
+                if error:
+                    bot.send_message(message.chat.id, error)
                     return
                 return func(message, *args, **kwargs)
             except Exception as e:
@@ -154,7 +73,7 @@ def register_name_search(bot: TeleBot) -> None:
 
     decorator = error_handler_decorator(bot)
 
-    @bot.message_handler(commands=['movie_search'])
+    @router.command('movie_search')
     @decorator(
         custom_error_msg='Ошибка при обработке команды поиска. Попробуйте позже.'
     )
@@ -166,7 +85,7 @@ def register_name_search(bot: TeleBot) -> None:
         )
         bot.send_message(message.chat.id, 'Введите название фильма:')
 
-    @bot.message_handler(state=MovieSearchStates.waiting_for_name)
+    @router.state(MovieSearchStates.waiting_for_name)
     @decorator(custom_error_msg='Ошибка при поиске фильма. Попробуйте еще раз.')
     def process_movie_name_step(message: Message):
         movie_name = message.text.strip()
@@ -187,13 +106,12 @@ def register_name_search(bot: TeleBot) -> None:
             log_user_query(
                 message.from_user.id, movie_name, command='/movie_search', film=films[0]
             )
-            reply = f'Результаты поиска по названию "{movie_name}":\n\n'
-            for film in films[:1]:
-                reply += format_film_info(film) + '\n---\n'
             send_film_with_fav_buttons(
                 bot, message.chat.id, message.from_user.id, films[0]
             )
             bot.delete_state(message.from_user.id, message.chat.id)
+        elif is_quota_exhausted():
+            bot.send_message(message.chat.id, QUOTA_EXHAUSTED_MESSAGE)
         else:
             bot.send_message(
                 message.chat.id,
@@ -0,0 +1,159 @@
+"""
+Постраничный вывод результатов поиска фильмов по жанру и рейтингу.
+Под страницей - кнопки избранного для каждого фильма и кнопки "Назад" и "Далее".
+Пока пользователь читает страницу, следующая загружается в кэш в фоне.
+"""
+
+from typing import Optional, Tuple
+
+from telebot import TeleBot
+from telebot.apihelper import ApiTelegramException
+from telebot.types import CallbackQuery, InlineKeyboardMarkup
+
+from api.kinopoisk_api import get_genre_page, get_rating_page, prefetch, SOURCE_API
+from config_data.config import CURSOR_MAX_ENTRIES, CURSOR_TTL, RESULTS_PAGE_SIZE
+from keyboards.inline import get_pagination_keyboard
+from utils.callbacks import RESULTS_PAGE
+from utils.logger_config import logger
+from utils.misc.cursors import CursorStore
+from utils.router import callback_router
+from .results import results_message
+
+# Функции получения страницы результатов для каждого вида поиска
+PAGE_SOURCES = {"genre": get_genre_page, "rating": get_rating_page}
+
+PAGE_TITLES = {
+    "genre": "Фильмы жанра '{query}'",
+    "rating": "Фильмы с рейтингом IMDB от {query}",
+}
+
+cursors = CursorStore(max_entries=CURSOR_MAX_ENTRIES, ttl=CURSOR_TTL)
+
+
+def results_page_message(
+    user_id: int, token: str, cursor: dict, result: dict
+) -> Tuple[str, InlineKeyboardMarkup]:
+    """
+    Готовит сообщение со страницей результатов поиска: фильмы, кнопки
+    избранного для каждого из них и кнопки перехода между страницами.
+
+    Args:
+        user_id (int): ID пользователя.
+        token (str): Токен курсора поиска.
+        cursor (dict): Курсор поиска.
+        result (dict): Страница результатов поиска.
+
+    Returns:
+        Tuple[str, InlineKeyboardMarkup]: Текст сообщения и клавиатура.
+    """
+    page = result["page"]
+    title = PAGE_TITLES[cursor["kind"]].format(query=cursor["query"])
+    text, keyboard = results_message(
+        user_id,
+        f"{title} (страница {page})",
+        result["docs"],
+        start=(page - 1) * RESULTS_PAGE_SIZE + 1,
+    )
+    return text, get_pagination_keyboard(token, page, result["has_next"], keyboard)
+
+
+def send_results_page(
+    bot: TeleBot,
+    chat_id: int,
+    user_id: int,
+    token: str,
+    page: int,
+    message_id: Optional[int] = None,
+) -> bool:
+    """
+    Отправляет страницу результатов поиска или заменяет ею текст сообщения
+    и запускает фоновую загрузку следующей страницы.
+
+    Args:
+        bot (TeleBot): Экземпляр бота.
+        chat_id (int): ID чата.
+        user_id (int): ID пользователя.
+        token (str): Токен курсора поиска.
+        page (int): Номер страницы.
+        message_id (int, optional): ID сообщения с предыдущей страницей.
+
+    Returns:
+        bool: False, если курсор истёк или страница пуста.
+    """
+    cursor = cursors.get(token)
+    if cursor is None:
+        return False
+    get_page = PAGE_SOURCES[cursor["kind"]]
+    result = get_page(cursor["query"], page, RESULTS_PAGE_SIZE, cursor.get("source"))
+    if not result["docs"]:
+        return False
+    # Следующие страницы берутся из того же источника, что и первая
+    cursor.setdefault("source", result["source"])
+
+    text, keyboard = results_page_message(user_id, token, cursor, result)
+    if message_id is None:
+        bot.send_message(chat_id, text, reply_markup=keyboard)
+    else:
+        try:
+            bot.edit_message_text(text, chat_id, message_id, reply_markup=keyboard)
+        except ApiTelegramException as e:
+            # Повторное нажатие той же кнопки не меняет текст сообщения
+            logger.warning(f"Не удалось обновить страницу результатов: {e}")
+
+    if result["has_next"] and result["source"] == SOURCE_API:
+        prefetch(get_page, cursor["query"], page + 1, RESULTS_PAGE_SIZE, SOURCE_API)
+    return True
+
+
+def start_paginated_search(
+    bot: TeleBot, chat_id: int, user_id: int, kind: str, query
+) -> bool:
+    """
+    Создаёт курсор поиска и отправляет первую страницу результатов.
+
+    Args:
+        bot (TeleBot): Экземпляр бота.
+        chat_id (int): ID чата.
+        user_id (int): ID пользователя.
+        kind (str): Вид поиска: "genre" или "rating".
+        query: Параметр поиска: жанр или минимальный рейтинг.
+
+    Returns:
+        bool: True, если найден хотя бы один фильм.
+    """
+    token = cursors.put({"kind": kind, "query": query})
+    return send_results_page(bot, chat_id, user_id, token, 1)
+
+
+def register_pagination_handler(bot: TeleBot) -> None:
+    """
+    Регистрирует обработчик кнопок перехода между страницами результатов.
+
+    Args:
+        bot (TeleBot): Экземпляр бота.
+    """
+
+    @callback_router.action(RESULTS_PAGE)
+    def page_callback_handler(call: CallbackQuery, token: str, page: int):
+        logger.info(
+            f"Пользователь {call.from_user.id} открыл страницу {page} результатов"
+        )
+        try:
+            shown = send_results_page(
+                bot,
+                call.message.chat.id,
+                call.from_user.id,
+                token,
+                page,
+                call.message.message_id,
+            )
+        except Exception as e:
+            logger.error(f"Ошибка при выводе страницы результатов: {e}", exc_info=True)
+            bot.answer_callback_query(call.id, text="Ошибка. Попробуйте позже.")
+            return
+        if shown:
+            bot.answer_callback_query(call.id)
+        else:
+            bot.answer_callback_query(
+                call.id, text="Результаты устарели, повторите поиск."
+            )
@@ -0,0 +1,137 @@
+"""
+Вывод найденных фильмов с кнопками добавления и удаления из избранного.
+Список фильмов отправляется одним сообщением, под которым для каждого фильма
+есть строка с кнопкой избранного.
+"""
+
+from typing import List, Tuple
+
+from telebot import TeleBot
+from telebot.types import InlineKeyboardMarkup
+
+from database.favorites import get_favorite_movie_ids
+from utils.misc.formatters import (
+    MAX_MESSAGE_LENGTH,
+    favorite_button,
+    format_film_info,
+    get_favorite_inline_keyboard,
+)
+
+# Длина названия фильма в подписи кнопки
+BUTTON_TITLE_LENGTH = 40
+
+
+def film_movie_id(film: dict) -> str:
+    """
+    Возвращает ID фильма из ответа API для кнопок избранного.
+
+    Args:
+        film (dict): Словарь с данными фильма.
+
+    Returns:
+        str: ID фильма.
+    """
+    return str(film.get("id") or film.get("kinopoiskId", "unknown"))
+
+
+def film_label(number: int, film: dict) -> str:
+    """
+    Возвращает подпись фильма в кнопке избранного: номер и название.
+
+    Args:
+        number (int): Номер фильма в списке.
+        film (dict): Словарь с данными фильма.
+
+    Returns:
+        str: Подпись, например "1. Амели".
+    """
+    name = film.get("name") or film.get("alternativeName") or "Название неизвестно"
+    if len(name) > BUTTON_TITLE_LENGTH:
+        name = name[: BUTTON_TITLE_LENGTH - 1] + "…"
+    return f"{number}. {name}"
+
+
+def results_message(
+    user_id: int, title: str, films: List[dict], start: int = 1
+) -> Tuple[str, InlineKeyboardMarkup]:
+    """
+    Готовит одно сообщение со списком фильмов и клавиатуру, в которой
+    для каждого фильма есть кнопка добавления/удаления из избранного.
+    Статус избранного определяется для всех фильмов одним запросом к базе.
+    Фильмы, не поместившиеся в лимит длины сообщения, не выводятся.
+
+    Args:
+        user_id (int): ID пользователя.
+        title (str): Заголовок списка.
+        films (List[dict]): Найденные фильмы.
+        start (int): Номер первого фильма в списке.
+
+    Returns:
+        Tuple[str, InlineKeyboardMarkup]: Текст сообщения и клавиатура.
+    """
+    text = f"{title}:\n\n"
+    shown = []
+    for number, film in enumerate(films, start):
+        entry = ("\n---\n" if shown else "") + f"{number}. {format_film_info(film)}"
+        if shown and len(text) + len(entry) > MAX_MESSAGE_LENGTH:
+            break
+        text += entry
+        shown.append((number, film))
+
+    movie_ids = [film_movie_id(film) for _, film in shown]
+    favorites = get_favorite_movie_ids(user_id, movie_ids)
+    keyboard = InlineKeyboardMarkup(row_width=1)
+    for (number, film), movie_id in zip(shown, movie_ids):
+        keyboard.row(
+            favorite_button(movie_id, movie_id in favorites, film_label(number, film))
+        )
+    return text[:MAX_MESSAGE_LENGTH], keyboard
+
+
+def send_results(
+    bot: TeleBot, chat_id: int, user_id: int, title: str, films: List[dict]
+) -> None:
+    """
+    Отправляет список фильмов одним сообщением с кнопками избранного.
+
+    Args:
+        bot (TeleBot): Экземпляр бота.
+        chat_id (int): ID чата пользователя.
+        user_id (int): ID пользователя.
+        title (str): Заголовок списка.
+        films (List[dict]): Фильмы для отправки.
+    """
+    text, keyboard = results_message(user_id, title, films)
+    bot.send_message(chat_id, text, reply_markup=keyboard)
+
+
+def film_message(user_id: int, film: dict) -> Tuple[str, InlineKeyboardMarkup]:
+    """
+    Готовит сообщение об одном фильме с кнопкой добавления/удаления из избранного.
+
+    Args:
+        user_id (int): ID пользователя.
+        film (dict): Словарь с данными фильма.
+
+    Returns:
+        Tuple[str, InlineKeyboardMarkup]: Текст сообщения и клавиатура.
+    """
+    movie_id = film_movie_id(film)
+    is_favorite = movie_id in get_favorite_movie_ids(user_id, [movie_id])
+    return format_film_info(film), get_favorite_inline_keyboard(movie_id, is_favorite)
+
+
+def send_film_with_fav_buttons(
+    bot: TeleBot, chat_id: int, user_id: int, film: dict
+) -> None:
+    """
+    Отправляет информацию о фильме с кнопкой добавления/удаления из избранного.
+
+    Args:
+        bot (TeleBot): Экземпляр бота.
+        chat_id (int): ID чата пользователя.
+        user_id (int): ID пользователя.
+        film (dict): Словарь с данными фильма.
+    """
+    text, keyboard = film_message(user_id, film)
+    bot.send_message(chat_id, text, reply_markup=keyboard)
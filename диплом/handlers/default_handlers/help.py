@@ -1,33 +1,38 @@
 """
-Обработчики основных команд бота и клавиатурных нажатий.
+Обработчик команды /help и кнопки "Помощь".
 """
 
 from telebot import TeleBot
 from keyboards.inline import get_main_inline_keyboard
 from utils.logger_config import logger
+from utils.router import router
+
+HELP_TEXT = (
+    "Доступные команды:\n"
+    "/moviesearch - Поиск фильма по названию через Kinopoisk\n"
+    "/movie_by_rating - Поиск фильмов по рейтингу\n"
+    "/movie_by_genre - Поиск фильма по жанру\n"
+    "/low_budget_movie [макс. бюджет] [budget|rating|year] - "
+    "Фильмы с низким бюджетом\n"
+    "/high_budget_movie [мин. бюджет] [budget|rating|year] - "
+    "Фильмы с высоким бюджетом\n"
+    "/history - История запросов\n"
+    "/help - Вывод этого сообщения\n\n"
+    "Выберите команду с помощью кнопок ниже."
+)
 
 
 def register_help_handler(bot: TeleBot) -> None:
     """
-    Регистрирует обработчики команд /start, /stop, /help и обработку нажатий текстовых кнопок.
+    Регистрирует обработчик команды /help и кнопки "Помощь".
 
     Args:
         bot (TeleBot): Экземпляр Telegram бота.
     """
 
-    @bot.message_handler(commands=["help"])
+    @router.command("help")
+    @router.text("Помощь")
     def help_command(message):
         logger.info(f"Пользователь {message.from_user.id} вызвал команду /help")
-        help_text = (
-            "Доступные команды:\n"
-            "/moviesearch - Поиск фильма по названию через Kinopoisk\n"
-            "/movie_by_rating - Поиск фильмов по рейтингу\n"
-            "/movie_by_genre - Поиск фильма по жанру\n"
-            "/low_budget_movie - Фильмы с низким бюджетом\n"
-            "/high_budget_movie - Фильмы с высоким бюджетом\n"
-            "/history - История запросов\n"
-            "/help - Вывод этого сообщения\n\n"
-            "Выберите команду с помощью кнопок ниже."
-        )
         inline_kb = get_main_inline_keyboard()
-        bot.send_message(message.chat.id, help_text, reply_markup=inline_kb)
+        bot.send_message(message.chat.id, HELP_TEXT, reply_markup=inline_kb)
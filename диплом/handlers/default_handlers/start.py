@@ -1,34 +1,50 @@
 """
-Обработчик команды /start для приветствия пользователя и начала взаимодействия с ботом.
+Обработчик команды /start и кнопки "Старт" для приветствия пользователя
+и начала взаимодействия с ботом.
 """
 
 from telebot import TeleBot
 from keyboards.inline import get_main_inline_keyboard
+from keyboards.reply import get_main_reply_keyboard
 from utils.logger_config import logger
+from utils.router import router
+from .stop import user_active_status
+
+WELCOME_TEXT = (
+    "Привет! Я бот для поиска фильмов.\n"
+    "Используйте клавиатуру или /help для просмотра команд.\n"
+    "Команда /tmdb_search позволяет искать фильмы через TMDB."
+)
+
+# Сообщение, с которым отправляется reply-клавиатура "Старт", "Стоп", "Помощь"
+STARTED_TEXT = "Бот запущен! Используйте кнопки для управления."
 
 
 def register_start_handler(bot: TeleBot) -> None:
     """
-    Регистрирует обработчик команды /start, отправляющий приветственное сообщение с клавиатурой.
+    Регистрирует обработчик команды /start и кнопки "Старт", отправляющий
+    reply-клавиатуру и приветственное сообщение с инлайн клавиатурой.
 
     Args:
         bot (TeleBot): Экземпляр Telegram бота.
     """
 
-    @bot.message_handler(commands=["start"])
+    @router.command("start", "Старт")
+    @router.text("Старт")
     def start_command(message):
         """
         Обработка команды /start.
-        Отправляет пользователю приветственное сообщение и инлайн клавиатуру.
+        Возобновляет обработку команд пользователя, если он её останавливал,
+        отправляет reply-клавиатуру, приветственное сообщение и инлайн
+        клавиатуру.
 
         Args:
             message (telebot.types.Message): Сообщение Telegram от пользователя.
         """
         logger.info(f"Пользователь {message.from_user.id} вызвал команду /start")
-        welcome_text = (
-            "Привет! Я бот для поиска фильмов.\n"
-            "Используйте клавиатуру или /help для просмотра команд.\n"
-            "Команда /tmdb_search позволяет искать фильмы через TMDB."
+        user_active_status[message.from_user.id] = True
+        bot.send_message(
+            message.chat.id, STARTED_TEXT, reply_markup=get_main_reply_keyboard()
         )
         keyboard = get_main_inline_keyboard()
-        bot.send_message(message.chat.id, welcome_text, reply_markup=keyboard)
+        bot.send_message(message.chat.id, WELCOME_TEXT, reply_markup=keyboard)
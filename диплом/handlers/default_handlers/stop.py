@@ -1,8 +1,9 @@
 """
-Обработчики команд /stop и /start для управления статусом активности пользователя.
+Обработчик команды /stop и кнопки "Стоп" для управления статусом активности пользователя.
 """
 from telebot import TeleBot
 from telebot.types import Message
+from utils.router import router
 
 #Словарь состояния активности пользователя: True - активен, False - остановлен
 user_active_status = {}
@@ -10,13 +11,15 @@ user_active_status = {}
 
 def register_stop_handler(bot: TeleBot) -> None:
     """
-    Регистрирует обработчики команд /stop и /start,
+    Регистрирует обработчик команды /stop и кнопки "Стоп",
     управляя статусом активности пользователя и состояниями бота.
+    Команду /start обрабатывает start.py.
 
     Args:
         bot (TeleBot): Экземпляр Telegram бота.
     """
-    @bot.message_handler(commands=["stop", "Стоп"])
+    @router.command("stop", "Стоп")
+    @router.text("Стоп")
     def handle_stop(message: Message) -> None:
         """
         Обработчик команды /stop.
@@ -31,18 +34,6 @@ def register_stop_handler(bot: TeleBot) -> None:
             message.chat.id, "Обработка остановлена. Для возобновления нажмите /start."
         )
 
-    @bot.message_handler(commands=["start", "Старт"])
-    def handle_start(message: Message) -> None:
-        """
-        Обработчик команды /start.
-        Устанавливает пользователя как активного и отправляет приветственное сообщение.
-
-        Args:
-            message (Message): Telegram сообщение пользователя.
-        """
-        user_active_status[message.from_user.id] = True
-        bot.send_message(message.chat.id, "Бот запущен, отправляйте команды.")
-
     def user_is_active(func):
         """
         Декоратор, позволяющий выполнять обработчик только если пользователь активен.
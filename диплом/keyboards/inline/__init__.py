@@ -2,8 +2,24 @@
 Inline-клавиатуры для Telegram бота.
 """
 
+from typing import Optional, Tuple
+
 from telebot.types import InlineKeyboardMarkup, InlineKeyboardButton
 
+from utils.callbacks import (
+    HISTORY_PAGE,
+    MENU_FAVORITES,
+    MENU_GENRE,
+    MENU_HIGH_BUDGET,
+    MENU_HISTORY,
+    MENU_LOW_BUDGET,
+    MENU_NAME_SEARCH,
+    MENU_RATING,
+    NEWER,
+    OLDER,
+    RESULTS_PAGE,
+)
+
 
 def get_main_inline_keyboard():
     """
@@ -14,12 +30,93 @@ def get_main_inline_keyboard():
     """
     keyboard = InlineKeyboardMarkup(row_width=2)
     keyboard.add(
-        InlineKeyboardButton("Поиск по названию", callback_data="movie_search"),
-        InlineKeyboardButton("Поиск по рейтингу", callback_data="movie_by_rating"),
-        InlineKeyboardButton("Поиск по жанру", callback_data="movie_by_genre"),
-        InlineKeyboardButton("Низкий бюджет", callback_data="low_budget_movie"),
-        InlineKeyboardButton("Высокий бюджет", callback_data="high_budget_movie"),
-        InlineKeyboardButton("История", callback_data="history"),
-        InlineKeyboardButton("Просмотр избранного", callback_data="show_favorites"),
+        InlineKeyboardButton(
+            "Поиск по названию", callback_data=MENU_NAME_SEARCH.pack()
+        ),
+        InlineKeyboardButton("Поиск по рейтингу", callback_data=MENU_RATING.pack()),
+        InlineKeyboardButton("Поиск по жанру", callback_data=MENU_GENRE.pack()),
+        InlineKeyboardButton("Низкий бюджет", callback_data=MENU_LOW_BUDGET.pack()),
+        InlineKeyboardButton("Высокий бюджет", callback_data=MENU_HIGH_BUDGET.pack()),
+        InlineKeyboardButton("История", callback_data=MENU_HISTORY.pack()),
+        InlineKeyboardButton(
+            "Просмотр избранного", callback_data=MENU_FAVORITES.pack()
+        ),
     )
     return keyboard
+
+
+def get_pagination_keyboard(
+    token: str,
+    page: int,
+    has_next: bool,
+    keyboard: Optional[InlineKeyboardMarkup] = None,
+):
+    """
+    Возвращает клавиатуру перехода между страницами результатов поиска.
+
+    Args:
+        token (str): Токен курсора поиска.
+        page (int): Номер текущей страницы.
+        has_next (bool): Есть ли следующая страница.
+        keyboard (InlineKeyboardMarkup, optional): Клавиатура страницы,
+            в конец которой добавляются кнопки перехода.
+
+    Returns:
+        InlineKeyboardMarkup: Клавиатура с кнопками "Назад" и "Далее".
+    """
+    keyboard = keyboard or InlineKeyboardMarkup(row_width=2)
+    buttons = []
+    if page > 1:
+        buttons.append(
+            InlineKeyboardButton(
+                "◀ Назад", callback_data=RESULTS_PAGE.pack(token, page - 1)
+            )
+        )
+    if has_next:
+        buttons.append(
+            InlineKeyboardButton(
+                "Далее ▶", callback_data=RESULTS_PAGE.pack(token, page + 1)
+            )
+        )
+    if buttons:
+        keyboard.row(*buttons)
+    return keyboard
+
+
+def get_history_keyboard(
+    day: int,
+    newer: Optional[Tuple[int, int]] = None,
+    older: Optional[Tuple[int, int]] = None,
+):
+    """
+    Возвращает клавиатуру перехода между страницами истории поиска.
+    Кнопки хранят в callback_data день и ключ крайней записи страницы,
+    от которой выбирается соседняя страница.
+
+    Args:
+        day (int): День числом ГГГГММДД или 0 для всей истории.
+        newer (Tuple[int, int], optional): Ключ первой записи, если есть
+            записи новее.
+        older (Tuple[int, int], optional): Ключ последней записи, если есть
+            записи старее.
+
+    Returns:
+        InlineKeyboardMarkup: Клавиатура с кнопками "Назад" и "Далее".
+    """
+    keyboard = InlineKeyboardMarkup(row_width=2)
+    buttons = []
+    if newer:
+        buttons.append(
+            InlineKeyboardButton(
+                "◀ Назад", callback_data=HISTORY_PAGE.pack(NEWER, day, *newer)
+            )
+        )
+    if older:
+        buttons.append(
+            InlineKeyboardButton(
+                "Далее ▶", callback_data=HISTORY_PAGE.pack(OLDER, day, *older)
+            )
+        )
+    if buttons:
+        keyboard.row(*buttons)
+    return keyboard
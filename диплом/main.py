@@ -3,21 +3,54 @@
 Инициализация, регистрация обработчиков, запуск polling.
 """
 
+import signal
+import threading
 import telebot
-from telebot.storage import StateMemoryStorage
 from telebot import custom_filters
-from config_data.config import BOT_TOKEN
+from config_data.config import BOT_TOKEN, WARMER_ENABLED, RETENTION_ENABLED
 from database import initialize_db
 from handlers.default_handlers import register_default_handlers
 from handlers.custom_handlers import register_custom_handlers
 from handlers.custom_handlers.callback import register_callback_handlers
+from api.cache_warmer import cache_warmer
+from database.history_writer import history_writer
+from database.retention import history_retention
 from utils.logger_config import logger
+from utils.middlewares import DatabaseMiddleware, UserMiddleware
+from utils.router import callback_router, router
+from utils.state_storage import SQLiteStateStorage
 import time
 
-state_storage = StateMemoryStorage()
-bot = telebot.TeleBot(BOT_TOKEN, state_storage=state_storage)
+state_storage = SQLiteStateStorage()
+bot = telebot.TeleBot(
+    BOT_TOKEN, state_storage=state_storage, use_class_middlewares=True
+)
 
 bot.add_custom_filter(custom_filters.StateFilter(bot))
+bot.setup_middleware(DatabaseMiddleware())
+bot.setup_middleware(UserMiddleware())
+
+# Устанавливается при остановке бота, чтобы цикл polling не перезапускался
+stopping = threading.Event()
+
+
+def handle_sigterm(signum, frame) -> None:
+    """
+    Останавливает polling по SIGTERM (docker stop, systemctl stop).
+    Python не вызывает atexit при завершении по сигналу, поэтому очередь
+    истории сохраняется в shutdown() после выхода из цикла polling.
+    """
+    logger.info("Получен SIGTERM, остановка бота.")
+    stopping.set()
+    bot.stop_polling()
+
+
+def shutdown() -> None:
+    """Останавливает фоновые потоки и сохраняет очередь истории запросов."""
+    cache_warmer.stop()
+    history_retention.stop()
+    history_writer.close()
+    logger.info("Бот остановлен.")
 
 
 def main():
@@ -33,15 +66,30 @@ def main():
 
     register_default_handlers(bot)
     register_custom_handlers(bot)
+    # Команды, кнопки и ввод в состояниях обрабатываются через маршрутизатор
+    router.setup(bot)
+    # Нажатия inline-кнопок выбираются по коду действия из callback_data
     register_callback_handlers(bot)
+    callback_router.setup(bot)
+
+    if WARMER_ENABLED:
+        cache_warmer.start()
+    if RETENTION_ENABLED:
+        history_retention.start()
 
-    while True:
-        try:
-            bot.infinity_polling(timeout=60, long_polling_timeout=60, skip_pending=True)
-        except Exception as e:
-            logger.error(f"Ошибка в основном цикле бота: {e}", exc_info=True)
-            print(f"Ошибка: {e}")
-            time.sleep(5)
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    try:
+        while not stopping.is_set():
+            try:
+                bot.infinity_polling(
+                    timeout=60, long_polling_timeout=60, skip_pending=True
+                )
+            except Exception as e:
+                logger.error(f"Ошибка в основном цикле бота: {e}", exc_info=True)
+                print(f"Ошибка: {e}")
+                time.sleep(5)
+    finally:
+        shutdown()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,66 @@
+"""
+Запуск Telegram бота в асинхронном режиме на AsyncTeleBot.
+Все обработчики выполняются в одном цикле событий asyncio,
+запросы к API Кинопоиска - через неблокирующий клиент aiohttp.
+"""
+
+import asyncio
+import signal
+from telebot.async_telebot import AsyncTeleBot
+from telebot import asyncio_filters
+from config_data.config import BOT_TOKEN, WARMER_ENABLED, RETENTION_ENABLED
+from database import initialize_db
+from handlers.async_handlers import register_async_handlers
+from api.async_kinopoisk_api import close_session
+from api.cache_warmer import cache_warmer
+from database.history_writer import history_writer
+from database.retention import history_retention
+from utils.logger_config import logger
+from utils.middlewares import AsyncUserMiddleware
+from utils.state_storage import AsyncSQLiteStateStorage
+
+state_storage = AsyncSQLiteStateStorage()
+bot = AsyncTeleBot(BOT_TOKEN, state_storage=state_storage)
+
+bot.add_custom_filter(asyncio_filters.StateFilter(bot))
+bot.setup_middleware(AsyncUserMiddleware())
+
+
+async def main():
+    """
+    Главная функция асинхронного запуска бота.
+    Подключает базу, регистрирует обработчики и запускает polling.
+    """
+    print("Бот запущен в асинхронном режиме...")
+    logger.info("Запуск бота в асинхронном режиме.")
+
+    initialize_db()
+    register_async_handlers(bot)
+    if WARMER_ENABLED:
+        cache_warmer.start()
+    if RETENTION_ENABLED:
+        history_retention.start()
+
+    polling = asyncio.ensure_future(bot.infinity_polling(timeout=60, skip_pending=True))
+    try:
+        # SIGTERM (docker stop, systemctl stop) останавливает polling, чтобы
+        # сохранить очередь истории: atexit при завершении по сигналу не вызывается
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, polling.cancel)
+    except NotImplementedError:
+        # Обработчики сигналов цикла событий недоступны в Windows
+        pass
+    try:
+        await polling
+    except asyncio.CancelledError:
+        logger.info("Получен SIGTERM, остановка бота.")
+    finally:
+        cache_warmer.stop()
+        history_retention.stop()
+        await asyncio.to_thread(history_writer.close)
+        await close_session()
+        await bot.close_session()
+        logger.info("Бот остановлен.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,41 @@
+"""
+Общие настройки тестов.
+База данных бота, кэш ответов API и состояние квоты создаются во временном
+каталоге, чтобы тесты не затрагивали рабочие файлы бота. Переменные окружения
+задаются до импорта модулей проекта: config_data.config читает их при импорте.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+_TMP_DIR = tempfile.mkdtemp(prefix="movies_bot_tests_")
+os.environ["DB_PATH"] = os.path.join(_TMP_DIR, "movies_bot.db")
+os.environ["API_CACHE_DB_PATH"] = os.path.join(_TMP_DIR, "kinopoisk_cache.db")
+os.environ["API_QUOTA_STATE_PATH"] = os.path.join(_TMP_DIR, "kinopoisk_quota.json")
+os.environ.setdefault("BOT_TOKEN", "0:test")
+
+from database import connection, db, initialize_db  # noqa: E402
+from database.migrations import MODELS  # noqa: E402
+
+
+def _clear_tables() -> None:
+    with connection():
+        for model in reversed(MODELS):
+            model.delete().execute()
+
+
+@pytest.fixture(scope="session")
+def database():
+    """База данных бота с текущей схемой."""
+    initialize_db()
+    return db
+
+
+@pytest.fixture
+def clean_db(database):
+    """Пустые таблицы бота на время теста."""
+    _clear_tables()
+    yield database
+    _clear_tables()
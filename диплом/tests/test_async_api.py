@@ -0,0 +1,118 @@
+"""
+Тесты асинхронного клиента API: ошибки aiohttp и повреждённый JSON в ответе
+повторяются и приводят к тому же резервному ответу, что и у синхронного клиента.
+"""
+
+import asyncio
+
+import aiohttp
+import pytest
+
+from api import async_kinopoisk_api as async_api
+from api.rate_limit import DailyQuota
+from api.resilience import CircuitBreaker
+
+
+class FailingSession:
+    """HTTP-сессия, каждый запрос которой падает с заданной ошибкой."""
+
+    def __init__(self, error: Exception) -> None:
+        self.error = error
+        self.calls = 0
+
+    def get(self, url, params=None):
+        self.calls += 1
+        raise self.error
+
+
+class BrokenJsonResponse:
+    """Ответ со статусом 200, тело которого не разбирается как JSON."""
+
+    status = 200
+    headers = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def text(self):
+        return '{"docs": ['
+
+
+class BrokenJsonSession(FailingSession):
+    """HTTP-сессия, каждый запрос которой возвращает повреждённый JSON."""
+
+    def __init__(self) -> None:
+        super().__init__(None)
+
+    def get(self, url, params=None):
+        self.calls += 1
+        return BrokenJsonResponse()
+
+
+def use_session(monkeypatch, tmp_path, session):
+    """Подменяет сессию, паузы между повторами, выключатель и квоту API."""
+
+    async def get_session():
+        return session
+
+    async def no_sleep(delay):
+        pass
+
+    monkeypatch.setattr(async_api, "get_session", get_session)
+    monkeypatch.setattr(async_api.asyncio, "sleep", no_sleep)
+    monkeypatch.setattr(async_api, "circuit_breaker", CircuitBreaker(min_calls=100))
+    monkeypatch.setattr(
+        async_api, "api_quota", DailyQuota(str(tmp_path / "quota.json"), 100)
+    )
+    return session
+
+
+@pytest.fixture
+def failing_session(monkeypatch, tmp_path):
+    return use_session(
+        monkeypatch,
+        tmp_path,
+        FailingSession(aiohttp.ClientPayloadError("Response payload is not completed")),
+    )
+
+
+@pytest.fixture
+def broken_json_session(monkeypatch, tmp_path):
+    return use_session(monkeypatch, tmp_path, BrokenJsonSession())
+
+
+def test_client_error_is_retried(failing_session):
+    data = asyncio.run(
+        async_api._request_api(
+            "movie", "/v1.4/movie/1", None, {"path": "/v1.4/movie/1"}
+        )
+    )
+    assert data is None
+    assert failing_session.calls == async_api.API_MAX_RETRIES + 1
+    assert async_api.circuit_breaker.stats()["failures"] == failing_session.calls
+
+
+def test_client_error_falls_back_to_stale_cache(failing_session, monkeypatch):
+    stale = {"id": 1, "name": "Фильм из кэша"}
+    monkeypatch.setattr(
+        async_api.disk_cache, "get_with_ttl", lambda *args: (None, None)
+    )
+    monkeypatch.setattr(async_api.disk_cache, "get_stale", lambda *args: stale)
+
+    data = asyncio.run(async_api.fetch_json("movie", "/v1.4/movie/2"))
+    assert data == stale
+
+
+def test_broken_json_is_retried(broken_json_session):
+    data = asyncio.run(
+        async_api._request_api(
+            "movie", "/v1.4/movie/3", None, {"path": "/v1.4/movie/3"}
+        )
+    )
+    assert data is None
+    assert broken_json_session.calls == async_api.API_MAX_RETRIES + 1
+    stats = async_api.circuit_breaker.stats()
+    assert stats["calls"] == stats["failures"] == broken_json_session.calls
@@ -0,0 +1,107 @@
+"""
+Тесты формата callback_data: запись и чтение аргументов действий, лимит
+Telegram в 64 байта и разбор кнопок другой версии или с повреждёнными данными.
+"""
+
+import pytest
+
+from utils.callbacks import (
+    ACTIONS,
+    ADD_FAVORITE,
+    HISTORY_PAGE,
+    MAX_CALLBACK_DATA,
+    MENU_FAVORITES,
+    NEWER,
+    OLDER,
+    REMOVE_FAVORITE,
+    RESULTS_PAGE,
+    CallbackAction,
+    TEXT,
+    parse_callback,
+    to_base36,
+)
+from utils.misc.cursors import CursorStore
+
+# Наибольшие значения аргументов, которые создаёт бот
+MAX_HISTORY_KEY = (99991231235959999999, 2**63 - 1)
+MAX_DAY = 99991231
+
+
+@pytest.mark.parametrize(
+    "action, args",
+    [
+        (MENU_FAVORITES, ()),
+        (ADD_FAVORITE, ("123456",)),
+        (REMOVE_FAVORITE, ("0",)),
+        # ID не из цифр записывается как есть
+        (ADD_FAVORITE, ("tt0211915",)),
+        (RESULTS_PAGE, ("aB-_9zQx", 12)),
+        (HISTORY_PAGE, (OLDER, 20240510, 20240510120000123456, 42)),
+        (HISTORY_PAGE, (NEWER, 0, *MAX_HISTORY_KEY)),
+    ],
+)
+def test_pack_unpack_round_trip(action, args):
+    data = action.pack(*args)
+
+    assert len(data.encode()) <= MAX_CALLBACK_DATA
+    assert parse_callback(data) == (action, args)
+
+
+def test_numbers_are_packed_in_base36():
+    assert ADD_FAVORITE.pack(123456) == "1fa:2n9c"
+    assert to_base36(0) == "0"
+    assert to_base36(35) == "z"
+    with pytest.raises(ValueError):
+        to_base36(-1)
+
+
+def test_largest_bot_buttons_fit_limit():
+    token = CursorStore().put({"kind": "genre", "query": "комедия"})
+    buttons = [
+        RESULTS_PAGE.pack(token, 10**6),
+        HISTORY_PAGE.pack(OLDER, MAX_DAY, *MAX_HISTORY_KEY),
+        ADD_FAVORITE.pack(str(10**18)),
+    ]
+    assert max(len(data.encode()) for data in buttons) <= MAX_CALLBACK_DATA
+
+
+def test_pack_over_limit_is_rejected():
+    with pytest.raises(ValueError, match="64"):
+        RESULTS_PAGE.pack("x" * 60, 1)
+    # Лимит в байтах, а не в символах
+    with pytest.raises(ValueError):
+        ADD_FAVORITE.pack("_" + "ф" * 30)
+
+
+def test_pack_rejects_separator_and_wrong_arguments():
+    with pytest.raises(ValueError):
+        RESULTS_PAGE.pack("a:b", 1)
+    with pytest.raises(ValueError):
+        ADD_FAVORITE.pack()
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        None,
+        "",
+        # Кнопка старой версии формата
+        "add_fav_123",
+        "0fa:2n9c",
+        # Неизвестное действие
+        "1zz:1",
+        # Неверное число аргументов
+        "1fa",
+        "1p:token",
+        # Аргумент не в base36
+        "1p:token:!",
+    ],
+)
+def test_unknown_or_damaged_data_is_ignored(data):
+    assert parse_callback(data) is None
+
+
+def test_action_codes_are_unique():
+    with pytest.raises(ValueError):
+        CallbackAction("fa", TEXT)
+    assert ACTIONS["fa"] is ADD_FAVORITE
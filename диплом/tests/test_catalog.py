@@ -0,0 +1,58 @@
+"""
+Тесты поиска по локальному каталогу фильмов.
+"""
+
+from database import catalog, connection
+
+
+def film(kp_id, votes=None, genre="драма"):
+    data = {"id": kp_id, "name": f"Фильм {kp_id}", "genres": [{"name": genre}]}
+    if votes is not None:
+        data["votes"] = {"kp": votes}
+    return data
+
+
+def test_genre_results_ordered_by_votes_then_id(clean_db):
+    with connection():
+        catalog.upsert_movies(
+            [film(1, 10), film(2), film(3, 500), film(4, 10), film(5, 7, "комедия")]
+        )
+        ids = [f["id"] for f in catalog.search_by_genre("Драма", limit=10)]
+    assert ids == [3, 1, 4, 2]
+
+
+def test_genre_pages_do_not_overlap(clean_db):
+    with connection():
+        catalog.upsert_movies([film(i, i % 3) for i in range(1, 8)])
+        first = catalog.search_by_genre("драма", limit=4)
+        second = catalog.search_by_genre("драма", limit=4, offset=4)
+    ids = [f["id"] for f in first + second]
+    assert sorted(ids) == list(range(1, 8))
+
+
+def test_partial_search_doc_keeps_saved_fields(clean_db):
+    full = {
+        **film(1, 300),
+        "year": 2001,
+        "rating": {"kp": 7.5, "imdb": 8.0},
+        "budget": {"value": 100, "currency": "$"},
+        "updatedAt": "2024",
+    }
+    # Фильм из ответа /v1.4/movie/search: без бюджета, числа оценок и даты
+    partial = {"id": 1, "name": "Фильм 1", "rating": {"kp": 7.6}, "budget": None}
+    with connection():
+        catalog.upsert_movies([full])
+        catalog.upsert_movies([partial])
+        found = catalog.search_by_budget(50, 200)
+        by_genre = catalog.search_by_genre("драма")
+
+    assert [f["id"] for f in found] == [1]
+    saved = found[0]
+    assert saved["budget"] == {"value": 100, "currency": "$"}
+    assert saved["rating"] == {"kp": 7.6, "imdb": 8.0}
+    assert (saved["votes"], saved["updatedAt"], saved["year"]) == (
+        {"kp": 300},
+        "2024",
+        2001,
+    )
+    assert [f["id"] for f in by_genre] == [1]
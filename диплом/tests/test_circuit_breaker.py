@@ -0,0 +1,120 @@
+"""
+Тесты автоматического выключателя запросов к API: размыкание по доле ошибок
+в окне, пробный запрос после reset_timeout и его результат.
+"""
+
+import pytest
+
+from api import resilience as resilience_module
+from api.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, backoff_delay
+
+
+class Clock:
+    """Монотонное время, которое тест переводит вручную."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(resilience_module.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(failure_ratio=0.5, min_calls=4, window=60, reset_timeout=30)
+
+
+def open_breaker(breaker):
+    for _ in range(breaker.min_calls):
+        breaker.record_failure()
+    assert breaker.state == OPEN
+
+
+def test_opens_when_failure_ratio_reached(breaker):
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_stays_closed_below_min_calls(breaker):
+    for _ in range(breaker.min_calls - 1):
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_old_results_leave_window(breaker, clock):
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now += 61
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.stats()["calls"] == 3
+    assert breaker.state == CLOSED
+
+
+def test_probe_success_closes(breaker, clock):
+    open_breaker(breaker)
+    clock.now += 29
+    assert not breaker.allow()
+
+    clock.now += 1
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    # Пока пробный запрос не завершён, остальные отклоняются
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+    assert breaker.stats()["failures"] == 0
+
+
+def test_probe_failure_reopens(breaker, clock):
+    open_breaker(breaker)
+    clock.now += 30
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    clock.now += 30
+    assert breaker.allow()
+
+
+def test_lost_probe_allows_next_after_timeout(breaker, clock):
+    open_breaker(breaker)
+    clock.now += 30
+    assert breaker.allow()
+
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+
+
+def test_backoff_delay_respects_limits(monkeypatch):
+    monkeypatch.setattr(resilience_module.random, "uniform", lambda low, high: high)
+
+    assert backoff_delay(0, 0.5, 10) == 0.5
+    assert backoff_delay(3, 0.5, 10) == 4
+    assert backoff_delay(10, 0.5, 10) == 10
+    assert backoff_delay(0, 0.5, 10, retry_after="7") == 7
+    assert backoff_delay(0, 0.5, 10, retry_after="120") == 10
+    assert backoff_delay(0, 0.5, 10, retry_after="завтра") == 0.5
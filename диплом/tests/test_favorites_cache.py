@@ -0,0 +1,81 @@
+"""
+Тесты кэша ID избранных фильмов: загрузка из базы одного пользователя
+не блокирует остальных и не затирает изменения, сделанные во время неё.
+"""
+
+import threading
+
+import pytest
+
+from database.favorites import FavoriteIdsCache
+
+
+class SlowLoader:
+    """Загрузка из базы, которая ждёт разрешения теста."""
+
+    def __init__(self, slow_user: str) -> None:
+        self.slow_user = slow_user
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, user_id: str):
+        if user_id == self.slow_user:
+            self.started.set()
+            assert self.release.wait(5)
+        return {"1"}
+
+
+@pytest.fixture
+def cache():
+    cache = FavoriteIdsCache(max_users=10)
+    cache._load = SlowLoader("slow")
+    return cache
+
+
+def other_stripe_user(cache, user_id):
+    """Пользователь, попадающий в другую группу блокировок."""
+    lock = cache._user_lock(user_id)
+    return next(str(i) for i in range(1000) if cache._user_lock(str(i)) is not lock)
+
+
+def start_get(cache, user_id):
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(ids=cache.get(user_id)))
+    thread.start()
+    assert cache._load.started.wait(5)
+    return thread, result
+
+
+def test_slow_load_does_not_block_other_users(cache):
+    thread, _ = start_get(cache, "slow")
+    other = other_stripe_user(cache, "slow")
+    done = threading.Event()
+    threading.Thread(target=lambda: (cache.get(other), done.set())).start()
+
+    assert done.wait(1), "загрузка другого пользователя ждала медленную загрузку"
+    cache._load.release.set()
+    thread.join(5)
+
+
+def test_add_during_load_is_kept(cache):
+    thread, result = start_get(cache, "slow")
+    adder = threading.Thread(target=cache.add, args=("slow", "2"))
+    adder.start()
+    adder.join(0.2)
+    assert adder.is_alive(), "добавление не дождалось окончания загрузки"
+
+    cache._load.release.set()
+    thread.join(5)
+    adder.join(5)
+    assert result["ids"] == {"1"}
+    assert cache.get("slow") == {"1", "2"}
+
+
+def test_load_started_before_full_invalidation_is_not_cached(cache):
+    thread, _ = start_get(cache, "slow")
+    cache.invalidate()
+    cache._load.release.set()
+    thread.join(5)
+
+    cache.get("slow")
+    assert cache.misses == 2
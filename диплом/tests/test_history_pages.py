@@ -0,0 +1,102 @@
+"""
+Тесты постраничного вывода истории по ключу (timestamp, id): переход
+к старым и обратно к новым записям, записи с одинаковым временем и фильтр
+по дню.
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from database import connection, SearchHistory, User
+from handlers.custom_handlers.history import history_key, history_page
+from utils.callbacks import NEWER, OLDER
+
+PAGE_SIZE = 3
+DAY = datetime(2024, 5, 10, 12, 0)
+
+
+@pytest.fixture
+def user(clean_db):
+    with connection():
+        user = User.create(user_id="300")
+        other = User.create(user_id="301")
+        # Записи 2 и 3, 5 и 6 сохранены в одно время: порядок задаёт id
+        for number, minutes in enumerate([0, 1, 1, 2, 3, 3, 4, 5], 1):
+            SearchHistory.create(
+                user=user,
+                query=f"запрос {number}",
+                timestamp=DAY + timedelta(minutes=minutes),
+            )
+        SearchHistory.create(
+            user=user, query="вчера", timestamp=DAY - timedelta(days=1)
+        )
+        SearchHistory.create(user=other, query="чужой", timestamp=DAY)
+    return user
+
+
+def queries(entries):
+    return [entry.query for entry in entries]
+
+
+def walk(user, target_date=None):
+    """Проходит историю до конца и обратно, возвращая страницы по порядку."""
+    pages = []
+    entries, has_newer, has_older = history_page(user, target_date, size=PAGE_SIZE)
+    pages.append((queries(entries), has_newer, has_older))
+    while has_older:
+        entries, has_newer, has_older = history_page(
+            user, target_date, OLDER, history_key(entries[-1]), PAGE_SIZE
+        )
+        pages.append((queries(entries), has_newer, has_older))
+    back = []
+    while has_newer:
+        entries, has_newer, has_older = history_page(
+            user, target_date, NEWER, history_key(entries[0]), PAGE_SIZE
+        )
+        back.append((queries(entries), has_newer, has_older))
+    return pages, back
+
+
+def test_pages_older_and_back_newer(user):
+    with connection():
+        pages, back = walk(user)
+
+    assert pages == [
+        (["запрос 8", "запрос 7", "запрос 6"], False, True),
+        (["запрос 5", "запрос 4", "запрос 3"], True, True),
+        (["запрос 2", "запрос 1", "вчера"], True, False),
+    ]
+    assert back == [
+        (["запрос 5", "запрос 4", "запрос 3"], True, True),
+        (["запрос 8", "запрос 7", "запрос 6"], False, True),
+    ]
+
+
+def test_pages_of_one_day(user):
+    with connection():
+        pages, back = walk(user, date(2024, 5, 10))
+
+    assert [page for page, _, _ in pages] == [
+        ["запрос 8", "запрос 7", "запрос 6"],
+        ["запрос 5", "запрос 4", "запрос 3"],
+        ["запрос 2", "запрос 1"],
+    ]
+    assert pages[-1][2] is False
+    assert [page for page, _, _ in back] == [
+        ["запрос 5", "запрос 4", "запрос 3"],
+        ["запрос 8", "запрос 7", "запрос 6"],
+    ]
+
+
+def test_last_page_of_exact_size(user):
+    with connection():
+        entries, _, has_older = history_page(user, date(2024, 5, 9), size=1)
+    assert queries(entries) == ["вчера"]
+    assert has_older is False
+
+
+def test_empty_history(clean_db):
+    with connection():
+        user = User.create(user_id="302")
+        assert history_page(user, size=PAGE_SIZE) == ([], False, False)
@@ -0,0 +1,150 @@
+"""
+Тесты отложенной записи истории: повтор записи пакета при ошибке базы
+или пула соединений, работа фонового потока после ошибки и сохранение
+очереди при остановке.
+"""
+
+import time
+
+import pytest
+from peewee import OperationalError
+from playhouse.pool import MaxConnectionsExceeded
+
+from database import connection, Movie, SearchHistory, User
+from database import history_writer as writer_module
+from database.history_writer import HistoryWriter
+
+
+@pytest.fixture
+def user(clean_db):
+    with connection():
+        return User.create(user_id="100")
+
+
+@pytest.fixture
+def writer():
+    # Фоновый поток не успевает записать очередь сам: тесты вызывают flush()
+    writer = HistoryWriter(batch_size=1000, flush_interval=60, max_attempts=3)
+    yield writer
+    writer.close()
+
+
+@pytest.fixture
+def locked_db(monkeypatch):
+    """
+    Имитирует заблокированную базу: запись истории падает с ошибкой.
+    Тест может заменить ошибку в failures["error"].
+    """
+    failures = {"left": 0, "error": OperationalError("database is locked")}
+    insert_many = SearchHistory.insert_many
+
+    def failing_insert_many(rows):
+        if failures["left"]:
+            failures["left"] -= 1
+            raise failures["error"]
+        return insert_many(rows)
+
+    monkeypatch.setattr(writer_module.SearchHistory, "insert_many", failing_insert_many)
+    return failures
+
+
+def add_rows(writer, user, count):
+    for i in range(count):
+        writer.add(
+            {
+                "user": user.id,
+                "query": f"запрос {i}",
+                "command": "/movie_search",
+                "movie": {"kp_id": str(i), "title": f"Фильм {i}"},
+            }
+        )
+
+
+def saved_rows():
+    with connection():
+        return SearchHistory.select().count(), Movie.select().count()
+
+
+def test_flush_requeues_rows_after_database_error(writer, user, locked_db):
+    add_rows(writer, user, 3)
+    locked_db["left"] = 1
+
+    assert writer.flush() == 0
+    assert writer.stats()["pending"] == 3
+    assert saved_rows() == (0, 0)
+
+    assert writer.flush() == 3
+    assert writer.stats()["pending"] == 0
+    assert saved_rows() == (3, 3)
+
+
+def test_requeued_rows_keep_queue_order(writer, user, locked_db):
+    add_rows(writer, user, 2)
+    locked_db["left"] = 1
+    writer.flush()
+    writer.add({"user": user.id, "query": "после ошибки", "command": None})
+
+    writer.flush()
+    with connection():
+        queries = [
+            row.query for row in SearchHistory.select().order_by(SearchHistory.id)
+        ]
+    assert queries == ["запрос 0", "запрос 1", "после ошибки"]
+
+
+def test_rows_dropped_after_max_attempts(writer, user, locked_db):
+    add_rows(writer, user, 2)
+    locked_db["left"] = writer.max_attempts
+
+    for _ in range(writer.max_attempts):
+        assert writer.flush() == 0
+    stats = writer.stats()
+    assert stats["pending"] == 0
+    assert stats["dropped_failed"] == 2
+    assert saved_rows() == (0, 0)
+
+
+def test_flush_requeues_rows_when_pool_is_exhausted(writer, user, locked_db):
+    add_rows(writer, user, 2)
+    locked_db["error"] = MaxConnectionsExceeded("Exceeded maximum connections.")
+    locked_db["left"] = 1
+
+    assert writer.flush() == 0
+    assert writer.stats()["pending"] == 2
+
+    assert writer.flush() == 2
+    assert saved_rows() == (2, 2)
+
+
+def test_background_thread_survives_failed_flush(user, locked_db):
+    writer = HistoryWriter(batch_size=1000, flush_interval=0.01, max_attempts=3)
+    try:
+        locked_db["error"] = ValueError("unexpected")
+        locked_db["left"] = 1
+        add_rows(writer, user, 2)
+
+        deadline = time.monotonic() + 5
+        while writer.stats()["written"] < 2:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        assert writer._thread.is_alive()
+    finally:
+        writer.close()
+    assert saved_rows() == (2, 2)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        OperationalError("database is locked"),
+        MaxConnectionsExceeded("Exceeded maximum connections."),
+    ],
+)
+def test_close_retries_until_rows_are_saved(writer, user, locked_db, error):
+    add_rows(writer, user, 2)
+    locked_db["error"] = error
+    locked_db["left"] = 2
+
+    writer.close()
+    assert writer.stats()["pending"] == 0
+    assert saved_rows() == (2, 2)
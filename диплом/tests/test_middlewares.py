@@ -0,0 +1,52 @@
+"""
+Тесты middleware: соединение с базой возвращается в пул, даже если
+пользователя обновления определить не удалось.
+"""
+
+import pytest
+from peewee import OperationalError
+from telebot import TeleBot
+from telebot.types import Message
+
+from database import db
+from utils import middlewares
+from utils.middlewares import DatabaseMiddleware, UserMiddleware
+
+
+def message(text="/start"):
+    return Message.de_json(
+        {
+            "message_id": 1,
+            "from": {"id": 300, "is_bot": False, "first_name": "Тест"},
+            "chat": {"id": 300, "type": "private"},
+            "date": 0,
+            "text": text,
+        }
+    )
+
+
+@pytest.fixture
+def bot(clean_db):
+    bot = TeleBot("0:test", threaded=False, use_class_middlewares=True)
+    bot.setup_middleware(DatabaseMiddleware())
+    bot.setup_middleware(UserMiddleware())
+    handled = []
+    bot.register_message_handler(lambda m, user: handled.append(user))
+    bot.handled = handled
+    return bot
+
+
+def test_connection_released_after_update(bot):
+    bot.process_new_messages([message()])
+    assert bot.handled[0].user_id == "300"
+    assert db.is_closed()
+
+
+def test_connection_released_when_user_lookup_fails(bot, monkeypatch):
+    def locked(from_user):
+        raise OperationalError("database is locked")
+
+    monkeypatch.setattr(middlewares, "resolve_user", locked)
+    bot.process_new_messages([message()])
+    assert bot.handled == []
+    assert db.is_closed()
@@ -0,0 +1,112 @@
+"""
+Тесты миграций схемы: база, созданная до появления миграций, приводится
+к последней версии с переносом истории и избранного в таблицу movie.
+"""
+
+import pytest
+
+from database import connection, db
+from database.migrations import current_version, latest_version, migrate
+
+# Схема базы первых версий бота: без колонок данных фильма, которые добавлял
+# migrate_db.py, и без индексов истории и избранного
+LEGACY_SCHEMA = (
+    'CREATE TABLE "user" ("id" INTEGER NOT NULL PRIMARY KEY, '
+    '"user_id" VARCHAR(255) NOT NULL, "username" VARCHAR(255), '
+    '"first_name" VARCHAR(255))',
+    'CREATE UNIQUE INDEX "user_user_id" ON "user" ("user_id")',
+    'CREATE TABLE "searchhistory" ("id" INTEGER NOT NULL PRIMARY KEY, '
+    '"user_id" INTEGER NOT NULL, "query" VARCHAR(255) NOT NULL, '
+    '"command" VARCHAR(255), "timestamp" DATETIME NOT NULL, '
+    '"movie_title" VARCHAR(255), "movie_year" VARCHAR(255), '
+    '"movie_poster_url" VARCHAR(255))',
+    'CREATE INDEX "searchhistory_user_id" ON "searchhistory" ("user_id")',
+    'CREATE TABLE "favoritemovie" ("id" INTEGER NOT NULL PRIMARY KEY, '
+    '"user_id" INTEGER NOT NULL, "movie_id" VARCHAR(255) NOT NULL, '
+    '"title" VARCHAR(255) NOT NULL)',
+    'CREATE INDEX "favoritemovie_user_id" ON "favoritemovie" ("user_id")',
+)
+
+LEGACY_ROWS = (
+    "INSERT INTO user (id, user_id) VALUES (1, '100')",
+    "INSERT INTO searchhistory "
+    "(id, user_id, query, command, timestamp, movie_title, movie_year, "
+    "movie_poster_url) VALUES "
+    "(1, 1, 'Амели', '/movie_search', '2024-01-01 10:00:00', 'Амели', '2001', 'a'), "
+    "(2, 1, 'Амели', '/movie_search', '2024-01-02 10:00:00', 'Амели', '2001', 'a'), "
+    # Тот же фильм с другим постером: объединяется по названию и году
+    "(3, 1, 'Амели', '/movie_search', '2024-01-03 10:00:00', 'Амели', '2001', 'b'), "
+    "(4, 1, 'Брат', '/movie_search', '2024-01-04 10:00:00', 'Брат', 'None', NULL), "
+    "(5, 1, '/history', '/history', '2024-01-05 10:00:00', NULL, NULL, NULL)",
+    "INSERT INTO favoritemovie (id, user_id, movie_id, title) VALUES "
+    "(1, 1, '535', 'Сталкер'), (2, 1, '535', 'Сталкер'), (3, 1, '41519', 'Брат')",
+)
+
+
+@pytest.fixture
+def legacy_db(database, tmp_path):
+    """Переключает базу бота на файл со схемой до появления миграций."""
+    path = db.database
+    db.close_all()
+    db.init(str(tmp_path / "legacy.db"))
+    with connection():
+        for statement in LEGACY_SCHEMA + LEGACY_ROWS:
+            db.execute_sql(statement)
+    yield db
+    db.close_all()
+    db.init(path)
+
+
+def rows(sql):
+    return db.execute_sql(sql).fetchall()
+
+
+def test_legacy_database_is_migrated_to_latest(legacy_db):
+    with connection():
+        assert current_version() is None
+        assert migrate() == latest_version()
+        assert current_version() == latest_version()
+
+        movies = rows("SELECT id, kp_id, title FROM movie ORDER BY id")
+        history = rows("SELECT id, movie_id FROM searchhistory ORDER BY id")
+        favorites = rows("SELECT user_id, movie_id FROM favoritemovie ORDER BY id")
+
+    ids = {(kp_id, title): pk for pk, kp_id, title in movies}
+    assert set(ids) == {("535", "Сталкер"), ("41519", "Брат"), (None, "Амели")}
+    amelie = ids[None, "Амели"]
+    assert history == [
+        (1, amelie),
+        (2, amelie),
+        (3, amelie),
+        # Фильм истории совпал с фильмом избранного по названию, году и постеру
+        (4, ids["41519", "Брат"]),
+        (5, None),
+    ]
+    # Повтор избранного удалён, остальные записи ссылаются на фильмы по ключу
+    assert favorites == [(1, ids["535", "Сталкер"]), (1, ids["41519", "Брат"])]
+
+
+def test_migrated_schema_has_current_indexes(legacy_db):
+    with connection():
+        migrate()
+        indexes = {
+            index.name
+            for table in ("movie", "searchhistory", "favoritemovie")
+            for index in db.get_indexes(table)
+        }
+
+    assert {
+        "movie_kp_id",
+        "movie_title_year",
+        "searchhistory_user_id_timestamp",
+        "searchhistory_command_timestamp",
+        "favoritemovie_user_id_movie_id",
+    } <= indexes
+    assert "searchhistory_user_id" not in indexes
+
+
+def test_migrate_is_idempotent(legacy_db):
+    with connection():
+        migrate()
+        assert migrate() == 0
+        assert current_version() == latest_version()
@@ -0,0 +1,76 @@
+"""
+Тесты общей таблицы фильмов: фильмы без ID на Кинопоиске объединяются
+по названию и году при сохранении и в миграции существующей базы.
+"""
+
+import pytest
+
+from database import connection, FavoriteMovie, Movie, SearchHistory, User
+from database.migrations import _dedupe_unkeyed_movies
+from database.movies import upsert_movies
+
+
+@pytest.fixture
+def user(clean_db):
+    with connection():
+        return User.create(user_id="100")
+
+
+def movie(title, year="2001", **fields):
+    return {"kp_id": None, "title": title, "year": year, **fields}
+
+
+def test_unkeyed_movies_are_merged_by_title_and_year(clean_db):
+    with connection():
+        first = upsert_movies([movie("Амели", description=None)])
+        second = upsert_movies(
+            [
+                movie("Амели", description="Описание"),
+                movie("Амели", year="2002"),
+                movie("Амели"),
+            ]
+        )
+        stored = Movie.get_by_id(first[0])
+
+    assert second[0] == second[2] == first[0]
+    assert second[1] != first[0]
+    assert stored.description == "Описание"
+
+
+def test_unkeyed_movie_without_year(clean_db):
+    with connection():
+        ids = upsert_movies(
+            [movie("Без года", year=None), movie("Без года", year=None)]
+        )
+        assert ids[0] == ids[1]
+        assert Movie.select().count() == 1
+
+
+def test_unkeyed_movie_is_not_merged_with_keyed(clean_db):
+    with connection():
+        keyed, unkeyed = upsert_movies(
+            [{**movie("Амели"), "kp_id": "535"}, movie("Амели")]
+        )
+    assert keyed != unkeyed
+
+
+def test_migration_merges_existing_duplicates(user):
+    with connection():
+        kept, duplicate, other = (
+            Movie.create(title="Амели", year="2001").id,
+            Movie.create(title="Амели", year="2001").id,
+            Movie.create(title="Амели", year="2002").id,
+        )
+        for movie_id in (kept, duplicate, other):
+            SearchHistory.create(user=user, query="Амели", movie=movie_id)
+        FavoriteMovie.create(user=user, movie=kept)
+        FavoriteMovie.create(user=user, movie=duplicate)
+
+        _dedupe_unkeyed_movies(None)
+
+        assert [m.id for m in Movie.select().order_by(Movie.id)] == [kept, other]
+        history = [
+            h.movie_id for h in SearchHistory.select().order_by(SearchHistory.id)
+        ]
+        assert history == [kept, kept, other]
+        assert [f.movie_id for f in FavoriteMovie.select()] == [kept]
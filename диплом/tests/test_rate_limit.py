@@ -0,0 +1,85 @@
+"""
+Тесты ограничителя частоты запросов token bucket: всплеск в пределах ёмкости,
+очередь запросов сверх неё и пополнение токенов со временем.
+"""
+
+import asyncio
+
+import pytest
+
+from api import rate_limit as rate_limit_module
+from api.rate_limit import TokenBucket
+
+
+class Clock:
+    """Монотонное время, которое тест переводит вручную; sleep сдвигает его."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    async def async_sleep(self, seconds: float) -> None:
+        self.sleep(seconds)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit_module.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limit_module.time, "sleep", clock.sleep)
+    monkeypatch.setattr(rate_limit_module.asyncio, "sleep", clock.async_sleep)
+    return clock
+
+
+def test_burst_up_to_capacity_does_not_wait(clock):
+    bucket = TokenBucket(rate=2, capacity=3)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+
+def test_requests_over_capacity_are_queued(clock):
+    bucket = TokenBucket(rate=2, capacity=1)
+    assert bucket.reserve() == 0.0
+    # Каждый следующий запрос ждёт на 1/rate дольше предыдущего
+    assert [bucket.reserve() for _ in range(3)] == [0.5, 1.0, 1.5]
+
+
+def test_tokens_refill_over_time(clock):
+    bucket = TokenBucket(rate=2, capacity=2)
+    bucket.reserve()
+    bucket.reserve()
+
+    clock.now += 0.5
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.5
+
+
+def test_refill_is_capped_by_capacity(clock):
+    bucket = TokenBucket(rate=10, capacity=2)
+    clock.now += 60
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.1]
+
+
+def test_acquire_sleeps_until_token_is_available(clock):
+    bucket = TokenBucket(rate=4, capacity=1)
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.sleeps == [0.25, 0.25]
+
+
+def test_acquire_async_sleeps_until_token_is_available(clock):
+    bucket = TokenBucket(rate=4, capacity=1)
+
+    async def main():
+        for _ in range(3):
+            await bucket.acquire_async()
+
+    asyncio.run(main())
+    assert clock.sleeps == [0.25, 0.25]
@@ -0,0 +1,100 @@
+"""
+Тесты кэша ответов API: вытеснение давно не использованных записей по числу
+записей и объёму и истечение записей по времени жизни эндпоинта.
+"""
+
+import pytest
+
+from api import cache as cache_module
+from api.cache import ResponseCache
+
+
+class Clock:
+    """Монотонное время, которое тест переводит вручную."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    return clock
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2)
+    cache.set("movie", {"id": 1}, "first")
+    cache.set("movie", {"id": 2}, "second")
+    assert cache.get("movie", {"id": 1}) == "first"
+
+    cache.set("movie", {"id": 3}, "third")
+
+    assert cache.get("movie", {"id": 2}) is None
+    assert cache.get("movie", {"id": 1}) == "first"
+    assert cache.get("movie", {"id": 3}) == "third"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_are_evicted_by_size():
+    value = "x" * 100
+    entry_size = len(ResponseCache.make_key("movie", {"id": 1})) + len(value) + 2
+    cache = ResponseCache(max_bytes=entry_size * 2)
+    for i in range(1, 4):
+        cache.set("movie", {"id": i}, value)
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] <= cache.max_bytes
+    assert cache.get("movie", {"id": 1}) is None
+
+
+def test_value_larger_than_cache_is_not_stored():
+    cache = ResponseCache(max_bytes=50)
+    cache.set("movie", {"id": 1}, "x" * 100)
+    assert cache.stats()["entries"] == 0
+
+
+def test_key_does_not_depend_on_params_order():
+    cache = ResponseCache()
+    cache.set("search", {"query": "Амели", "page": 1}, "found")
+    assert cache.get("search", {"page": 1, "query": "Амели"}) == "found"
+
+
+def test_entry_expires_after_endpoint_ttl(clock):
+    cache = ResponseCache(default_ttl=60, endpoint_ttls={"search": 10})
+    cache.set("search", {"query": "Амели"}, "found")
+    cache.set("movie", {"id": 1}, "film")
+
+    clock.now += 10
+    assert cache.get("search", {"query": "Амели"}) is None
+    assert cache.get("movie", {"id": 1}) == "film"
+    assert cache.ttl_remaining("movie", {"id": 1}) == 50
+
+    clock.now += 50
+    assert cache.get("movie", {"id": 1}) is None
+    stats = cache.stats()
+    assert (stats["expirations"], stats["entries"], stats["bytes"]) == (2, 0, 0)
+
+
+def test_explicit_ttl_overrides_endpoint_ttl(clock):
+    cache = ResponseCache(default_ttl=60)
+    cache.set("movie", {"id": 1}, "film", ttl=5)
+
+    clock.now += 5
+    assert cache.get("movie", {"id": 1}) is None
+
+
+def test_invalidate_endpoint():
+    cache = ResponseCache()
+    cache.set("movie", {"id": 1}, "film")
+    cache.set("movie", {"id": 2}, "film")
+    cache.set("search", {"query": "Амели"}, "found")
+
+    assert cache.invalidate("movie") == 2
+    assert cache.get("search", {"query": "Амели"}) == "found"
+    assert cache.invalidate() == 1
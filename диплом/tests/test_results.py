@@ -0,0 +1,79 @@
+"""
+Тесты вывода найденных фильмов: один список с кнопкой избранного для каждого
+фильма и замена кнопки только нажатого фильма.
+"""
+
+import pytest
+
+from database import connection, User
+from database.favorites import add_favorite
+from handlers.custom_handlers.results import results_message
+from keyboards.inline import get_pagination_keyboard
+from utils.callbacks import ADD_FAVORITE, REMOVE_FAVORITE
+from utils.misc.formatters import MAX_MESSAGE_LENGTH, toggle_favorite_keyboard
+
+
+def film(kp_id, name, description="Описание"):
+    return {"id": kp_id, "name": name, "description": description}
+
+
+@pytest.fixture
+def user(clean_db):
+    with connection():
+        user = User.create(user_id="200")
+        add_favorite(user, "2", film(2, "Брат"))
+    return user
+
+
+def buttons(keyboard):
+    return [
+        (button.text, button.callback_data)
+        for row in keyboard.keyboard
+        for button in row
+    ]
+
+
+def test_one_row_per_film_with_favorite_status(user):
+    films = [film(1, "Амели"), film(2, "Брат"), film(3, "Сталкер")]
+
+    text, keyboard = results_message(user.user_id, "Фильмы", films, start=11)
+
+    assert text.startswith("Фильмы:\n\n11. Название: Амели")
+    assert "13. Название: Сталкер" in text
+    assert buttons(keyboard) == [
+        ("☆ 11. Амели", ADD_FAVORITE.pack("1")),
+        ("★ 12. Брат", REMOVE_FAVORITE.pack("2")),
+        ("☆ 13. Сталкер", ADD_FAVORITE.pack("3")),
+    ]
+
+
+def test_films_over_message_limit_are_not_shown(user):
+    films = [film(i, f"Фильм {i}", "д" * 1000) for i in range(1, 11)]
+
+    text, keyboard = results_message(user.user_id, "Фильмы", films)
+
+    assert len(text) <= MAX_MESSAGE_LENGTH
+    shown = len(keyboard.keyboard)
+    assert 1 < shown < len(films)
+    assert f"{shown}. Название: Фильм {shown}" in text
+    assert f"{shown + 1}. Название" not in text
+
+
+def test_toggle_replaces_only_pressed_film(user):
+    _, keyboard = results_message(
+        user.user_id, "Фильмы", [film(1, "Амели"), film(2, "Брат")]
+    )
+    keyboard = get_pagination_keyboard("token", 1, True, keyboard)
+
+    toggled = toggle_favorite_keyboard(keyboard, "1", True)
+
+    assert buttons(toggled)[0] == ("★ 1. Амели", REMOVE_FAVORITE.pack("1"))
+    assert buttons(toggled)[1:] == buttons(keyboard)[1:]
+
+
+def test_toggle_single_film_keyboard():
+    toggled = toggle_favorite_keyboard(None, "1", True)
+
+    assert buttons(toggled) == [("Удалить из избранного", REMOVE_FAVORITE.pack("1"))]
+    toggled = toggle_favorite_keyboard(toggled, "1", False)
+    assert buttons(toggled) == [("Добавить в избранное", ADD_FAVORITE.pack("1"))]
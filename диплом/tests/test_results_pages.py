@@ -0,0 +1,75 @@
+"""
+Тесты постраничного поиска: все страницы одного поиска берутся из того же
+источника, что и первая.
+"""
+
+import datetime
+
+import pytest
+
+from api import kinopoisk_api
+from api.kinopoisk_api import SOURCE_API, SOURCE_CATALOG, get_genre_page
+from database import catalog, connection
+
+
+@pytest.fixture
+def api_calls(monkeypatch):
+    """Запросы к API: вместо сети возвращается одна страница из двух."""
+    calls = []
+
+    def fake_fetch_json(kind, path, params):
+        calls.append(params["page"])
+        return {"docs": [{"id": 1000 + params["page"]}], "pages": 2}
+
+    monkeypatch.setattr(kinopoisk_api, "fetch_json", fake_fetch_json)
+    return calls
+
+
+@pytest.fixture
+def fresh_catalog(clean_db):
+    """Свежий каталог с тремя драмами."""
+    with connection():
+        catalog.upsert_movies(
+            [
+                {"id": i, "votes": {"kp": 10 - i}, "genres": [{"name": "драма"}]}
+                for i in (1, 2, 3)
+            ]
+        )
+        state = catalog.get_sync_state()
+        state.completed_at = datetime.datetime.now()
+        state.save()
+
+
+def test_first_page_from_catalog(fresh_catalog, api_calls):
+    with connection():
+        result = get_genre_page("драма", 1, 2)
+    assert result["source"] == SOURCE_CATALOG
+    assert [f["id"] for f in result["docs"]] == [1, 2]
+    assert result["has_next"]
+    assert api_calls == []
+
+
+def test_exhausted_catalog_does_not_fall_back_to_api(fresh_catalog, api_calls):
+    with connection():
+        last = get_genre_page("драма", 2, 2, SOURCE_CATALOG)
+        beyond = get_genre_page("драма", 3, 2, SOURCE_CATALOG)
+    assert [f["id"] for f in last["docs"]] == [3]
+    assert not last["has_next"]
+    assert beyond["docs"] == [] and not beyond["has_next"]
+    assert api_calls == []
+
+
+def test_api_search_stays_on_api(fresh_catalog, api_calls):
+    with connection():
+        result = get_genre_page("драма", 1, 2, SOURCE_API)
+    assert result["source"] == SOURCE_API
+    assert [f["id"] for f in result["docs"]] == [1001]
+    assert api_calls == [1]
+
+
+def test_first_page_from_api_when_catalog_has_nothing(clean_db, api_calls):
+    with connection():
+        result = get_genre_page("комедия", 1, 2)
+    assert result["source"] == SOURCE_API
+    assert result["has_next"]
+    assert api_calls == [1]
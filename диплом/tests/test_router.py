@@ -0,0 +1,134 @@
+"""
+Тесты маршрутизаторов сообщений и нажатий кнопок: повторная регистрация
+команды, кнопки, состояния или действия - ошибка, выбор обработчика
+по команде и состоянию пользователя.
+"""
+
+import pytest
+from telebot.types import CallbackQuery, Message
+
+from states import MovieSearchStates
+from utils.callbacks import ADD_FAVORITE, MENU_GENRE, REMOVE_FAVORITE
+from utils.router import (
+    ANY_STATE,
+    CallbackRouter,
+    DuplicateHandlerError,
+    MessageRouter,
+)
+
+
+def handler(message):
+    return "handler"
+
+
+def other(message):
+    return "other"
+
+
+def message(text):
+    return Message.de_json(
+        {
+            "message_id": 1,
+            "from": {"id": 1, "is_bot": False, "first_name": "t"},
+            "chat": {"id": 1, "type": "private"},
+            "date": 0,
+            "text": text,
+        }
+    )
+
+
+def call(data):
+    return CallbackQuery.de_json(
+        {
+            "id": "1",
+            "from": {"id": 1, "is_bot": False, "first_name": "t"},
+            "chat_instance": "x",
+            "data": data,
+        }
+    )
+
+
+def test_duplicate_command_is_rejected():
+    router = MessageRouter()
+    router.command("start", "help")(handler)
+
+    with pytest.raises(DuplicateHandlerError, match="/help"):
+        router.command("help")(other)
+
+
+def test_duplicate_text_and_state_are_rejected():
+    router = MessageRouter()
+    router.text("История")(handler)
+    router.state(MovieSearchStates.waiting_for_genre)(handler)
+
+    with pytest.raises(DuplicateHandlerError):
+        router.text("История")(other)
+    # Состояние можно указать объектом или именем
+    with pytest.raises(DuplicateHandlerError):
+        router.state(MovieSearchStates.waiting_for_genre.name)(other)
+
+
+def test_same_command_in_different_states_is_allowed():
+    router = MessageRouter()
+    router.command("cancel")(handler)
+    router.command("cancel", state=MovieSearchStates.waiting_for_genre)(other)
+
+    with pytest.raises(DuplicateHandlerError):
+        router.command("cancel", state=MovieSearchStates.waiting_for_genre)(handler)
+
+    routes = router.lookup(message("/cancel"))
+    assert router.needs_state(routes)
+    genre = MovieSearchStates.waiting_for_genre.name
+    assert router.select(routes, genre).func is other
+    assert router.select(routes, None).func is handler
+
+
+def test_command_lookup_ignores_bot_name_and_arguments():
+    router = MessageRouter()
+    router.command("low_budget_movie")(handler)
+
+    routes = router.lookup(message("/low_budget_movie@movies_bot 1000000 year"))
+    assert not router.needs_state(routes)
+    assert router.select(routes, None).func is handler
+
+
+def test_other_text_goes_to_state_handler():
+    router = MessageRouter()
+    router.command("start")(handler)
+    router.state(MovieSearchStates.waiting_for_genre)(other)
+
+    routes = router.lookup(message("комедия"))
+    assert router.select(routes, MovieSearchStates.waiting_for_genre.name).func is other
+    assert router.select(routes, None) is None
+    assert ANY_STATE not in routes
+
+
+def test_duplicate_action_is_rejected():
+    router = CallbackRouter()
+    router.action(ADD_FAVORITE, REMOVE_FAVORITE)(handler)
+
+    with pytest.raises(DuplicateHandlerError, match=REMOVE_FAVORITE.code):
+        router.action(REMOVE_FAVORITE)(other)
+
+
+def test_callback_is_resolved_by_action_code():
+    router = CallbackRouter()
+    router.action(ADD_FAVORITE)(handler)
+
+    route, args = router.resolve(call(ADD_FAVORITE.pack("123456")))
+    assert route.func is handler
+    assert args == ("123456",)
+    # Действие без обработчика и кнопка старого формата
+    assert router.resolve(call(MENU_GENRE.pack())) is None
+    assert router.resolve(call("add_fav_123456")) is None
+
+
+def test_route_passes_only_named_middleware_data():
+    router = CallbackRouter()
+
+    @router.action(ADD_FAVORITE)
+    def add(call, movie_id, user=None):
+        return movie_id, user
+
+    route, args = router.resolve(call(ADD_FAVORITE.pack("7")))
+    assert route(call("x"), {"user": "u", "lang": "ru"}, args) == ("7", "u")
@@ -0,0 +1,162 @@
+"""
+Тесты объединения одинаковых одновременных запросов: ожидающие вызовы
+получают результат или исключение единственного выполненного запроса.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from api.single_flight import AsyncSingleFlight, SingleFlight
+
+WAITERS = 5
+
+
+def run_concurrently(group, key, fn, count=WAITERS):
+    """Запускает count вызовов group.do, пока первый из них ещё выполняется."""
+    results = []
+    errors = []
+
+    def call():
+        try:
+            results.append(group.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def wait_collapsed(group, count, timeout=5):
+    """Ждёт, пока count вызовов присоединятся к выполняющемуся запросу."""
+    deadline = time.monotonic() + timeout
+    while group.stats()["collapsed"] < count:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_concurrent_calls_are_collapsed():
+    group = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    executions = []
+
+    def fetch():
+        executions.append(1)
+        started.set()
+        assert release.wait(5)
+        return {"docs": []}
+
+    leader, results, _ = run_concurrently(group, "movie", fetch, count=1)
+    assert started.wait(5)
+    waiters, waiter_results, _ = run_concurrently(group, "movie", fetch)
+    # Ожидающие присоединяются к запросу, пока он не завершён
+    wait_collapsed(group, WAITERS)
+    release.set()
+    for thread in leader + waiters:
+        thread.join(5)
+
+    assert len(executions) == 1
+    assert results + waiter_results == [{"docs": []}] * (WAITERS + 1)
+    assert group.stats() == {
+        "calls": WAITERS + 1,
+        "executions": 1,
+        "collapsed": WAITERS,
+        "in_flight": 0,
+    }
+
+
+def test_error_is_raised_to_every_waiter():
+    group = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fetch():
+        started.set()
+        assert release.wait(5)
+        raise ConnectionError("API недоступен")
+
+    leader, _, leader_errors = run_concurrently(group, "movie", fetch, count=1)
+    assert started.wait(5)
+    waiters, _, errors = run_concurrently(group, "movie", fetch)
+    wait_collapsed(group, WAITERS)
+    release.set()
+    for thread in leader + waiters:
+        thread.join(5)
+
+    assert len(leader_errors + errors) == WAITERS + 1
+    assert all(isinstance(e, ConnectionError) for e in leader_errors + errors)
+
+
+def test_next_call_after_completion_runs_again():
+    group = SingleFlight()
+    assert group.do("movie", lambda: 1) == 1
+    assert group.do("movie", lambda: 2) == 2
+    assert group.stats()["executions"] == 2
+
+
+def test_async_concurrent_calls_are_collapsed():
+    group = AsyncSingleFlight()
+    executions = []
+
+    async def fetch():
+        executions.append(1)
+        await asyncio.sleep(0.01)
+        return {"docs": []}
+
+    async def main():
+        return await asyncio.gather(
+            *(group.do("movie", fetch) for _ in range(WAITERS)),
+            group.do("search", fetch),
+        )
+
+    results = asyncio.run(main())
+    assert results == [{"docs": []}] * (WAITERS + 1)
+    assert len(executions) == 2
+    assert group.stats() == {
+        "calls": WAITERS + 1,
+        "executions": 2,
+        "collapsed": WAITERS - 1,
+        "in_flight": 0,
+    }
+
+
+def test_async_error_is_raised_to_every_waiter():
+    group = AsyncSingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ConnectionError("API недоступен")
+
+    async def main():
+        return await asyncio.gather(
+            *(group.do("movie", fetch) for _ in range(WAITERS)),
+            return_exceptions=True,
+        )
+
+    errors = asyncio.run(main())
+    assert all(isinstance(e, ConnectionError) for e in errors)
+    assert group.stats()["in_flight"] == 0
+
+
+def test_async_cancelled_leader_does_not_hang_waiters():
+    group = AsyncSingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(10)
+
+    async def main():
+        leader = asyncio.create_task(group.do("movie", fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(group.do("movie", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(waiter, 1)
+
+    asyncio.run(main())
+    assert group.stats()["in_flight"] == 0
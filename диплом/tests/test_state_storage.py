@@ -0,0 +1,69 @@
+"""
+Тесты хранилища состояний диалогов: сохранение состояния и данных,
+истечение по времени и работа кэша, пока другой поток ждёт базу.
+"""
+
+import threading
+
+import pytest
+
+from utils import state_storage as storage_module
+from utils.state_storage import SQLiteStateStorage
+
+
+@pytest.fixture
+def storage(clean_db):
+    return SQLiteStateStorage(ttl=60, cache_size=10, purge_interval=3600)
+
+
+def test_state_and_data_survive_restart(storage):
+    storage.set_state(1, 10, "genre")
+    storage.set_data(1, 10, "page", 2)
+
+    restarted = SQLiteStateStorage(ttl=60)
+    assert restarted.get_state(1, 10) == "genre"
+    assert restarted.get_data(1, 10) == {"page": 2}
+
+    assert restarted.delete_state(1, 10)
+    assert SQLiteStateStorage(ttl=60).get_state(1, 10) is None
+
+
+def test_expired_state_is_gone(storage):
+    storage.set_state(1, 10, "genre")
+    expired = SQLiteStateStorage(ttl=0)
+
+    assert expired.get_state(1, 10) is None
+    assert storage.purge_expired() == 0
+
+
+def slow_database_read(monkeypatch):
+    """Чтение состояния из базы ждёт, пока тест не разрешит его продолжить."""
+    started = threading.Event()
+    release = threading.Event()
+    get_or_none = storage_module.ConversationState.get_or_none
+
+    def slow_get_or_none(*args, **kwargs):
+        started.set()
+        assert release.wait(5)
+        return get_or_none(*args, **kwargs)
+
+    monkeypatch.setattr(
+        storage_module.ConversationState, "get_or_none", slow_get_or_none
+    )
+    return started, release
+
+
+def test_cache_is_not_blocked_by_database_read(storage, monkeypatch):
+    storage.set_state(1, 10, "genre")
+    started, release = slow_database_read(monkeypatch)
+    reader = threading.Thread(target=storage.get_state, args=(2, 20))
+    reader.start()
+    assert started.wait(5)
+    try:
+        # Пока поток ждёт базу, состояние другого пользователя читается из кэша
+        assert storage.cached_state(1, 10) == (True, "genre")
+        assert storage.get_state(1, 10) == "genre"
+    finally:
+        release.set()
+        reader.join(5)
+    assert storage.cached_state(2, 20) == (True, None)
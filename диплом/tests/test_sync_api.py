@@ -0,0 +1,78 @@
+"""
+Тесты синхронного клиента API: любые ошибки requests и повреждённый JSON
+в ответе повторяются, учитываются выключателем и ведут к резервному поиску.
+"""
+
+import pytest
+import requests
+
+from api import kinopoisk_api as api
+from api.rate_limit import DailyQuota, TokenBucket
+from api.resilience import CircuitBreaker
+
+
+class BrokenJsonResponse:
+    """Ответ со статусом 200, тело которого не разбирается как JSON."""
+
+    status_code = 200
+    headers = {}
+    text = '{"docs": ['
+
+    def json(self):
+        raise requests.JSONDecodeError("Expecting value", self.text, 10)
+
+
+class FakeClient:
+    """Клиент API, каждый запрос которого падает или возвращает заданный ответ."""
+
+    def __init__(self, outcome) -> None:
+        self.outcome = outcome
+        self.calls = 0
+
+    def get(self, path, params=None):
+        self.calls += 1
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return self.outcome
+
+
+@pytest.fixture
+def fake_api(monkeypatch, tmp_path):
+    def use(outcome) -> FakeClient:
+        client = FakeClient(outcome)
+        monkeypatch.setattr(api, "client", client)
+        return client
+
+    monkeypatch.setattr(api.time, "sleep", lambda delay: None)
+    monkeypatch.setattr(api, "rate_limiter", TokenBucket(1000, 1000))
+    monkeypatch.setattr(api, "circuit_breaker", CircuitBreaker(min_calls=100))
+    monkeypatch.setattr(api, "api_quota", DailyQuota(str(tmp_path / "quota.json"), 100))
+    return use
+
+
+@pytest.mark.parametrize(
+    "outcome",
+    [
+        requests.exceptions.ChunkedEncodingError("Connection broken"),
+        requests.exceptions.TooManyRedirects("Exceeded 30 redirects"),
+        BrokenJsonResponse(),
+    ],
+)
+def test_failed_request_is_retried(fake_api, outcome):
+    client = fake_api(outcome)
+
+    assert api._request_api("movie", "/v1.4/movie/1", None, None) is None
+    assert client.calls == api.API_MAX_RETRIES + 1
+    stats = api.circuit_breaker.stats()
+    assert stats["calls"] == stats["failures"] == client.calls
+
+
+def test_broken_json_falls_back_to_local_database(fake_api, monkeypatch):
+    fake_api(BrokenJsonResponse())
+    found = [{"id": 1, "name": "Брат"}]
+    monkeypatch.setattr(api.catalog, "search_by_title", lambda name: [])
+    monkeypatch.setattr(api.disk_cache, "get_with_ttl", lambda *args: (None, None))
+    monkeypatch.setattr(api.disk_cache, "get_stale", lambda *args: None)
+    monkeypatch.setattr(api.fallback, "find_films_by_name", lambda name: found)
+
+    assert api.search_films_by_name("Брат") == found
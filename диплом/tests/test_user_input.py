@@ -0,0 +1,42 @@
+"""
+Тесты проверки и разбора ввода пользователя, общих для синхронных
+и асинхронных обработчиков.
+"""
+
+from datetime import date
+
+import pytest
+
+from utils.misc.user_input import (
+    DIGITS_GENRE_MESSAGE,
+    EMPTY_GENRE_MESSAGE,
+    check_text_input,
+    parse_history_date,
+    parse_rating,
+)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("комедия", None),
+        ("  ", EMPTY_GENRE_MESSAGE),
+        (None, EMPTY_GENRE_MESSAGE),
+        ("1917", DIGITS_GENRE_MESSAGE),
+    ],
+)
+def test_check_text_input(text, expected):
+    assert check_text_input(text, EMPTY_GENRE_MESSAGE, DIGITS_GENRE_MESSAGE) == expected
+
+
+def test_parse_rating_accepts_comma():
+    assert parse_rating(" 7,5 ") == 7.5
+    with pytest.raises(ValueError):
+        parse_rating("семь")
+
+
+def test_parse_history_date():
+    assert parse_history_date("Все") is None
+    assert parse_history_date("18.10.2026") == date(2026, 10, 18)
+    with pytest.raises(ValueError):
+        parse_history_date("32.13.2020")
@@ -0,0 +1,177 @@
+"""
+Формат callback_data inline-кнопок бота.
+Данные кнопки - версия формата и короткий код действия, за которыми через
+двоеточие идут аргументы: числа и ID фильмов записываются в base36.
+Например, "1fa:2n9c" - добавить в избранное фильм 123456.
+Telegram ограничивает callback_data 64 байтами, поэтому размер проверяется
+при создании кнопки, а не при нажатии. Кнопки старого формата (другой версии)
+распознаются и не передаются обработчикам.
+"""
+
+import string
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# Версия формата; меняется, если меняется смысл аргументов действий
+CALLBACK_VERSION = "1"
+SEPARATOR = ":"
+MAX_CALLBACK_DATA = 64
+
+_BASE36 = string.digits + string.ascii_lowercase
+
+
+def to_base36(value: int) -> str:
+    """
+    Записывает неотрицательное целое число в системе счисления по основанию 36.
+
+    Args:
+        value (int): Число.
+
+    Returns:
+        str: Запись числа цифрами и строчными латинскими буквами.
+    """
+    if value < 0:
+        raise ValueError(f"Отрицательное число в callback_data: {value}")
+    digits = ""
+    while True:
+        value, digit = divmod(value, 36)
+        digits = _BASE36[digit] + digits
+        if not value:
+            return digits
+
+
+def _encode_text(value: str) -> str:
+    value = str(value)
+    if SEPARATOR in value:
+        raise ValueError(f"Разделитель в аргументе callback_data: {value!r}")
+    return value
+
+
+def _encode_id(value) -> str:
+    # Числовые ID записываются в base36, прочие - как есть после "_"
+    value = str(value)
+    return to_base36(int(value)) if value.isdigit() else "_" + _encode_text(value)
+
+
+def _decode_id(value: str) -> str:
+    return value[1:] if value.startswith("_") else str(int(value, 36))
+
+
+class Field(NamedTuple):
+    """Способ записи аргумента действия в callback_data и его чтения"""
+
+    encode: Callable[[Any], str]
+    decode: Callable[[str], Any]
+
+
+# Неотрицательное целое число
+INT = Field(lambda value: to_base36(int(value)), lambda value: int(value, 36))
+# ID фильма: строка, обычно из цифр
+MOVIE_ID = Field(_encode_id, _decode_id)
+# Короткая строка без двоеточий, например токен курсора
+TEXT = Field(_encode_text, str)
+
+# Действия по коду
+ACTIONS: Dict[str, "CallbackAction"] = {}
+
+
+class CallbackAction:
+    """
+    Действие inline-кнопки: короткий код и поля аргументов.
+    """
+
+    def __init__(self, code: str, *fields: Field) -> None:
+        """
+        Args:
+            code (str): Уникальный код действия без двоеточий.
+            *fields (Field): Поля аргументов по порядку.
+        """
+        if code in ACTIONS:
+            raise ValueError(f"Код действия '{code}' уже занят")
+        self.code = code
+        self.fields = fields
+        ACTIONS[code] = self
+
+    def pack(self, *args) -> str:
+        """
+        Записывает действие и аргументы в callback_data.
+
+        Args:
+            *args: Аргументы действия по порядку полей.
+
+        Returns:
+            str: Значение callback_data.
+        """
+        if len(args) != len(self.fields):
+            raise ValueError(
+                f"Действию '{self.code}' нужно аргументов: {len(self.fields)}"
+            )
+        data = SEPARATOR.join(
+            [CALLBACK_VERSION + self.code]
+            + [field.encode(arg) for field, arg in zip(self.fields, args)]
+        )
+        if len(data.encode()) > MAX_CALLBACK_DATA:
+            raise ValueError(f"callback_data длиннее {MAX_CALLBACK_DATA} байт: {data}")
+        return data
+
+    def unpack(self, parts: List[str]) -> Tuple:
+        """
+        Читает аргументы действия из частей callback_data.
+
+        Args:
+            parts (List[str]): Записанные аргументы.
+
+        Returns:
+            Tuple: Аргументы действия.
+        """
+        if len(parts) != len(self.fields):
+            raise ValueError(f"Неверное число аргументов действия '{self.code}'")
+        return tuple(field.decode(part) for field, part in zip(self.fields, parts))
+
+    def __repr__(self) -> str:
+        return f"CallbackAction({self.code!r})"
+
+
+def parse_callback(data: str) -> Optional[Tuple[CallbackAction, Tuple]]:
+    """
+    Разбирает callback_data кнопки.
+
+    Args:
+        data (str): Значение callback_data.
+
+    Returns:
+        Optional[Tuple[CallbackAction, Tuple]]: Действие и его аргументы;
+            None, если кнопка другой версии формата или данные повреждены.
+    """
+    head, *parts = (data or "").split(SEPARATOR)
+    if not head.startswith(CALLBACK_VERSION):
+        return None
+    action = ACTIONS.get(head[len(CALLBACK_VERSION) :])
+    if action is None:
+        return None
+    try:
+        return action, action.unpack(parts)
+    except ValueError:
+        return None
+
+
+# Кнопки главного меню
+MENU_NAME_SEARCH = CallbackAction("ms")
+MENU_RATING = CallbackAction("mr")
+MENU_GENRE = CallbackAction("mg")
+MENU_LOW_BUDGET = CallbackAction("ml")
+MENU_HIGH_BUDGET = CallbackAction("mh")
+MENU_HISTORY = CallbackAction("mi")
+MENU_FAVORITES = CallbackAction("mf")
+
+# Избранное: ID фильма
+ADD_FAVORITE = CallbackAction("fa", MOVIE_ID)
+REMOVE_FAVORITE = CallbackAction("fr", MOVIE_ID)
+
+# Страница результатов поиска: токен курсора и номер страницы
+RESULTS_PAGE = CallbackAction("p", TEXT, INT)
+
+# Страница истории: направление, день ГГГГММДД (0 - вся история)
+# и ключ крайней записи текущей страницы - время ГГГГММДДччммссмкс и ID
+HISTORY_PAGE = CallbackAction("h", TEXT, INT, INT, INT)
+NEWER = "p"
+OLDER = "n"
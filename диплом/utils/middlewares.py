@@ -0,0 +1,91 @@
+"""
+Middleware Telegram бота: соединение с базой на время обработки обновления
+и определение пользователя один раз на обновление.
+Запись User передаётся обработчикам, у которых есть параметр user.
+"""
+
+from telebot.handler_backends import BaseMiddleware, CancelUpdate
+from telebot import asyncio_handler_backends
+
+from database import db, run_db
+from database.users import resolve_user
+from utils.logger_config import logger
+
+# Типы обновлений, для которых определяется пользователь
+UPDATE_TYPES = ["message", "callback_query"]
+
+
+def release_connection() -> None:
+    """Возвращает в пул соединение текущего потока, если оно открыто."""
+    if not db.is_closed():
+        db.close()
+
+
+class DatabaseMiddleware(BaseMiddleware):
+    """
+    Берёт соединение из пула перед обработкой обновления и возвращает его
+    после, чтобы потоки TeleBot не удерживали соединения между обновлениями.
+    Регистрируется первым: остальные middleware уже используют соединение.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.update_types = UPDATE_TYPES
+
+    def pre_process(self, message, data: dict) -> None:
+        db.connect(reuse_if_open=True)
+
+    def post_process(self, message, data: dict, exception) -> None:
+        release_connection()
+
+
+class UserMiddleware(BaseMiddleware):
+    """
+    Определяет запись User отправителя обновления по кэшу Telegram ID
+    и передаёт её обработчикам в data["user"]. Если пользователя определить
+    не удалось, обновление пропускается.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.update_types = UPDATE_TYPES
+
+    def pre_process(self, message, data: dict):
+        try:
+            data["user"] = resolve_user(message.from_user)
+        except Exception as e:
+            logger.error(
+                f"Не удалось определить пользователя {message.from_user.id}: {e}",
+                exc_info=True,
+            )
+            # Отменённое обновление TeleBot завершает без post_process,
+            # поэтому соединение DatabaseMiddleware возвращается в пул здесь
+            release_connection()
+            return CancelUpdate()
+
+    def post_process(self, message, data: dict, exception) -> None:
+        pass
+
+
+class AsyncUserMiddleware(asyncio_handler_backends.BaseMiddleware):
+    """
+    Вариант UserMiddleware для AsyncTeleBot: запрос к базе при промахе кэша
+    выполняется в пуле потоков через run_db.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.update_types = UPDATE_TYPES
+
+    async def pre_process(self, message, data: dict):
+        try:
+            data["user"] = await run_db(resolve_user, message.from_user)
+        except Exception as e:
+            logger.error(
+                f"Не удалось определить пользователя {message.from_user.id}: {e}",
+                exc_info=True,
+            )
+            return asyncio_handler_backends.CancelUpdate()
+
+    async def post_process(self, message, data: dict, exception) -> None:
+        pass
@@ -0,0 +1,74 @@
+"""
+Разбор аргументов команд поиска фильмов по бюджету.
+"""
+
+from typing import Optional, Tuple
+
+# Названия полей сортировки, которые может указать пользователь
+SORT_ALIASES = {
+    "budget": "budget",
+    "бюджет": "budget",
+    "rating": "rating",
+    "рейтинг": "rating",
+    "year": "year",
+    "год": "year",
+}
+
+# Множители сокращённой записи суммы: 500k, 5м, 5млн
+AMOUNT_SUFFIXES = {
+    "k": 1_000,
+    "к": 1_000,
+    "тыс": 1_000,
+    "m": 1_000_000,
+    "м": 1_000_000,
+    "млн": 1_000_000,
+}
+
+BUDGET_USAGE = (
+    "Формат команды: /{command} [бюджет] [budget|rating|year]\n"
+    "Например: /{command} 20млн rating"
+)
+
+
+def parse_amount(value: str) -> Optional[int]:
+    """
+    Преобразует сумму вида 5000000, 5_000_000, 500k или 5млн в число.
+
+    Args:
+        value (str): Строка с суммой.
+
+    Returns:
+        Optional[int]: Сумма или None, если строка не является суммой.
+    """
+    value = value.lower().replace("_", "")
+    for suffix, multiplier in AMOUNT_SUFFIXES.items():
+        number = value.removesuffix(suffix)
+        if number != value and number.replace(".", "", 1).isdigit():
+            return int(float(number) * multiplier)
+    return int(value) if value.isdigit() else None
+
+
+def parse_budget_args(text: str) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Разбирает аргументы команды поиска по бюджету.
+
+    Args:
+        text (str): Текст сообщения, например "/high_budget_movie 50млн year".
+
+    Returns:
+        Tuple[Optional[int], Optional[str]]: Граница бюджета и поле сортировки,
+        None для не указанных аргументов.
+
+    Raises:
+        ValueError: Если аргумент не является ни суммой, ни полем сортировки.
+    """
+    threshold, sort_by = None, None
+    for arg in text.split()[1:]:
+        amount = parse_amount(arg)
+        if amount is not None:
+            threshold = amount
+        elif arg.lower() in SORT_ALIASES:
+            sort_by = SORT_ALIASES[arg.lower()]
+        else:
+            raise ValueError(f"Неизвестный аргумент: {arg}")
+    return threshold, sort_by
@@ -0,0 +1,69 @@
+"""
+Хранилище курсоров постраничного вывода результатов поиска.
+В callback_data кнопки помещается только короткий токен курсора и номер
+страницы, а параметры поиска хранятся на стороне бота.
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class CursorStore:
+    """
+    Ограниченное по размеру хранилище курсоров с истечением по времени.
+    При переполнении вытесняются давно не использованные курсоры.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 3600) -> None:
+        """
+        Args:
+            max_entries (int): Максимальное число курсоров.
+            ttl (float): Время жизни курсора с последнего обращения, в секундах.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._cursors: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, cursor: Dict[str, Any]) -> str:
+        """
+        Сохраняет курсор.
+
+        Args:
+            cursor (Dict[str, Any]): Параметры поиска.
+
+        Returns:
+            str: Токен курсора для callback_data.
+        """
+        token = secrets.token_urlsafe(6)
+        with self._lock:
+            self._cursors[token] = (time.monotonic() + self.ttl, cursor)
+            while len(self._cursors) > self.max_entries:
+                self._cursors.popitem(last=False)
+        return token
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает курсор по токену и продлевает его время жизни.
+
+        Args:
+            token (str): Токен курсора.
+
+        Returns:
+            Optional[Dict[str, Any]]: Параметры поиска или None, если курсор истёк.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cursors.get(token)
+            if entry is None:
+                return None
+            expires_at, cursor = entry
+            if expires_at <= now:
+                del self._cursors[token]
+                return None
+            self._cursors[token] = (now + self.ttl, cursor)
+            self._cursors.move_to_end(token)
+            return cursor
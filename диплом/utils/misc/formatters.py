@@ -2,8 +2,49 @@
 Форматирование текстовых данных для вывода информации о фильмах.
 """
 
+from typing import List, Optional
+
 from telebot.types import InlineKeyboardMarkup, InlineKeyboardButton
 
+from utils.callbacks import ADD_FAVORITE, REMOVE_FAVORITE
+
+QUOTA_EXHAUSTED_MESSAGE = (
+    "Суточный лимит запросов к Кинопоиску исчерпан. "
+    "Попробуйте повторить поиск завтра."
+)
+
+# Максимальная длина сообщения Telegram с запасом
+MAX_MESSAGE_LENGTH = 4000
+
+EMPTY_FAVORITES_MESSAGE = "Ваш список избранных фильмов пуст."
+
+# Отметки фильма в кнопке избранного под списком фильмов
+FAVORITE_MARK = "★"
+NOT_FAVORITE_MARK = "☆"
+
+
+def favorite_button(
+    movie_id: str, is_favorite: bool, label: Optional[str] = None
+) -> InlineKeyboardButton:
+    """
+    Возвращает кнопку добавления или удаления фильма из избранного.
+    Args:
+        movie_id (str): ID фильма.
+        is_favorite (bool): Статус избранного.
+        label (str, optional): Фильм в списке, например "1. Амели". Без него
+            кнопка подписана действием.
+
+    Returns:
+        InlineKeyboardButton: Кнопка избранного.
+    """
+    if label is not None:
+        mark = FAVORITE_MARK if is_favorite else NOT_FAVORITE_MARK
+        text = f"{mark} {label}"
+    else:
+        text = "Удалить из избранного" if is_favorite else "Добавить в избранное"
+    action = REMOVE_FAVORITE if is_favorite else ADD_FAVORITE
+    return InlineKeyboardButton(text=text, callback_data=action.pack(movie_id))
+
 
 def get_favorite_inline_keyboard(
     movie_id: str, is_favorite: bool
@@ -18,21 +59,41 @@ def get_favorite_inline_keyboard(
         InlineKeyboardMarkup: Клавиатура с кнопкой.
     """
     keyboard = InlineKeyboardMarkup(row_width=1)
-    if is_favorite:
-        keyboard.add(
-            InlineKeyboardButton(
-                text="Удалить из избранного", callback_data=f"remove_fav:{movie_id}"
-            )
-        )
-    else:
-        keyboard.add(
-            InlineKeyboardButton(
-                text="Добавить в избранное", callback_data=f"add_fav:{movie_id}"
-            )
-        )
+    keyboard.add(favorite_button(movie_id, is_favorite))
     return keyboard
 
 
+def toggle_favorite_keyboard(
+    keyboard: Optional[InlineKeyboardMarkup], movie_id: str, is_favorite: bool
+) -> InlineKeyboardMarkup:
+    """
+    Заменяет в клавиатуре сообщения кнопку избранного одного фильма,
+    остальные кнопки (другие фильмы, переход по страницам) не меняются.
+    Args:
+        keyboard (InlineKeyboardMarkup, optional): Клавиатура сообщения.
+        movie_id (str): ID фильма.
+        is_favorite (bool): Новый статус избранного.
+
+    Returns:
+        InlineKeyboardMarkup: Клавиатура с обновлённой кнопкой.
+    """
+    targets = {ADD_FAVORITE.pack(movie_id), REMOVE_FAVORITE.pack(movie_id)}
+    rows = keyboard.keyboard if keyboard else []
+    if not any(button.callback_data in targets for row in rows for button in row):
+        return get_favorite_inline_keyboard(movie_id, is_favorite)
+
+    def updated(button: InlineKeyboardButton) -> InlineKeyboardButton:
+        if button.callback_data not in targets:
+            return button
+        marked = button.text[:1] in (FAVORITE_MARK, NOT_FAVORITE_MARK)
+        label = button.text[2:] if marked else None
+        return favorite_button(movie_id, is_favorite, label)
+
+    return InlineKeyboardMarkup(
+        keyboard=[[updated(button) for button in row] for row in rows]
+    )
+
+
 def format_genres(film):
     genres_list = film.get("genres", [])
     genres_names = [genre.get("name", "") for genre in genres_list]
@@ -64,6 +125,7 @@ def format_film_info(film: dict) -> str:
     genres = format_genres(film)
     age_limit = film.get("ratingAgeLimits", {}).get("name", "---")
     poster_url = film.get("poster", {}).get("url")
+    budget = film.get("budget") or {}
 
     info = (
         f"Название: {name}\n"
@@ -73,6 +135,9 @@ def format_film_info(film: dict) -> str:
         f"Жанр: {genres}\n"
         f"Возрастной рейтинг: {age_limit}\n"
     )
+    if budget.get("value"):
+        amount = f"{budget['value']:,}".replace(",", " ")
+        info += f"Бюджет: {amount} {budget.get('currency') or ''}".rstrip() + "\n"
     if poster_url:
         info += f"Постер: {poster_url}\n"
     return info
@@ -88,3 +153,46 @@ def format_films_list(films: list) -> str:
         str: Отформатированный текст с перечнем фильмов.
     """
     return "\n---\n".join(format_film_info(film) for film in films)
+
+
+def format_favorites(films: list) -> str:
+    """
+    Форматирует список избранных фильмов пользователя.
+    Args:
+        films (list): Избранные фильмы в формате ответа API.
+
+    Returns:
+        str: Текст со всеми избранными фильмами.
+    """
+    reply = "Ваши избранные фильмы:\n\n"
+    for film in films:
+        reply += format_film_info(film) + "\n---\n"
+    return reply
+
+
+def split_message(text: str, limit: int = MAX_MESSAGE_LENGTH) -> List[str]:
+    """
+    Разбивает длинный текст на части не длиннее лимита Telegram,
+    по возможности по переводам строк.
+    Args:
+        text (str): Текст сообщения.
+        limit (int): Максимальная длина части.
+
+    Returns:
+        List[str]: Части сообщения.
+    """
+    parts = []
+    while text:
+        if len(text) > limit:
+            part = text[:limit]
+            last_newline = part.rfind("\n")
+            if last_newline != -1:
+                part = part[:last_newline]
+                text = text[last_newline + 1 :]
+            else:
+                text = text[limit:]
+        else:
+            part = text
+            text = ""
+        parts.append(part)
+    return parts
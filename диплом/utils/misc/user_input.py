@@ -0,0 +1,79 @@
+"""
+Проверка и разбор ввода пользователя в диалогах поиска фильмов.
+Используется синхронными и асинхронными обработчиками.
+"""
+
+from datetime import date, datetime
+from typing import Optional
+
+EMPTY_GENRE_MESSAGE = "Вы не ввели жанр. Пожалуйста, попробуйте снова."
+DIGITS_GENRE_MESSAGE = (
+    "Жанр не может состоять только из цифр. Пожалуйста, введите корректный жанр."
+)
+EMPTY_NAME_MESSAGE = "Пожалуйста, введите название фильма."
+DIGITS_NAME_MESSAGE = "Название не может состоять только из цифр. Попробуйте снова."
+RATING_FORMAT_MESSAGE = "Некорректный формат. Введите число, например, 7.5."
+HISTORY_DATE_MESSAGE = (
+    "Неверный формат даты. Введите дату в формате дд.мм.гггг или 'все'. "
+    "Попробуйте снова."
+)
+
+# Ответ на запрос даты истории, означающий всю историю
+ALL_HISTORY = "все"
+
+
+def check_text_input(
+    text: Optional[str], empty_message: str, digits_message: str
+) -> Optional[str]:
+    """
+    Проверяет текстовый ввод: жанр или название фильма.
+
+    Args:
+        text (str, optional): Текст сообщения пользователя.
+        empty_message (str): Ответ на пустой ввод.
+        digits_message (str): Ответ на ввод, состоящий только из цифр.
+
+    Returns:
+        Optional[str]: Ответ пользователю или None, если ввод корректен.
+    """
+    text = (text or "").strip()
+    if not text:
+        return empty_message
+    if text.isdigit():
+        return digits_message
+    return None
+
+
+def parse_rating(text: str) -> float:
+    """
+    Разбирает минимальный рейтинг, допуская запятую вместо точки.
+
+    Args:
+        text (str): Текст сообщения, например "7,5".
+
+    Returns:
+        float: Рейтинг.
+
+    Raises:
+        ValueError: Если текст не является числом.
+    """
+    return float(text.strip().replace(",", "."))
+
+
+def parse_history_date(text: str) -> Optional[date]:
+    """
+    Разбирает дату для фильтрации истории.
+
+    Args:
+        text (str): Дата в формате дд.мм.гггг или "все".
+
+    Returns:
+        Optional[date]: Дата или None для всей истории.
+
+    Raises:
+        ValueError: Если текст не является датой.
+    """
+    text = text.strip().lower()
+    if text == ALL_HISTORY:
+        return None
+    return datetime.strptime(text, "%d.%m.%Y").date()
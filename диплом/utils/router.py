@@ -0,0 +1,311 @@
+"""
+Маршрутизаторы текстовых сообщений и нажатий inline-кнопок бота.
+Telebot проверяет каждое сообщение по очереди фильтрами всех обработчиков,
+и каждый фильтр состояния читает состояние пользователя из хранилища.
+Маршрутизатор регистрируется в боте одним обработчиком и выбирает нужный
+по словарю: сначала по команде или тексту reply-кнопки, затем по состоянию
+пользователя, которое читается не больше одного раза на сообщение.
+Нажатия inline-кнопок так же выбираются по словарю: по коду действия
+из callback_data (см. utils.callbacks), без общего обработчика, перебирающего
+все варианты. Повторная регистрация той же команды, кнопки, состояния или
+действия - ошибка при запуске, а не молчаливо недостижимый обработчик.
+"""
+
+import inspect
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from telebot import TeleBot
+from telebot.async_telebot import AsyncTeleBot
+from telebot.handler_backends import ContinueHandling, State
+from telebot.types import CallbackQuery, Message
+
+from utils.callbacks import CallbackAction, parse_callback
+
+# Обработчик команды или кнопки в любом состоянии пользователя
+ANY_STATE = "*"
+
+# Ответ на нажатие кнопки неизвестного действия или старого формата
+STALE_BUTTON_TEXT = "Кнопка устарела, повторите команду."
+
+
+class DuplicateHandlerError(Exception):
+    """Команда, кнопка, состояние или действие уже связаны с обработчиком."""
+
+
+class Route:
+    """
+    Обработчик сообщения или нажатия кнопки и имена данных middleware,
+    которые он принимает. Как и telebot, передаёт обработчику только данные,
+    названные в его параметрах (например, user), но разбирает сигнатуру
+    один раз. Аргументы действия кнопки передаются позиционно.
+    """
+
+    def __init__(self, func: Callable) -> None:
+        self.func = func
+        self.params = frozenset(list(inspect.signature(func).parameters)[1:])
+
+    def __call__(
+        self, message: Message, data: Optional[dict] = None, args: Tuple = ()
+    ) -> Any:
+        kwargs = {
+            key: value for key, value in (data or {}).items() if key in self.params
+        }
+        return self.func(message, *args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"{self.func.__module__}.{self.func.__qualname__}"
+
+
+def _state_name(state) -> str:
+    return state.name if isinstance(state, State) else state
+
+
+class MessageRouter:
+    """
+    Таблица обработчиков текстовых сообщений: команды и тексты кнопок
+    по состояниям и обработчики ввода в состоянии.
+    """
+
+    def __init__(self) -> None:
+        # Ключ ("/команда" или текст кнопки) -> {состояние: обработчик}
+        self._routes: Dict[str, Dict[str, Route]] = {}
+        # Состояние -> обработчик любого другого текста в этом состоянии
+        self._states: Dict[str, Route] = {}
+
+    def _add(self, key: str, state, func: Callable) -> None:
+        state = _state_name(state)
+        routes = self._routes.setdefault(key, {})
+        if state in routes:
+            raise DuplicateHandlerError(
+                f"'{key}' в состоянии {state} уже обрабатывает {routes[state]}"
+            )
+        routes[state] = Route(func)
+
+    def command(self, *commands: str, state=ANY_STATE) -> Callable:
+        """
+        Регистрирует обработчик команд.
+
+        Args:
+            *commands (str): Команды без косой черты.
+            state (State | str): Состояние, в котором действует обработчик;
+                по умолчанию - в любом.
+
+        Returns:
+            Callable: Декоратор, возвращающий обработчик без изменений.
+        """
+
+        def decorator(func: Callable) -> Callable:
+            for command in commands:
+                self._add(f"/{command}", state, func)
+            return func
+
+        return decorator
+
+    def text(self, *texts: str, state=ANY_STATE) -> Callable:
+        """
+        Регистрирует обработчик сообщений с точным текстом (reply-кнопок).
+
+        Args:
+            *texts (str): Тексты кнопок.
+            state (State | str): Состояние, в котором действует обработчик;
+                по умолчанию - в любом.
+
+        Returns:
+            Callable: Декоратор, возвращающий обработчик без изменений.
+        """
+
+        def decorator(func: Callable) -> Callable:
+            for text in texts:
+                self._add(text, state, func)
+            return func
+
+        return decorator
+
+    def state(self, state) -> Callable:
+        """
+        Регистрирует обработчик ввода пользователя в состоянии: сообщений,
+        которые не являются командой или кнопкой.
+
+        Args:
+            state (State | str): Состояние пользователя.
+
+        Returns:
+            Callable: Декоратор, возвращающий обработчик без изменений.
+        """
+
+        def decorator(func: Callable) -> Callable:
+            name = _state_name(state)
+            if name in self._states:
+                raise DuplicateHandlerError(
+                    f"Состояние {name} уже обрабатывает {self._states[name]}"
+                )
+            self._states[name] = Route(func)
+            return func
+
+        return decorator
+
+    def lookup(self, message: Message) -> Dict[str, Route]:
+        """
+        Возвращает обработчики сообщения по состояниям: для команды или
+        кнопки - зарегистрированные для неё, иначе - обработчики состояний.
+
+        Args:
+            message (Message): Сообщение пользователя.
+
+        Returns:
+            Dict[str, Route]: Обработчики по именам состояний.
+        """
+        text = message.text or ""
+        key = text.split(maxsplit=1)[0].split("@")[0] if text.startswith("/") else text
+        return self._routes.get(key, self._states)
+
+    @staticmethod
+    def needs_state(routes: Dict[str, Route]) -> bool:
+        """Нужно ли состояние пользователя, чтобы выбрать обработчик."""
+        return bool(routes) and routes.keys() != {ANY_STATE}
+
+    @staticmethod
+    def select(routes: Dict[str, Route], state: Optional[str]) -> Optional[Route]:
+        """Выбирает обработчик для состояния пользователя."""
+        return routes.get(state) or routes.get(ANY_STATE)
+
+    def setup(self, bot: TeleBot) -> None:
+        """
+        Регистрирует маршрутизатор в боте одним обработчиком текстовых сообщений.
+        Сообщение без обработчика передаётся следующим обработчикам бота.
+
+        Args:
+            bot (TeleBot): Экземпляр бота.
+        """
+
+        def route_message(message: Message, data: dict = None):
+            routes = self.lookup(message)
+            state = None
+            if self.needs_state(routes):
+                state = bot.get_state(message.from_user.id, message.chat.id)
+            route = self.select(routes, state)
+            if route is None:
+                return ContinueHandling()
+            return route(message, data)
+
+        bot.register_message_handler(route_message, content_types=["text"])
+
+
+class AsyncMessageRouter(MessageRouter):
+    """Маршрутизатор для AsyncTeleBot: обработчики - корутины."""
+
+    def setup(self, bot: AsyncTeleBot) -> None:
+        """
+        Регистрирует маршрутизатор в боте одним обработчиком текстовых сообщений.
+
+        Args:
+            bot (AsyncTeleBot): Экземпляр бота.
+        """
+
+        async def route_message(message: Message, data: dict = None):
+            routes = self.lookup(message)
+            state = None
+            if self.needs_state(routes):
+                state = await bot.get_state(message.from_user.id, message.chat.id)
+            route = self.select(routes, state)
+            if route is None:
+                return ContinueHandling()
+            return await route(message, data)
+
+        bot.register_message_handler(route_message, content_types=["text"])
+
+
+class CallbackRouter:
+    """
+    Таблица обработчиков нажатий inline-кнопок по кодам действий.
+    Обработчик получает нажатие, аргументы действия и данные middleware.
+    """
+
+    def __init__(self) -> None:
+        # Код действия -> обработчик
+        self._routes: Dict[str, Route] = {}
+
+    def action(self, *actions: CallbackAction) -> Callable:
+        """
+        Регистрирует обработчик нажатий кнопок действий.
+
+        Args:
+            *actions (CallbackAction): Действия кнопок.
+
+        Returns:
+            Callable: Декоратор, возвращающий обработчик без изменений.
+        """
+
+        def decorator(func: Callable) -> Callable:
+            for action in actions:
+                if action.code in self._routes:
+                    raise DuplicateHandlerError(
+                        f"Действие {action.code} уже обрабатывает "
+                        f"{self._routes[action.code]}"
+                    )
+                self._routes[action.code] = Route(func)
+            return func
+
+        return decorator
+
+    def resolve(self, call: CallbackQuery) -> Optional[Tuple[Route, Tuple]]:
+        """
+        Выбирает обработчик нажатия кнопки.
+
+        Args:
+            call (CallbackQuery): Нажатие кнопки.
+
+        Returns:
+            Optional[Tuple[Route, Tuple]]: Обработчик и аргументы действия;
+                None, если кнопка устарела или действие не зарегистрировано.
+        """
+        parsed = parse_callback(call.data)
+        if parsed is None:
+            return None
+        action, args = parsed
+        route = self._routes.get(action.code)
+        return (route, args) if route else None
+
+    def setup(self, bot: TeleBot) -> None:
+        """
+        Регистрирует маршрутизатор в боте одним обработчиком нажатий кнопок.
+        На нажатие кнопки без обработчика бот отвечает, что кнопка устарела.
+
+        Args:
+            bot (TeleBot): Экземпляр бота.
+        """
+
+        def route_callback(call: CallbackQuery, data: dict = None):
+            resolved = self.resolve(call)
+            if resolved is None:
+                return bot.answer_callback_query(call.id, text=STALE_BUTTON_TEXT)
+            route, args = resolved
+            return route(call, data, args)
+
+        bot.register_callback_query_handler(route_callback, func=None)
+
+
+class AsyncCallbackRouter(CallbackRouter):
+    """Маршрутизатор нажатий кнопок для AsyncTeleBot: обработчики - корутины."""
+
+    def setup(self, bot: AsyncTeleBot) -> None:
+        """
+        Регистрирует маршрутизатор в боте одним обработчиком нажатий кнопок.
+
+        Args:
+            bot (AsyncTeleBot): Экземпляр бота.
+        """
+
+        async def route_callback(call: CallbackQuery, data: dict = None):
+            resolved = self.resolve(call)
+            if resolved is None:
+                return await bot.answer_callback_query(call.id, text=STALE_BUTTON_TEXT)
+            route, args = resolved
+            return await route(call, data, args)
+
+        bot.register_callback_query_handler(route_callback, func=None)
+
+
+# Маршрутизаторы синхронного бота
+router = MessageRouter()
+callback_router = CallbackRouter()
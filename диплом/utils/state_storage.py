@@ -0,0 +1,267 @@
+"""
+Хранилище состояний диалогов telebot в базе данных бота.
+В отличие от StateMemoryStorage, состояния переживают перезапуск бота,
+а заброшенные диалоги (пользователь так и не ответил на вопрос бота)
+удаляются через STATE_TTL секунд после последнего изменения.
+Последние прочитанные состояния держатся в ограниченном кэше памяти:
+фильтр состояний запрашивает состояние для каждого обработчика.
+Кэш пишется вместе с базой, поэтому рассчитан на один процесс бота.
+"""
+
+import datetime
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from telebot.asyncio_storage import StateStorageBase as AsyncStateStorageBase
+from telebot.asyncio_storage.base_storage import StateContext as AsyncStateContext
+from telebot.storage import StateStorageBase
+from telebot.storage.base_storage import StateContext
+
+from config_data.config import STATE_TTL, STATE_CACHE_SIZE, STATE_PURGE_INTERVAL
+from database import connection, run_db, ConversationState
+from utils.logger_config import logger
+
+# Состояние в кэше: имя состояния, данные и время последнего изменения;
+# None - у пользователя нет состояния
+CacheEntry = Optional[Tuple[Optional[str], Dict[str, Any], datetime.datetime]]
+
+
+class SQLiteStateStorage(StateStorageBase):
+    """
+    Хранилище состояний в таблице ConversationState с истечением по времени.
+    Операции с состоянием одного пользователя выполняются под его блокировкой
+    (пользователи распределены по LOCK_STRIPES группам по хэшу ключа), поэтому
+    изменения из разных потоков обработчиков не теряются. Общая блокировка
+    защищает только кэш в памяти и не удерживается во время запросов к базе.
+    """
+
+    LOCK_STRIPES = 64
+
+    def __init__(
+        self,
+        ttl: float = STATE_TTL,
+        cache_size: int = STATE_CACHE_SIZE,
+        purge_interval: float = STATE_PURGE_INTERVAL,
+    ) -> None:
+        """
+        Args:
+            ttl (float): Время жизни состояния с последнего изменения, в секундах.
+            cache_size (int): Сколько состояний держать в кэше памяти.
+            purge_interval (float): Как часто удалять устаревшие состояния
+                из базы, в секундах.
+        """
+        super().__init__()
+        self.ttl = datetime.timedelta(seconds=ttl)
+        self.cache_size = cache_size
+        self.purge_interval = purge_interval
+        self._cache: "OrderedDict[Tuple[int, int], CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        self._next_purge = time.monotonic() + purge_interval
+
+    def _expired(self, updated_at: datetime.datetime) -> bool:
+        return updated_at <= datetime.datetime.now() - self.ttl
+
+    def _key_lock(self, chat_id: int, user_id: int) -> threading.Lock:
+        """Возвращает блокировку группы, к которой относится пользователь."""
+        return self._key_locks[hash((chat_id, user_id)) % self.LOCK_STRIPES]
+
+    def _remember(self, key: Tuple[int, int], entry: CacheEntry) -> None:
+        """Кладёт состояние в кэш, вытесняя давно не использованные."""
+        with self._lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _load(self, chat_id: int, user_id: int) -> CacheEntry:
+        """
+        Возвращает действующее состояние пользователя из кэша или базы.
+        Вызывается под блокировкой пользователя.
+
+        Returns:
+            CacheEntry: Состояние, данные и время изменения или None.
+        """
+        key = (chat_id, user_id)
+        with self._lock:
+            cached = key in self._cache
+            if cached:
+                entry = self._cache[key]
+                self._cache.move_to_end(key)
+        if not cached:
+            with connection():
+                row = ConversationState.get_or_none(
+                    (ConversationState.chat_id == chat_id)
+                    & (ConversationState.user_id == user_id)
+                )
+            entry = (row.state, json.loads(row.data), row.updated_at) if row else None
+            self._remember(key, entry)
+        if entry is not None and self._expired(entry[2]):
+            self._delete(chat_id, user_id)
+            return None
+        return entry
+
+    def _write(
+        self, chat_id: int, user_id: int, state: Optional[str], data: Dict[str, Any]
+    ) -> None:
+        """Сохраняет состояние и данные в базу и кэш."""
+        now = datetime.datetime.now()
+        with connection():
+            ConversationState.replace(
+                chat_id=chat_id,
+                user_id=user_id,
+                state=state,
+                data=json.dumps(data, ensure_ascii=False, default=str),
+                updated_at=now,
+            ).execute()
+        self._remember((chat_id, user_id), (state, data, now))
+        self._purge_if_due()
+
+    def _delete(self, chat_id: int, user_id: int) -> int:
+        """Удаляет состояние из базы и отмечает его отсутствие в кэше."""
+        with connection():
+            deleted = (
+                ConversationState.delete()
+                .where(
+                    (ConversationState.chat_id == chat_id)
+                    & (ConversationState.user_id == user_id)
+                )
+                .execute()
+            )
+        self._remember((chat_id, user_id), None)
+        return deleted
+
+    def _purge_if_due(self) -> None:
+        if time.monotonic() < self._next_purge:
+            return
+        self._next_purge = time.monotonic() + self.purge_interval
+        self.purge_expired()
+
+    def purge_expired(self) -> int:
+        """
+        Удаляет из базы и кэша состояния, не менявшиеся дольше ttl.
+
+        Returns:
+            int: Количество удалённых состояний.
+        """
+        border = datetime.datetime.now() - self.ttl
+        with connection():
+            deleted = (
+                ConversationState.delete()
+                .where(ConversationState.updated_at <= border)
+                .execute()
+            )
+        with self._lock:
+            for key, entry in list(self._cache.items()):
+                if entry is not None and entry[2] <= border:
+                    del self._cache[key]
+        if deleted:
+            logger.info(f"Удалено устаревших состояний диалогов: {deleted}")
+        return deleted
+
+    def cached_state(self, chat_id: int, user_id: int) -> Tuple[bool, Optional[str]]:
+        """
+        Возвращает состояние из кэша без обращения к базе.
+
+        Returns:
+            Tuple[bool, Optional[str]]: Найдено ли состояние в кэше и его имя.
+        """
+        with self._lock:
+            entry = self._cache.get((chat_id, user_id), False)
+            if entry is False or (entry is not None and self._expired(entry[2])):
+                return False, None
+            return True, entry[0] if entry else None
+
+    def set_state(self, chat_id, user_id, state):
+        if hasattr(state, 'name'):
+            state = state.name
+        with self._key_lock(chat_id, user_id):
+            entry = self._load(chat_id, user_id)
+            self._write(chat_id, user_id, state, entry[1] if entry else {})
+        return True
+
+    def delete_state(self, chat_id, user_id):
+        with self._key_lock(chat_id, user_id):
+            return self._delete(chat_id, user_id) > 0
+
+    def get_state(self, chat_id, user_id):
+        with self._key_lock(chat_id, user_id):
+            entry = self._load(chat_id, user_id)
+        return entry[0] if entry else None
+
+    def get_data(self, chat_id, user_id):
+        with self._key_lock(chat_id, user_id):
+            entry = self._load(chat_id, user_id)
+        return dict(entry[1]) if entry else None
+
+    def reset_data(self, chat_id, user_id):
+        with self._key_lock(chat_id, user_id):
+            entry = self._load(chat_id, user_id)
+            if entry is None:
+                return False
+            self._write(chat_id, user_id, entry[0], {})
+        return True
+
+    def set_data(self, chat_id, user_id, key, value):
+        with self._key_lock(chat_id, user_id):
+            entry = self._load(chat_id, user_id)
+            if entry is None:
+                raise RuntimeError(
+                    f'chat_id {chat_id} and user_id {user_id} does not exist'
+                )
+            self._write(chat_id, user_id, entry[0], {**entry[1], key: value})
+        return True
+
+    def get_interactive_data(self, chat_id, user_id):
+        return StateContext(self, chat_id, user_id)
+
+    def save(self, chat_id, user_id, data):
+        with self._key_lock(chat_id, user_id):
+            entry = self._load(chat_id, user_id)
+            if entry is not None:
+                self._write(chat_id, user_id, entry[0], dict(data))
+
+
+class AsyncSQLiteStateStorage(AsyncStateStorageBase):
+    """
+    Хранилище состояний для AsyncTeleBot: обращения к базе выполняются
+    в пуле потоков, состояние из кэша возвращается без переключения потока.
+    """
+
+    def __init__(self, storage: Optional[SQLiteStateStorage] = None) -> None:
+        """
+        Args:
+            storage (SQLiteStateStorage, optional): Синхронное хранилище.
+        """
+        super().__init__()
+        self.storage = storage or SQLiteStateStorage()
+
+    async def set_state(self, chat_id, user_id, state):
+        return await run_db(self.storage.set_state, chat_id, user_id, state)
+
+    async def delete_state(self, chat_id, user_id):
+        return await run_db(self.storage.delete_state, chat_id, user_id)
+
+    async def get_state(self, chat_id, user_id):
+        found, state = self.storage.cached_state(chat_id, user_id)
+        if found:
+            return state
+        return await run_db(self.storage.get_state, chat_id, user_id)
+
+    async def get_data(self, chat_id, user_id):
+        return await run_db(self.storage.get_data, chat_id, user_id)
+
+    async def reset_data(self, chat_id, user_id):
+        return await run_db(self.storage.reset_data, chat_id, user_id)
+
+    async def set_data(self, chat_id, user_id, key, value):
+        return await run_db(self.storage.set_data, chat_id, user_id, key, value)
+
+    def get_interactive_data(self, chat_id, user_id):
+        return AsyncStateContext(self, chat_id, user_id)
+
+    async def save(self, chat_id, user_id, data):
+        return await run_db(self.storage.save, chat_id, user_id, data)